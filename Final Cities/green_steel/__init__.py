@@ -0,0 +1 @@
+# Shared helpers for the per-city green steel models in "Final Cities".
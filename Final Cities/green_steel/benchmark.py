@@ -0,0 +1,276 @@
+import argparse
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyomo
+from pyomo.core.expr.visitor import identify_variables
+import pyomo.environ as pyo
+
+from green_steel.model import (F_SCRAP, ROM_GRADE, create_complete_green_steel_model, extract_results,
+                               initialize_model_parameters, solve_model)
+from green_steel.profiles import HOURS_PER_YEAR, load_vre_profile
+from green_steel.sites import CITIES_DIR, read_site_metadata
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+# ======================
+# PERFORMANCE BENCHMARKS
+# ======================
+# Times model build, parameter initialisation, solve and results extraction
+# for a fixed set of (city, Ycase, Scase) cases on the bundled profiles.
+# Reduced horizons use the first n hours of the year with f_t = n / 8760, so
+# the quick suite runs in minutes with an open-source solver. Every run is
+# appended to a history CSV and compared against the earlier runs of the
+# same case, horizon and solver. Peak Python memory (Peak_py_mem_MB) is
+# that of model build and initialisation, taken in an untimed second pass.
+
+BENCHMARK_CASES = [
+    ('Wuhai', 'YCurrent', 'S1'),
+    ('Tangshan', 'Y2030', 'S2'),
+    ('Urumqi', 'Y2050', 'S3'),
+]
+HORIZONS = {'day': 24, 'week': 168, 'month': 720, 'year': HOURS_PER_YEAR}
+QUICK_HORIZONS = ['week', 'month']
+
+BENCHMARK_DIR = os.path.join(CITIES_DIR, 'benchmarks')
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, 'benchmark_history.csv')
+DEFAULT_SOLVER = 'appsi_highs'
+
+# A metric regresses when it exceeds the baseline (median of the last
+# BASELINE_RUNS runs) by more than this ratio and by more than the noise
+# floor in absolute terms.
+BASELINE_RUNS = 5
+THRESHOLDS = {
+    'Build_s': (1.25, 0.5),
+    'Init_s': (1.25, 0.5),
+    'Solve_s': (1.50, 1.0),
+    'Extract_s': (1.25, 0.2),
+    'Peak_py_mem_MB': (1.15, 20.0),
+    'Peak_rss_MB': (1.15, 50.0),
+}
+# LP size columns are deterministic: any change is reported
+SIZE_COLUMNS = ['Rows', 'Cols', 'Nonzeros']
+
+HISTORY_COLUMNS = ['Timestamp', 'Commit', 'Host', 'Python', 'Pyomo', 'Solver', 'City', 'Ycase', 'Scase',
+                   'Horizon', 'Hours', 'Termination', 'Build_s', 'Init_s', 'Solve_s', 'Extract_s',
+                   'Rows', 'Cols', 'Nonzeros', 'Peak_py_mem_MB', 'Peak_rss_MB', 'Cost_per_tonne']
+
+
+def lp_size(model):
+    # Rows / columns / nonzeros of the active constraints as Pyomo builds them
+    # (before solver presolve). Only used when the solver log has no size line.
+    rows = nonzeros = 0
+    cols = set()
+    for con in model.component_data_objects(pyo.Constraint, active=True):
+        con_vars = {id(v) for v in identify_variables(con.body, include_fixed=False)}
+        rows += 1
+        nonzeros += len(con_vars)
+        cols |= con_vars
+    return rows, len(cols), nonzeros
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return math.nan
+    # ru_maxrss is in kB on Linux and bytes on macOS; children covers shell solvers
+    scale = 1 / 1024 ** 2 if sys.platform == 'darwin' else 1 / 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * scale
+
+
+def _build_case(ycase, scase, n_hours, transport_cost_per_tonne):
+    return create_complete_green_steel_model(
+        ycase=ycase,
+        scase=scase,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[scase],
+        f_t=n_hours / HOURS_PER_YEAR,
+        transport_cost_per_tonne=transport_cost_per_tonne,
+        n_hours=n_hours,
+    )
+
+
+def peak_build_memory_mb(ycase, scase, n_hours, transport_cost_per_tonne, profile):
+    # Peak Python allocations of model build and initialisation, measured in
+    # a separate pass: tracemalloc slows allocation-heavy code several fold,
+    # so it must not run while the build and init times are taken
+    tracemalloc.start()
+    try:
+        model = _build_case(ycase, scase, n_hours, transport_cost_per_tonne)
+        initialize_model_parameters(model, ycase, scase, profile)
+        return tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(city, ycase, scase, n_hours, transport_cost_per_tonne, profile_path, solver_name=DEFAULT_SOLVER):
+    profile = load_vre_profile(profile_path)[:n_hours]
+
+    start = time.perf_counter()
+    model = _build_case(ycase, scase, n_hours, transport_cost_per_tonne)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    initialize_model_parameters(model, ycase, scase, profile)
+    init_time = time.perf_counter() - start
+
+    results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False)
+
+    extract_time = math.nan
+    cost_per_tonne = math.nan
+    if optimal:
+        start = time.perf_counter()
+        row = extract_results(model)
+        extract_time = time.perf_counter() - start
+        cost_per_tonne = row['Cost_per_tonne']
+
+    if math.isnan(telemetry['Solve_rows']):
+        rows, cols, nonzeros = lp_size(model)
+    else:
+        rows, cols, nonzeros = telemetry['Solve_rows'], telemetry['Solve_cols'], telemetry['Solve_nonzeros']
+
+    # Peak RSS of the timed pass, before the memory pass builds a second model
+    peak_rss = _peak_rss_mb()
+    del model
+    peak_py = peak_build_memory_mb(ycase, scase, n_hours, transport_cost_per_tonne, profile)
+
+    return {
+        'City': city,
+        'Ycase': ycase,
+        'Scase': scase,
+        'Hours': n_hours,
+        'Termination': telemetry['Solve_termination'],
+        'Build_s': build_time,
+        'Init_s': init_time,
+        'Solve_s': telemetry['Solve_wall_time_s'],
+        'Extract_s': extract_time,
+        'Rows': rows,
+        'Cols': cols,
+        'Nonzeros': nonzeros,
+        'Peak_py_mem_MB': peak_py,
+        'Peak_rss_MB': peak_rss,
+        'Cost_per_tonne': cost_per_tonne,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=CITIES_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_benchmarks(cases=BENCHMARK_CASES, horizons=QUICK_HORIZONS, solver_name=DEFAULT_SOLVER,
+                   profiles_dir=CITIES_DIR, metadata_path=None):
+    metadata = read_site_metadata(metadata_path) if metadata_path else read_site_metadata()
+    transport = dict(zip(metadata['City'], metadata['TransportCost_USD_per_t']))
+    stamp = {
+        'Timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'Commit': _git_commit(),
+        'Host': platform.node(),
+        'Python': platform.python_version(),
+        'Pyomo': pyomo.version.version,
+        'Solver': solver_name,
+    }
+
+    rows = []
+    for horizon in horizons:
+        if horizon not in HORIZONS:
+            raise ValueError(f"Unknown horizon '{horizon}'; choose from {list(HORIZONS)}")
+        for city, y, s in cases:
+            if city not in transport:
+                raise ValueError(f"No transport cost for benchmark city {city}")
+            profile_path = os.path.join(profiles_dir, city, f'{city}_2019.csv')
+            print(f" {city} ({y}, {s}), {horizon} horizon ...", flush=True)
+            # Fresh process per case so peak memory is not inherited from the last one
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                row = pool.submit(run_case, city, y, s, HORIZONS[horizon], float(transport[city]),
+                                  profile_path, solver_name).result()
+            row.update(stamp)
+            row['Horizon'] = horizon
+            rows.append(row)
+    return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+
+def check_regressions(current, history, baseline_runs=BASELINE_RUNS):
+    # One line per metric that regressed against the history of the same case
+    flags = []
+    if history.empty:
+        return flags
+    keys = ['City', 'Ycase', 'Scase', 'Horizon', 'Solver']
+    for row in current.to_dict('records'):
+        past = history
+        for k in keys:
+            past = past[past[k] == row[k]]
+        past = past.tail(baseline_runs)
+        if past.empty:
+            continue
+        case = f"{row['City']} ({row['Ycase']}, {row['Scase']}) {row['Horizon']}"
+        for col, (ratio, floor) in THRESHOLDS.items():
+            baseline = past[col].median()
+            if pd.isna(baseline) or pd.isna(row[col]):
+                continue
+            if row[col] > baseline * ratio and row[col] - baseline > floor:
+                flags.append(f"{case}: {col} {row[col]:.2f} vs baseline {baseline:.2f} "
+                             f"(+{(row[col] / baseline - 1) * 100:.0f}%)")
+        last = past.iloc[-1]
+        for col in SIZE_COLUMNS:
+            if not pd.isna(last[col]) and not pd.isna(row[col]) and row[col] != last[col]:
+                flags.append(f"{case}: {col} changed from {int(last[col])} to {int(row[col])}")
+    return flags
+
+
+def append_history(current, history_path=DEFAULT_HISTORY):
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    write_header = not os.path.isfile(history_path)
+    current.to_csv(history_path, mode='a', header=write_header, index=False)
+
+
+def read_history(history_path=DEFAULT_HISTORY):
+    if not os.path.isfile(history_path):
+        return pd.DataFrame()
+    return pd.read_csv(history_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark model build, solve and extraction")
+    parser.add_argument('--horizons', nargs='*', default=QUICK_HORIZONS, choices=list(HORIZONS),
+                        help="Reduced horizons to run; add 'year' for the full 8760 h model")
+    parser.add_argument('--solver', default=DEFAULT_SOLVER)
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--history', default=DEFAULT_HISTORY)
+    parser.add_argument('--no-record', action='store_true', help="Compare against the history without appending")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 on any regression")
+    args = parser.parse_args()
+
+    current = run_benchmarks(horizons=args.horizons, solver_name=args.solver, profiles_dir=args.profiles_dir)
+    print(current[['City', 'Ycase', 'Scase', 'Horizon', 'Build_s', 'Init_s', 'Solve_s', 'Extract_s',
+                   'Rows', 'Cols', 'Nonzeros', 'Peak_rss_MB']].to_string(index=False, float_format='%.2f'))
+
+    flags = check_regressions(current, read_history(args.history))
+    if not args.no_record:
+        append_history(current, args.history)
+        print(f"\n Appended {len(current)} runs to '{args.history}'.")
+
+    if flags:
+        print("\n Regressions:")
+        for flag in flags:
+            print(f"  - {flag}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\n No regressions against the recorded history.")
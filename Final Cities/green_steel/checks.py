@@ -0,0 +1,97 @@
+import numpy as np
+import pyomo.environ as pyo
+
+# ======================
+# POST-SOLVE PHYSICAL CHECKS
+# ======================
+# Re-evaluates the model's physical balances on the solution arrays, so a
+# solve that ends "optimal" with a numerically broken solution is flagged
+# in its results row instead of going unnoticed. Every check is a residual
+# array (one entry per hour, or one for an annual balance) that must be
+# within CHECK_ATOL + CHECK_RTOL times the size of the terms it balances;
+# inequalities only count their violated side.
+
+CHECK_RTOL = 1e-6
+CHECK_ATOL = 1e-6
+
+
+def hourly(var, *index):
+    # Values of var[t, *index] over model.T (unset values read as 0)
+    model = var.model()
+    return np.fromiter((var[(t,) + index].value or 0.0 for t in model.T), dtype=np.float64, count=len(model.T))
+
+
+def _storage_residual(level, inflow, outflow):
+    # L[t] - L[t-1] - (in - out), with L[0] = 0 as in rule_bat_t1 / rule_CGH2_t1
+    return level - np.concatenate([[0.0], level[:-1]]) - (inflow - outflow)
+
+
+def physical_residuals(model):
+    # {check: (residuals, scale)}; equalities give signed residuals,
+    # inequalities their violation (positive when broken)
+    s = next(iter(model.Scase))
+    h = {name: hourly(model.component(name)) for name in (
+        'P_bat_inv', 'P_FC', 'P_grid_import', 'P_cons_AC', 'P_cons_DC', 'L_bat_st', 'P_w_inv', 'P_s_inv', 'P_bat',
+        'L_CGH2_st', 'CGH2_in_st', 'CGH2_DRI', 'CGH2_FC', 'CGH2_H2heat', 'H2_ely', 'aly_in_EAF', 'eld_in_EAF',
+        'LS_out_EAF', 'slag_out_EAF')}
+    P_RE = sum(hourly(model.P_RE, i) for i in model.I)
+    eff_bat = pyo.value(model.eff_bat)
+
+    supply = P_RE + h['P_bat_inv'] + h['P_FC'] + h['P_grid_import']
+    demand = h['P_cons_AC'] + h['P_cons_DC']
+    residuals = {'power_balance': (supply - demand, np.maximum(supply, demand))}
+
+    bat_in = (h['P_w_inv'] + h['P_s_inv']) * eff_bat
+    bat_out = h['P_bat'] / eff_bat
+    residuals['bat_storage'] = (_storage_residual(h['L_bat_st'], bat_in, bat_out),
+                                np.maximum.reduce([h['L_bat_st'], bat_in, bat_out]))
+    cgh2_out = h['CGH2_DRI'] + h['CGH2_FC'] + h['CGH2_H2heat']
+    residuals['CGH2_storage'] = (_storage_residual(h['L_CGH2_st'], h['CGH2_in_st'], cgh2_out),
+                                 np.maximum.reduce([h['L_CGH2_st'], h['CGH2_in_st'], cgh2_out]))
+
+    # Levels within valley and peak (the rows lazy_storage may leave out)
+    bounds = []
+    for level, valley, peak in (('L_bat_st', 'L_bat_st_valley', 'L_bat_st_peak'),
+                                ('L_CGH2_st', 'L_CGH2_st_valley', 'L_CGH2_st_peak')):
+        low, high = pyo.value(model.component(valley)), pyo.value(model.component(peak))
+        bounds.append((np.maximum(np.maximum(low - h[level], h[level] - high), 0.0),
+                       np.full(len(model.T), max(abs(low), abs(high)))))
+    residuals['storage_bounds'] = (np.concatenate([b[0] for b in bounds]), np.concatenate([b[1] for b in bounds]))
+
+    h2_dri = hourly(model.H2_DRI, s)
+    produced, used = h['H2_ely'].sum(), h['CGH2_in_st'].sum() + h2_dri.sum()
+    residuals['H2_balance'] = (np.array([produced - used]), np.array([max(produced, used)]))
+
+    eaf_in = hourly(model.DRI_in_EAF, s) + hourly(model.scr_in_EAF, s) + hourly(model.lime_in_EAF, s) \
+        + h['aly_in_EAF'] + h['eld_in_EAF']
+    eaf_out = h['LS_out_EAF'] + h['slag_out_EAF']
+    residuals['EAF_in_out'] = (eaf_in - eaf_out, np.maximum(eaf_in, eaf_out))
+
+    dem = pyo.value(model.dem_SFS)
+    steel = h['LS_out_EAF'].sum()
+    unserved = pyo.value(model.unserved_steel) if model.component('unserved_steel') is not None else 0.0
+    residuals['demand'] = (np.array([steel + unserved - dem]), np.array([dem]))
+
+    T_RE = P_RE.sum()
+    needed = pyo.value(model.min_renewable_share) * (demand.sum() + h['P_grid_import'].sum())
+    residuals['renewable_share'] = (np.array([max(needed - T_RE, 0.0)]), np.array([max(T_RE, needed)]))
+    supplied = T_RE + h['P_grid_import'].sum()
+    residuals['energy_adequacy'] = (np.array([max(demand.sum() - supplied, 0.0)]),
+                                    np.array([max(supplied, demand.sum())]))
+    return residuals
+
+
+def physical_checks(model, rtol=CHECK_RTOL, atol=CHECK_ATOL):
+    # Results-row columns: the largest residual of each check, how many
+    # entries breach tolerance, and overall pass/fail with the failing checks
+    row = {}
+    failed = []
+    for name, (residual, scale) in physical_residuals(model).items():
+        breach = np.abs(residual) > atol + rtol * np.abs(scale)
+        row[f'Check_{name}_max_residual'] = float(np.abs(residual).max()) if residual.size else 0.0
+        row[f'Check_{name}_breaches'] = int(breach.sum())
+        if breach.any():
+            failed.append(name)
+    row['Physical_checks_passed'] = not failed
+    row['Physical_check_failures'] = ';'.join(failed)
+    return row
@@ -0,0 +1,291 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from green_steel.fingerprints import FINGERPRINT_COLUMN
+from green_steel.model import SCASES, YCASES
+from green_steel.runner import DEFAULT_RESULTS_DIR, build_jobs, job_profile, read_results_store, run_jobs, write_results
+from green_steel.screening import DEM_SFS, plant_flows
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.validation import VALIDATION_COLUMNS, validate_design
+from green_steel.warm_start import profile_features
+
+# ======================
+# REPRESENTATIVE SITES
+# ======================
+# Groups sites whose VRE profiles are alike (profile_features, standardised
+# over the sites) by k-medoids, so that every cluster is represented by one
+# of its own cities. A scenario sweep is then solved for the representatives
+# only and each other city takes its representative's results. Ore
+# transport only shifts OPEX, so that part of the cost is corrected exactly
+# for the member's own transport cost. The profile difference is not
+# corrected. LCOS_error_estimate_USD_per_t is an empirical estimate, not a
+# bound: profile distance times the steepest cost change per unit distance
+# seen between representatives of the same scenario (of any scenario when
+# it has fewer than two; NaN with a single representative).
+#
+# Propagated rows are then validated: the representative's design is
+# re-dispatched on the member's own profile and transport cost
+# (green_steel.validation), which gives the member's real cost and unserved
+# steel for that design. The re-dispatch is feasible for the member, so
+# when it serves all the steel its cost is an upper bound on the member's
+# optimal LCOS (LCOS_upper_bound_USD_per_t). It is one full-year LP per
+# row and not much cheaper than solving the member (6.7 s against 10.4 s
+# at 720 h), so by default only the VALIDATE_SAMPLE members of each
+# cluster farthest from their representative are re-dispatched
+# (--validate-sample K; --validate-all for every member, --no-validate to
+# skip). Every row of a cluster and scenario then carries the largest
+# |LCOS gap| seen among its validated members
+# (Cluster_validated_gap_USD_per_t), a measured check on the error
+# estimate; rows that were not re-dispatched have no bound. Representative
+# rows saved before the full design was written out (the committed
+# per-city results) cannot be re-dispatched: their members are left
+# unvalidated, with a warning.
+# Representatives are solved rows: their bound is their own cost and their
+# validation columns stay empty.
+
+MAX_KMEDOIDS_ITERATIONS = 100
+CLUSTER_KEYS = ['Objective', 'WeatherYear', 'Ycase', 'Scase']
+# Results columns that shift with the ore transport cost
+PER_TONNE_COLUMNS = ['Cost_per_tonne', 'LCOS_inc_ore', 'LCOS_exc_ore', 'TransportCost_per_tonne_steel']
+MUSD_COLUMNS = ['TotalCost', 'Total_aOPEX_mUSD_per_year', 'TotalTransportCost_mUSD']
+# Results column of each design capacity -> its validation.FIRST_STAGE name
+DESIGN_CAPACITIES = {'Solar': 'c_RE_s', 'Wind': 'c_RE_w', 'Electrolyzer': 'c_ely', 'FuelCell': 'c_FC', 'EAF': 'c_EAF',
+                     'Battery_storage_capacity_MWh': 'Lmax_bat_st', 'CGH2_storage_capacity_t': 'Lmax_CGH2_st',
+                     'CGH2_compressor_t_per_h': 'CGH2_in_st_max', 'Caster_t_per_h': 'LS_out_EAF_max'}
+UNSERVED_ATOL = 1e-6  # t steel
+VALIDATE_SAMPLE = 1  # Members re-dispatched per cluster by default
+
+
+def site_features(sites, store_dir=None):
+    # (sites x features), standardised over the given sites
+    X = np.vstack([profile_features(job_profile(site, store_dir)) for site in sites.to_dict('records')])
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    return (X - X.mean(axis=0)) / scale
+
+
+def kmedoids(D, k, max_iterations=MAX_KMEDOIDS_ITERATIONS):
+    # D: (n x n) distances. Returns (medoid indices, cluster label of each point).
+    # Starts from the most central point, then repeatedly the farthest one.
+    n = len(D)
+    k = min(k, n)
+    medoids = [int(np.argmin(D.sum(axis=1)))]
+    while len(medoids) < k:
+        medoids.append(int(np.argmax(D[:, medoids].min(axis=1))))
+    medoids = np.array(medoids)
+    for _ in range(max_iterations):
+        labels = np.argmin(D[:, medoids], axis=1)
+        new = medoids.copy()
+        for c in range(k):
+            members = np.flatnonzero(labels == c)
+            new[c] = members[np.argmin(D[np.ix_(members, members)].sum(axis=1))]
+        if np.array_equal(new, medoids):
+            break
+        medoids = new
+    return medoids, np.argmin(D[:, medoids], axis=1)
+
+
+def choose_representatives(sites, n_clusters, store_dir=None):
+    # (one row per site: its cluster, representative city and profile
+    # distance to it; the site distance matrix)
+    sites = sites.reset_index(drop=True)
+    Z = site_features(sites, store_dir)
+    D = np.linalg.norm(Z[:, None, :] - Z[None, :, :], axis=2)
+    medoids, labels = kmedoids(D, n_clusters)
+    rep = medoids[labels]
+    return pd.DataFrame({
+        'City': sites['City'],
+        'Province': sites['Province'] if 'Province' in sites else '',
+        'Cluster': labels,
+        'Representative': sites['City'].to_numpy()[rep],
+        'Profile_distance': D[np.arange(len(sites)), rep],
+        'Is_representative': rep == np.arange(len(sites)),
+    }), D
+
+
+def transport_cost_shift(ycase, scase, delta_transport):
+    # $/t steel added by a change in ore transport cost ($/t ore)
+    return plant_flows(ycase, scase)['T_ore_ROM'] / DEM_SFS * delta_transport
+
+
+def _lipschitz(rep_rows, D, index):
+    # Steepest |Cost_per_tonne| change per unit profile distance between
+    # representatives solved for the same scenario; a scenario with fewer
+    # than two takes the steepest over all scenarios
+    slopes = {}
+    for key, group in rep_rows.groupby(CLUSTER_KEYS, dropna=False):
+        cities = group['City'].to_numpy()
+        cost = group['Cost_per_tonne'].to_numpy()
+        if len(cities) < 2:
+            slopes[key] = np.nan
+            continue
+        i = np.array([index[c] for c in cities])
+        d = D[np.ix_(i, i)]
+        pairs = np.triu(np.ones_like(d, dtype=bool), 1) & (d > 0)
+        slopes[key] = np.max(np.abs(cost[:, None] - cost[None, :])[pairs] / d[pairs]) if pairs.any() else np.nan
+    known = [slope for slope in slopes.values() if not np.isnan(slope)]
+    steepest = max(known) if known else np.nan
+    return {key: steepest if np.isnan(slope) else slope for key, slope in slopes.items()}
+
+
+def propagate_results(clusters, D, rep_rows, transport):
+    # rep_rows: solved results rows of the representatives; transport:
+    # {City: $/t ore}. Returns a row per site and scenario of rep_rows.
+    rep_rows = pd.DataFrame(rep_rows)
+    index = {city: i for i, city in enumerate(clusters['City'])}
+    own_transport = np.array([transport_cost_shift(y, s, transport[c])
+                              for c, y, s in zip(rep_rows['City'], rep_rows['Ycase'], rep_rows['Scase'])])
+    slopes = _lipschitz(rep_rows.assign(Cost_per_tonne=rep_rows['Cost_per_tonne'] - own_transport), D, index)
+
+    rows = []
+    for member in clusters.to_dict('records'):
+        for rep in rep_rows[rep_rows['City'] == member['Representative']].to_dict('records'):
+            row = dict(rep)
+            row.pop('Profile', None)
+            estimate = 0.0
+            if not member['Is_representative']:
+                delta = transport_cost_shift(rep['Ycase'], rep['Scase'],
+                                             transport[member['City']] - transport[rep['City']])
+                for col in PER_TONNE_COLUMNS:
+                    if col in row:
+                        row[col] += delta
+                for col in MUSD_COLUMNS:
+                    if col in row:
+                        row[col] += delta * DEM_SFS / 1e6
+                row[FINGERPRINT_COLUMN] = np.nan  # Never mistaken for a solved row
+                estimate = member['Profile_distance'] * slopes[tuple(rep[k] for k in CLUSTER_KEYS)]
+            row.update({
+                'City': member['City'],
+                'Cluster': member['Cluster'],
+                'Propagated_from': '' if member['Is_representative'] else member['Representative'],
+                'Profile_distance': member['Profile_distance'],
+                'LCOS_error_estimate_USD_per_t': estimate,
+            })
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def missing_capacities(design):
+    return [col for col in DESIGN_CAPACITIES if col not in design or pd.isna(design[col])]
+
+
+def validate_propagated(job, row, design, solver_name='gurobi', store_dir=None):
+    # Validation columns of a propagated row: the representative's design
+    # (results row with DESIGN_CAPACITIES) re-dispatched for the member
+    missing = missing_capacities(design)
+    if missing:
+        raise ValueError(f"Design for {job['City']} is missing {missing}; re-solve its representative")
+    estimate = {
+        'capacities': {name: float(design[col]) for col, name in DESIGN_CAPACITIES.items()},
+        'cost_per_tonne': row['Cost_per_tonne'],
+        'grid_import_MWh': design.get('GridImport', np.nan),
+    }
+    return validate_design(job, estimate, solver_name, store_dir)
+
+
+def upper_bound(row):
+    # Re-dispatched cost of a cost-objective row that serves all its steel
+    if row['Objective'] != 'cost' or not row['Unserved_steel_t'] <= UNSERVED_ATOL:
+        return np.nan
+    return row['Full_cost_per_tonne']
+
+
+def farthest_members(clusters, per_cluster):
+    # Cities of the per_cluster members of each cluster farthest from their
+    # representative
+    members = clusters[~clusters['Is_representative']].sort_values('Profile_distance', ascending=False)
+    return set(members.groupby('Cluster').head(per_cluster)['City'])
+
+
+def add_validation(results, sites, rep_rows, solver_name='gurobi', store_dir=None, cities=None):
+    # VALIDATION_COLUMNS and LCOS_upper_bound_USD_per_t for every row,
+    # re-dispatching the propagated rows of the given cities (default all).
+    # Rows whose representative design is incomplete are left unvalidated.
+    sites = sites.set_index('City')
+    designs = {tuple(r[k] for k in ['City'] + CLUSTER_KEYS): r for r in pd.DataFrame(rep_rows).to_dict('records')}
+    incomplete = {}
+    rows = []
+    for row in results.to_dict('records'):
+        design = designs.get(tuple(row[k] for k in ['Propagated_from'] + CLUSTER_KEYS))
+        missing = missing_capacities(design) if design is not None else []
+        if not row['Propagated_from']:
+            row.update(dict.fromkeys(VALIDATION_COLUMNS, np.nan))
+            row['LCOS_upper_bound_USD_per_t'] = row['Cost_per_tonne']
+        elif (cities is not None and row['City'] not in cities) or missing:
+            row.update(dict.fromkeys(VALIDATION_COLUMNS, np.nan))
+            row['LCOS_upper_bound_USD_per_t'] = np.nan
+            if missing and (cities is None or row['City'] in cities):
+                incomplete.setdefault(row['Propagated_from'], missing)
+        else:
+            job = build_jobs(sites.loc[[row['City']]].reset_index(), [row['Ycase']], [row['Scase']],
+                             objective=row['Objective'])[0]
+            row.update(validate_propagated(job, row, design, solver_name, store_dir))
+            row['LCOS_upper_bound_USD_per_t'] = upper_bound(row)
+        rows.append(row)
+    for city, missing in incomplete.items():
+        print(f" Warning: the saved design of {city} is missing {missing}; its members were not validated "
+              "(re-solve it to validate them).")
+    results = pd.DataFrame(rows)
+    gap = results['LCOS_gap_USD_per_t'].abs()
+    results['Cluster_validated_gap_USD_per_t'] = gap.groupby(
+        [results[k] for k in ['Cluster'] + CLUSTER_KEYS], dropna=False).transform('max')
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve representative cities and propagate to their clusters")
+    parser.add_argument('--clusters', type=int, required=True)
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--ycases', nargs='*', default=YCASES)
+    parser.add_argument('--scases', nargs='*', default=SCASES)
+    parser.add_argument('--solve', action='store_true',
+                        help="Solve the representatives (otherwise use their saved results)")
+    parser.add_argument('--validate-sample', type=int, default=VALIDATE_SAMPLE, metavar='K',
+                        help="Re-dispatch the representative designs for the K members of each cluster farthest "
+                             "from their representative (one full-year LP per propagated row)")
+    parser.add_argument('--validate-all', action='store_true',
+                        help="Re-dispatch every propagated row, at nearly the cost of solving each member")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="Skip the re-dispatch; the results then carry only the error estimate")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out-dir', default=DEFAULT_RESULTS_DIR,
+                        help="Folder of the representatives' results CSVs, as written by green_steel.runner")
+    parser.add_argument('--in-place', action='store_true',
+                        help="Use the committed results next to the profiles instead (--solve replaces them); "
+                             "they have no full designs, so their members are not validated")
+    parser.add_argument('--clusters-out', default='site_clusters.csv')
+    parser.add_argument('--out', default='cluster_results.csv')
+    args = parser.parse_args()
+    out_dir = None if args.in_place else args.out_dir
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    clusters, D = choose_representatives(sites, args.clusters, args.store_dir)
+    clusters.to_csv(args.clusters_out, index=False)
+    reps = sites[sites['City'].isin(clusters.loc[clusters['Is_representative'], 'City'])]
+    print(f" {len(sites)} sites -> {len(reps)} representatives: {', '.join(reps['City'])}")
+
+    if args.solve:
+        jobs = build_jobs(reps, args.ycases, args.scases)
+        rows = run_jobs(jobs, workers=args.workers, solver_name=args.solver, store_dir=args.store_dir)
+        for path in write_results(rows, jobs, out_dir, merge=True, overwrite=args.in_place):
+            print(f" Results saved to '{path}'.")
+    rep_rows = pd.DataFrame(read_results_store(reps, out_dir))
+    if rep_rows.empty:
+        raise SystemExit("No results for the representatives; run with --solve")
+    rep_rows = rep_rows[rep_rows['Ycase'].isin(args.ycases) & rep_rows['Scase'].isin(args.scases)]
+    transport = dict(zip(sites['City'], sites['TransportCost_USD_per_t']))
+    results = propagate_results(clusters, D, rep_rows, transport)
+    if not args.no_validate:
+        cities = None if args.validate_all else farthest_members(clusters, args.validate_sample)
+        results = add_validation(results, sites, rep_rows, args.solver, args.store_dir, cities)
+    results.to_csv(args.out, index=False)
+    print(f" Clusters saved to '{args.clusters_out}', results for {results['City'].nunique()} sites to '{args.out}'.")
@@ -0,0 +1,248 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from green_steel.model import (ALPHA_CMP2B, ALPHA_CMP200B, ALPHA_CST, ALPHA_DRI, ALPHA_H2HEAT, CGH2_COMPRESSOR_UCOST,
+                               CGH2_STORAGE_UCOST, EFF_BAT, EFF_INV, F_CR, F_MAINT, GRID_PENALTY_USD_PER_MWH, H_BAT,
+                               LAND_SOLAR, LAND_WIND, REP, FC_values, ely_values, ucost_data)
+from green_steel.profiles import HOURS_PER_YEAR
+from green_steel.runner import build_jobs, job_profile
+from green_steel.screening import DEM_SFS, plant_capex, plant_flows, plant_opex
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.validation import UNSERVED_PENALTY_USD_PER_T
+
+# ======================
+# RULE-BASED DISPATCH SIMULATOR
+# ======================
+# Evaluates fixed capacity designs without an LP. Steel, DRI hydrogen and
+# DRI are each balanced over the horizon, as in the LP (demand_constraint,
+# total_H2_balance, DRI_cons), and dispatched hourly in that order: steel
+# between 0 and c_EAF (casting load), hydrogen up to the electrolyser
+# (ely_values MWh/t H2 on the DC bus plus its inverter feed), then DRI
+# (2 bar compression and electric H2 heating), which like the LP's DRP has
+# no hourly limit and takes up the rest of a VRE peak. Each runs as hard as
+# VRE, battery and fuel cell can carry it until the horizon's share of
+# dem_SFS is covered, and only draws on the grid when the hours left at
+# full rate could no longer make the rest. Remaining surplus charges the
+# battery (eff_bat), then, with a fuel cell, stores hydrogen for it in CGH2
+# (200 bar compression), then is curtailed. A deficit is met by the
+# battery, then the fuel cell, then grid import. The horizon is run twice,
+# the second time from the first run's end storage levels, so storage
+# cycles as it does over the LP's annual balances.
+# Totals of a horizon shorter than a year are annualised by its f_t.
+#
+# Costs use the formulas of create_complete_green_steel_model, with its
+# coefficients imported from green_steel.model. Hours are stepped in
+# Python but every step is vectorised over the designs, so a batch of many
+# designs for one site costs about as much as a single one. Milliseconds
+# per design hold only in batches: a batch of 1000 took 3.7 ms per design,
+# a single design 2.3 s.
+# For the LP's own design the simulated cost matches the LP's to within
+# 0.1 % (tests/test_dispatch_sim.py), but it is not a bound on the LP's
+# cost for other capacities: the dispatch is greedy, but its storage starts
+# INITIAL_FILL full (the LP's starts empty) and is rerun from its end
+# levels. It ranks and screens designs; validation.redispatch gives their
+# exact LP cost.
+
+DESIGN_COLUMNS = ['Solar', 'Wind', 'Electrolyzer', 'FuelCell', 'EAF', 'Battery_storage_capacity_MWh',
+                  'CGH2_storage_capacity_t']
+INITIAL_FILL = 0.5  # Storage level at the start of the first pass
+
+
+def _column(designs, name, n):
+    return np.broadcast_to(np.asarray(designs[name], dtype=np.float64), (n,)).copy()
+
+
+def _run(due, rate_max, affordable, hours_left):
+    # Hourly output towards what is still due over the horizon: what the
+    # available power affords, at least what the hours left at rate_max
+    # could no longer make
+    must = np.maximum(due - hours_left * rate_max, 0.0)
+    return np.minimum(np.minimum(due, rate_max), np.maximum(affordable, must))
+
+
+def dispatch(designs, profile, ycase, scase, grid_price_t=None, dem=DEM_SFS):
+    # designs: {DESIGN_COLUMNS name: array over designs} (or a DataFrame).
+    # grid_price_t is hourly $/MWh, as the model's grid_price_t.
+    # Returns annual totals, one array entry per design.
+    missing = [name for name in DESIGN_COLUMNS if name not in designs]
+    if missing:
+        raise ValueError(f"Designs are missing {missing}; every design needs all of {DESIGN_COLUMNS}")
+    profile = np.asarray(profile[:HOURS_PER_YEAR], dtype=np.float64)
+    n_hours = len(profile)
+    n = max(np.size(np.asarray(designs[name])) for name in DESIGN_COLUMNS)
+    c = {name: _column(designs, name, n) for name in DESIGN_COLUMNS}
+    price = np.full(n_hours, GRID_PENALTY_USD_PER_MWH, dtype=np.float64) if grid_price_t is None else \
+        np.asarray(grid_price_t, dtype=np.float64)
+    if len(price) != n_hours:
+        raise ValueError(f"Grid price series has {len(price)} hours but the profile has {n_hours}")
+
+    flows = plant_flows(ycase, scase, dem)
+    f_t = n_hours / HOURS_PER_YEAR
+    ely = ely_values[ycase] * (1 + 1 / EFF_INV)  # MWh drawn per t H2, DC bus plus inverter feed
+    dri_per_t = flows['DRI_per_t_steel']
+    dri_load = ALPHA_CMP2B + ALPHA_H2HEAT / 3600  # MWh AC per t DRI
+    h2_per_t = ALPHA_DRI * dri_per_t  # t H2 per t steel
+    h2_ely_max = c['Electrolyzer'] / ely_values[ycase]
+    bat_power = c['Battery_storage_capacity_MWh'] / H_BAT
+    fc_power = c['FuelCell'] * EFF_INV  # CGH2_FC <= c_FC * alpha_FC
+    fc_h2 = FC_values[ycase] / EFF_INV  # t H2 per MWh delivered
+    store_h2 = fc_power > 0  # CGH2 storage only feeds the fuel cell
+
+    gen = profile[:, 0][:, None] * c['Solar'] + profile[:, 1][:, None] * c['Wind']
+    keys = ('RE', 'curtail', 'P_plant', 'H2', 'CGH2_in', 'CGH2_FC', 'FC', 'grid', 'grid_cost')
+    bat = INITIAL_FILL * c['Battery_storage_capacity_MWh']
+    cgh2 = INITIAL_FILL * c['CGH2_storage_capacity_t']
+    for _ in range(2):
+        totals = {k: np.zeros(n) for k in keys}
+        cgh2_in_max = np.zeros(n)
+        steel_max = np.zeros(n)
+        # t steel, DRI and H2 still to make this horizon
+        steel_due = np.full(n, dem * f_t)
+        dri_due = steel_due * dri_per_t
+        h2_due = steel_due * h2_per_t
+        for t in range(n_hours):
+            supply = gen[t]
+            left = n_hours - t - 1
+
+            # Steel, hydrogen, then DRI: as much as VRE and storage can
+            # carry, unless the hours left could no longer make the rest
+            stored = np.minimum(bat_power, bat * EFF_BAT) + np.minimum(fc_power, cgh2 / fc_h2)
+            net = supply + stored
+            steel = _run(steel_due, c['EAF'], net / ALPHA_CST, left)
+            net = net - steel * ALPHA_CST
+            h2 = _run(h2_due, h2_ely_max, np.maximum(net, 0.0) / ely, left)
+            net = net - h2 * ely
+            dri = _run(dri_due, dri_due, np.maximum(net, 0.0) / dri_load, left)
+            net = net - dri * dri_load - stored
+            steel_due = steel_due - steel
+            dri_due = dri_due - dri
+            h2_due = h2_due - h2
+
+            # Surplus: battery, then hydrogen for the fuel cell, then curtail
+            surplus = np.maximum(net, 0.0)
+            charge = np.minimum(np.minimum(surplus, bat_power), (c['Battery_storage_capacity_MWh'] - bat) / EFF_BAT)
+            bat = bat + charge * EFF_BAT
+            surplus = surplus - charge
+            to_store = np.minimum.reduce([surplus / (ely + ALPHA_CMP200B), h2_ely_max - h2,
+                                          c['CGH2_storage_capacity_t'] - cgh2])
+            to_store = np.where(store_h2, np.maximum(to_store, 0.0), 0.0)
+            cgh2 = cgh2 + to_store
+            surplus = surplus - to_store * (ely + ALPHA_CMP200B)
+
+            # Deficit: battery, fuel cell, grid
+            deficit = np.maximum(-net, 0.0)
+            discharge = np.minimum.reduce([deficit, bat_power, bat * EFF_BAT])
+            bat = bat - discharge / EFF_BAT
+            deficit = deficit - discharge
+            fc = np.minimum.reduce([deficit, fc_power, cgh2 / fc_h2])
+            cgh2 = cgh2 - fc * fc_h2
+            grid = deficit - fc
+
+            totals['RE'] += supply
+            totals['curtail'] += surplus
+            totals['P_plant'] += steel * ALPHA_CST + dri * dri_load + to_store * ALPHA_CMP200B
+            totals['H2'] += h2 + to_store
+            totals['CGH2_in'] += to_store
+            totals['CGH2_FC'] += fc * fc_h2
+            totals['FC'] += fc
+            totals['grid'] += grid
+            totals['grid_cost'] += grid * price[t] / 1e6
+            cgh2_in_max = np.maximum(cgh2_in_max, to_store)
+            steel_max = np.maximum(steel_max, steel)
+    # Steel only counts as served with its DRI and hydrogen
+    served = dem * f_t - np.maximum.reduce([steel_due, dri_due / dri_per_t, h2_due / h2_per_t])
+    totals = {k: v / f_t for k, v in totals.items()}
+    totals['unserved_steel'] = dem - served / f_t
+    totals['CGH2_DRI'] = np.zeros(n)
+    totals['CGH2_in_max'] = cgh2_in_max
+    totals['T_P_ely'] = totals['H2'] * ely_values[ycase]
+    totals['T_P_plant'] = totals.pop('P_plant')
+    totals['capacities'] = c
+    totals['flows'] = flows
+    totals['LS_max'] = steel_max
+    return totals
+
+
+def design_costs(totals, ycase, transport_cost_per_tonne, dem=DEM_SFS):
+    # LCOS, LCOH and grid share of dispatched designs, from the LP's CAPEX,
+    # annualisation, OPEX and T_energy definitions
+    c = totals['capacities']
+    flows = totals['flows']
+    u = {tech: ucost_data[tech][ycase] for tech in ucost_data}
+    capex = {
+        's': u['s'] * c['Solar'],
+        'w': u['w'] * c['Wind'],
+        'bat': u['bat'] * REP * c['Battery_storage_capacity_MWh'] / H_BAT,
+        'ely': u['ely'] * c['Electrolyzer'] * REP,
+        'FC': u['FC'] * c['FuelCell'] * REP,
+        'CGH2': CGH2_COMPRESSOR_UCOST * totals['CGH2_in_max'] + CGH2_STORAGE_UCOST * c['CGH2_storage_capacity_t'],
+        **plant_capex(flows, c['EAF'], totals['LS_max']),
+    }
+    T_capex = sum(capex.values())
+    opex = F_MAINT * T_capex + plant_opex(flows, transport_cost_per_tonne, dem)
+    T_cost = F_CR * T_capex + opex + totals['grid_cost']
+    T_energy = totals['RE'] + flows['T_En_ore'] + totals['T_P_ely'] + totals['T_P_plant']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lcoh = (F_CR * capex['ely'] + T_cost * totals['T_P_ely'] / T_energy) * 1e6 / (totals['H2'] * 1000)
+    return {
+        'Cost_per_tonne': T_cost * 1e6 / dem,
+        'Penalised_cost_per_tonne': T_cost * 1e6 / dem + UNSERVED_PENALTY_USD_PER_T * totals['unserved_steel'] / dem,
+        'LCOH_USD_per_kg': lcoh,
+        'share_grid_in_total_energy': 100 * totals['grid'] / T_energy,
+        'GridImport': totals['grid'],
+        'Unserved_steel_t': totals['unserved_steel'],
+        'Total_VRE_Generation': totals['RE'],
+        'Curtailment_MWh': totals['curtail'],
+        'H2_Production': totals['H2'],
+        'CGH2_Storage': totals['CGH2_in'],
+        'CGH2_DRI': totals['CGH2_DRI'],
+        'CGH2_FC': totals['CGH2_FC'],
+        'FuelCell_Annual_Generation_MWh': totals['FC'],
+        'Total_Land_km2': LAND_SOLAR * c['Solar'] + LAND_WIND * c['Wind'],
+    }
+
+
+def simulate_designs(designs, profile, ycase, scase, transport_cost_per_tonne, grid_price_t=None):
+    # DataFrame of designs (all DESIGN_COLUMNS) -> the same rows with the
+    # simulated results appended
+    designs = designs.reset_index(drop=True)
+    inputs = {name: designs[name].to_numpy(dtype=np.float64) for name in DESIGN_COLUMNS if name in designs}
+    totals = dispatch(inputs, profile, ycase, scase, grid_price_t)
+    results = pd.DataFrame(design_costs(totals, ycase, transport_cost_per_tonne))
+    overlap = [col for col in results.columns if col in designs.columns]
+    return pd.concat([designs.rename(columns={col: f'LP_{col}' for col in overlap}), results], axis=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate capacity designs with the rule-based dispatch")
+    parser.add_argument('city')
+    parser.add_argument('designs', help="CSV with every design column (e.g. an MGA designs file, or a results file "
+                                        "written by the current runner; the committed "
+                                        "all_scenario_results_<City>.csv predate CGH2_storage_capacity_t and are "
+                                        "rejected)")
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    sites = sites[sites['City'] == args.city]
+    if sites.empty:
+        raise ValueError(f"No {args.year} profile for {args.city}")
+    job = build_jobs(sites, [args.ycase], [args.scase])[0]
+    designs = pd.read_csv(args.designs)
+    results = simulate_designs(designs, job_profile(job, args.store_dir), args.ycase, args.scase,
+                               job['TransportCost_USD_per_t'])
+    out_path = args.out or os.path.join(os.path.dirname(job['Profile']),
+                                        f'dispatch_sim_{args.city}_{args.ycase}_{args.scase}.csv')
+    results.to_csv(out_path, index=False)
+    print(results[['Cost_per_tonne', 'LCOH_USD_per_kg', 'share_grid_in_total_energy',
+                   'Unserved_steel_t']].describe().to_string())
+    print(f"\n Simulated {len(results)} designs saved to '{out_path}'.")
@@ -0,0 +1,127 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+from green_steel.model import (F_SCRAP, GRID_PENALTY_USD_PER_MWH, ROM_GRADE, FC_values, ely_values, extract_results,
+                               ucost_data)
+from green_steel.profiles import HOURS_PER_YEAR, VRE_SOURCES
+
+# ======================
+# JOB INPUT FINGERPRINTS
+# ======================
+# A job's fingerprint hashes everything its solution depends on: the VRE
+# profile bytes, the site parameters, the Ycase/Scase slices of the cost
+# and technology tables, the other module constants the builders read, and
+# the model source. The source hash covers every green_steel function on
+# the build path: those reachable from jobs.build_job_model and
+# extract_results through the names their code refers to (builder,
+# objective, initialiser, demand and profile handling). Source does not
+# show the module constants those functions read (ALPHA_DRI, EFF_BAT,
+# DISCOUNT_RATE, ...), so their current values are hashed as well
+# (build_path_constants). The scenario tables are left out of that and
+# hashed per slice in job_inputs, so correcting one entry only invalidates
+# the jobs that read it. Results rows carry the hash in InputFingerprint so
+# a re-run only re-solves jobs whose inputs changed.
+
+FINGERPRINT_COLUMN = 'InputFingerprint'
+# Hashed per Ycase/Scase slice in job_inputs
+SLICED_TABLES = {'ucost_data', 'ely_values', 'FC_values', 'F_SCRAP'}
+CONSTANT_TYPES = (bool, int, float, str, tuple, list, dict)
+
+# File hashes keyed by (absolute path, modification time, size)
+_file_hashes = {}
+_source_hash = None
+_constant_names = None
+
+
+def file_sha256(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def _code_names(code):
+    # Global and attribute names used by code and the functions nested in it
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def build_path_functions():
+    # green_steel functions a job's model and results row are built with
+    from green_steel.jobs import build_job_model  # jobs imports this module for job_fingerprint
+    found = {}
+    stack = [build_job_model, extract_results]
+    while stack:
+        func = stack.pop()
+        key = f'{func.__module__}.{func.__qualname__}'
+        if key in found:
+            continue
+        found[key] = func
+        for name in _code_names(func.__code__):
+            target = func.__globals__.get(name)
+            if inspect.isfunction(target) and target.__module__.startswith('green_steel.'):
+                stack.append(target)
+    return dict(sorted(found.items()))
+
+
+def build_path_constants():
+    # {module.name: value} of the public module constants read by the build
+    # path functions, read afresh so runtime changes are seen
+    global _constant_names
+    if _constant_names is None:
+        _constant_names = []
+        for func in build_path_functions().values():
+            for name in sorted(_code_names(func.__code__)):
+                value = func.__globals__.get(name)
+                if (isinstance(value, CONSTANT_TYPES) and not name.startswith('_')
+                        and name not in SLICED_TABLES):
+                    _constant_names.append((func.__module__, name))
+    return {f'{module}.{name}': vars(sys.modules[module])[name] for module, name in sorted(set(_constant_names))}
+
+
+def model_source_hash():
+    global _source_hash
+    if _source_hash is None:
+        digest = hashlib.sha256()
+        for func in build_path_functions().values():
+            digest.update(inspect.getsource(func).encode('utf-8'))
+        _source_hash = digest.hexdigest()
+    return _source_hash
+
+
+def job_inputs(job):
+    y, s = job['Ycase'], job['Scase']
+    inputs = {
+        'profile': file_sha256(job['Profile']),
+        'transport_cost_per_tonne': job['TransportCost_USD_per_t'],
+        'objective': job['Objective'],
+        'ucost': {tech: ucost_data[tech][y] for tech in sorted(ucost_data)},
+        'ely': ely_values[y],
+        'FC': FC_values[y],
+        'f_scrap': F_SCRAP[s],
+        'ROM_grade': ROM_GRADE,
+        'grid_penalty_USD_per_MWh': GRID_PENALTY_USD_PER_MWH,
+        'hours_per_year': HOURS_PER_YEAR,
+        'vre_sources': list(VRE_SOURCES),
+        'model_constants': build_path_constants(),
+        'model_source': model_source_hash(),
+    }
+    if 'Demand_t' in job:
+        inputs['demand_t'] = job['Demand_t']
+    return inputs
+
+
+def job_fingerprint(job):
+    payload = json.dumps(job_inputs(job), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
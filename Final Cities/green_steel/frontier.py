@@ -0,0 +1,170 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.marginal_prices import attach_duals
+from green_steel.model import OBJECTIVES, SCASES, YCASES, extract_results, objective_expression, solve_model
+from green_steel.runner import build_job_model, build_jobs
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+
+# ======================
+# EPSILON-CONSTRAINT FRONTIERS
+# ======================
+# Cost versus land (total_land, km2) or VRE embodied CO2 (total_CO2,
+# t CO2-e). One model per (city, Ycase, Scase) is built once and kept in a
+# persistent solver; between points only the epsilon right-hand side
+# changes, so each solve starts from the previous point's basis. Points
+# run from the cost-optimal design down to the minimum of the metric, which
+# is found by switching model.obj to the model's 'land' / 'co2' objective.
+#
+# The cost-optimal points of the land frontiers also give the wide table
+# read by Data Visualisations/LCOS_Land Use Ratio/LCOS_LU Ratio All.py:
+# one row per city, {Ycase}_{Scase} LCOS and {Ycase}_{Scase}_Land_Use km2.
+
+FRONTIER_METRICS = tuple(objective for objective in OBJECTIVES if objective != 'cost')
+LAND_USE_RATIO_FILE = 'LCOS_LU Ratio.csv'
+DEFAULT_FRONTIER_SOLVER = 'appsi_highs'
+# Dual simplex reuses the previous basis; barrier would start from scratch
+WARM_START_OPTIONS = {
+    'highs': {'solver': 'simplex', 'simplex_strategy': 1},
+    'gurobi': {'Method': 1},
+}
+# The min-metric anchor is re-solved for cost with this much slack on epsilon
+ANCHOR_SLACK = 1e-6
+
+
+def add_epsilon_constraint(model, metric):
+    # metric expression <= model.frontier_eps, initially non-binding
+    if metric not in FRONTIER_METRICS:
+        raise ValueError(f"Unknown frontier metric '{metric}'; choose from {list(FRONTIER_METRICS)}")
+    expr = objective_expression(model, metric)
+    model.frontier_eps = pyo.Param(mutable=True, initialize=1e12)
+    model.frontier_cap = pyo.Constraint(expr=expr <= model.frontier_eps)
+    return expr
+
+
+def warm_start_options(solver_name):
+    for family, options in WARM_START_OPTIONS.items():
+        if family in solver_name.lower():
+            return dict(options)
+    return {}
+
+
+def trace_frontier(job, metric='land', n_points=11, solver_name=DEFAULT_FRONTIER_SOLVER, store_dir=None):
+    # Frontier table for one job: one row per epsilon, cost-optimal point first
+    model = build_job_model(job, store_dir)
+    expr = add_epsilon_constraint(model, metric)
+    attach_duals(model)
+    solver = pyo.SolverFactory(solver_name)
+    options = warm_start_options(solver_name)
+    case = f"{job['City']} ({job['Ycase']}, {job['Scase']})"
+
+    def solve():
+        _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                            solver=solver)
+        if not optimal:
+            raise ValueError(f"{case}: frontier solve at epsilon={pyo.value(model.frontier_eps):.6g} "
+                             f"ended {telemetry['Solve_termination']}")
+        return telemetry
+
+    # Upper anchor: unconstrained cost optimum
+    solve()
+    metric_max = pyo.value(expr)
+
+    # Lower anchor: minimum achievable metric, from the same persistent model
+    model.obj.set_value(expr)
+    solve()
+    metric_min = pyo.value(expr)
+    model.obj.set_value(objective_expression(model, 'cost'))
+
+    rows = []
+    for point, eps in enumerate(np.linspace(metric_max, metric_min * (1 + ANCHOR_SLACK), n_points)):
+        model.frontier_eps.set_value(float(eps))
+        telemetry = solve()
+        row = extract_results(model)
+        row.update({
+            'City': job['City'],
+            'WeatherYear': job['WeatherYear'],
+            'Frontier_metric': metric,
+            'Point': point,
+            'Epsilon': float(eps),
+            'Metric_value': pyo.value(expr),
+            # $/t steel saved per unit of metric allowed (minus the epsilon dual)
+            'Tradeoff_USD_per_t_per_unit': -model.dual.get(model.frontier_cap, np.nan),
+            'Solve_wall_time_s': telemetry['Solve_wall_time_s'],
+            'Solve_simplex_iterations': telemetry['Solve_simplex_iterations'],
+        })
+        rows.append(row)
+
+    frontier = pd.DataFrame(rows)
+    base_cost = frontier['Cost_per_tonne'].iloc[0]
+    frontier['Cost_increase_pct'] = 100 * (frontier['Cost_per_tonne'] / base_cost - 1)
+    frontier['Metric_reduction_pct'] = 100 * (1 - frontier['Metric_value'] / metric_max) if metric_max > 0 else 0.0
+    return frontier
+
+
+def trace_frontiers(jobs, metrics=('land', 'co2'), n_points=11, solver_name=DEFAULT_FRONTIER_SOLVER,
+                    store_dir=None):
+    frames = []
+    for job in jobs:
+        for metric in metrics:
+            print(f" {job['City']} ({job['Ycase']}, {job['Scase']}): cost vs {metric}", flush=True)
+            frames.append(trace_frontier(job, metric, n_points, solver_name, store_dir))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def land_use_ratio_table(frontiers, sites):
+    # Cost-optimal LCOS and land of every traced (city, Ycase, Scase), in
+    # the layout of LCOS_LU Ratio.csv
+    optimum = frontiers[(frontiers['Frontier_metric'] == 'land') & (frontiers['Point'] == 0)]
+    if optimum.empty:
+        raise ValueError("No land frontiers to tabulate; trace the 'land' metric")
+    lcos = optimum.pivot(index='City', columns=['Ycase', 'Scase'], values='Cost_per_tonne')
+    land = optimum.pivot(index='City', columns=['Ycase', 'Scase'], values='Total_Land_km2')
+    order = [(y, s) for y in YCASES for s in SCASES if (y, s) in lcos.columns]
+    table = pd.concat([lcos[order].set_axis([f'{y}_{s}' for y, s in order], axis=1),
+                       land[order].set_axis([f'{y}_{s}_Land_Use' for y, s in order], axis=1)], axis=1)
+    provinces = sites.drop_duplicates('City').set_index('City')['Province']
+    table.insert(0, 'Province', provinces.reindex(table.index).fillna(''))
+    return table.reset_index()
+
+
+def frontier_path(city, metric, profile_path, out_dir=None):
+    folder = out_dir if out_dir is not None else os.path.dirname(profile_path)
+    return os.path.join(folder, f'frontier_cost_vs_{metric}_{city}.csv')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trace cost vs land / embodied CO2 frontiers")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--ycases', nargs='*', default=['YCurrent'])
+    parser.add_argument('--scases', nargs='*', default=['S1'])
+    parser.add_argument('--metrics', nargs='*', default=list(FRONTIER_METRICS), choices=list(FRONTIER_METRICS))
+    parser.add_argument('--points', type=int, default=11)
+    parser.add_argument('--solver', default=DEFAULT_FRONTIER_SOLVER, help="A persistent (appsi_*) solver")
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out-dir', default=None)
+    parser.add_argument('--ratio-out', default=LAND_USE_RATIO_FILE,
+                        help="LCOS vs land-use table for the LCOS_LU Ratio plot (written when 'land' is traced)")
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    jobs = build_jobs(sites, args.ycases, args.scases)
+    frontiers = trace_frontiers(jobs, args.metrics, args.points, args.solver, args.store_dir)
+
+    profiles = {job['City']: job['Profile'] for job in jobs}
+    for (city, metric), df in frontiers.groupby(['City', 'Frontier_metric']):
+        path = frontier_path(city, metric, profiles[city], args.out_dir)
+        df.to_csv(path, index=False)
+        print(f" Frontier saved to '{path}'.")
+    if 'land' in args.metrics and not frontiers.empty:
+        land_use_ratio_table(frontiers, sites).to_csv(args.ratio_out, index=False)
+        print(f" LCOS vs land use saved to '{args.ratio_out}'.")
@@ -0,0 +1,62 @@
+from green_steel.fingerprints import FINGERPRINT_COLUMN, job_fingerprint
+from green_steel.model import (F_SCRAP, ROM_GRADE, SCASES, YCASES, create_complete_green_steel_model,
+                               initialize_model_parameters)
+from green_steel.profile_store import open_profile_store, store_profile
+from green_steel.profiles import load_vre_profile
+
+# ======================
+# SCENARIO JOBS
+# ======================
+# One job per (site, Ycase, Scase) and the full-year model it stands for.
+# Kept apart from green_steel.runner so modules the runner itself calls
+# (green_steel.validation) can build job models too.
+
+# Profile stores opened by this process, keyed by (store_dir, year)
+_open_stores = {}
+
+
+def build_jobs(sites, ycases=YCASES, scases=SCASES, objective='cost'):
+    jobs = []
+    for site in sites.to_dict('records'):
+        for y in ycases:
+            for s in scases:
+                job = {
+                    'City': site['City'],
+                    'WeatherYear': site['WeatherYear'],
+                    'Profile': site['Profile'],
+                    'TransportCost_USD_per_t': float(site['TransportCost_USD_per_t']),
+                    'Ycase': y,
+                    'Scase': s,
+                    'Objective': objective,
+                }
+                job[FINGERPRINT_COLUMN] = job_fingerprint(job)
+                jobs.append(job)
+    return jobs
+
+
+def job_profile(job, store_dir=None):
+    # Memory-mapped store when available, otherwise the site's own CSV
+    if store_dir is not None:
+        key = (store_dir, job['WeatherYear'])
+        if key not in _open_stores:
+            _open_stores[key] = open_profile_store(store_dir, job['WeatherYear'])
+        if job['City'] in _open_stores[key][1]:
+            return store_profile(_open_stores[key], job['City'])
+    return load_vre_profile(job['Profile'])
+
+
+def build_job_model(job, store_dir=None):
+    y, s = job['Ycase'], job['Scase']
+    model = create_complete_green_steel_model(
+        ycase=y,
+        scase=s,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[s],
+        objective=job['Objective'],
+        transport_cost_per_tonne=job['TransportCost_USD_per_t'],
+    )
+    if 'Demand_t' in job:
+        # Annual steel output other than the default 1 Mt (portfolio runs)
+        model.dem_SFS_annual.set_value(job['Demand_t'])
+    initialize_model_parameters(model, y, s, job_profile(job, store_dir))
+    return model
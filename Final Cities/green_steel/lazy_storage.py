@@ -0,0 +1,101 @@
+import numpy as np
+import pyomo.environ as pyo
+
+from green_steel.model import solve_model
+from green_steel.telemetry import combine_telemetry
+
+# ======================
+# LAZY STORAGE BOUNDS
+# ======================
+# bat_st_lower/upper and CGH2_st_lower/upper hold every hourly storage
+# level between its valley and peak: four rows per hour, of which only a
+# few bind. The cutting-plane mode starts with all of them deactivated,
+# reads the level arrays after each solve, activates the rows of the hours
+# that break a bound and re-solves, until no hour does. A persistent
+# (appsi_*) solver only receives the new rows and restarts from the
+# previous basis; any other solver re-solves the smaller LP from scratch.
+# After MAX_LAZY_ROUNDS the full model is restored and solved once more.
+#
+# Measured on Anshan YCurrent/S1 at 720 h with appsi_highs, the mode does
+# not pay: the full LP takes 10.0 s (9846 iterations), the lazy solve
+# 15.2 s over 3 rounds (8374 iterations, 1336 of the 2880 rows added, same
+# objective). At 168 h it is 1.7 s against 1.2 s. The first round already
+# costs most of the full solve, and the warm-started rounds skip presolve.
+# Activating whole storages at once instead of single hours was also
+# slower (14.0 s against 10.9 s), as were cold re-solves seeded with every
+# 2nd to 24th hour's rows (19 to 34 s). It stays off by default (runner
+# --lazy-storage).
+
+# (level var, valley var, peak var, lower rows, upper rows)
+STORAGE_BOUNDS = [
+    ('L_bat_st', 'L_bat_st_valley', 'L_bat_st_peak', 'bat_st_lower', 'bat_st_upper'),
+    ('L_CGH2_st', 'L_CGH2_st_valley', 'L_CGH2_st_peak', 'CGH2_st_lower', 'CGH2_st_upper'),
+]
+LAZY_TOL = 1e-6  # Relative to the storage span (at least one unit)
+MAX_LAZY_ROUNDS = 50
+
+
+def _values(var):
+    return np.fromiter((v.value for v in var.values()), dtype=np.float64, count=len(var))
+
+
+def _set_storage_bounds(model, active):
+    # Row by row, so the components stay active and single hours can be
+    # switched back on
+    for _, _, _, lower, upper in STORAGE_BOUNDS:
+        for name in (lower, upper):
+            for row in model.component(name).values():
+                if active:
+                    row.activate()
+                else:
+                    row.deactivate()
+
+
+def violated_hours(model, tol=LAZY_TOL):
+    # {row component name: hours whose level breaks that bound}
+    hours = np.fromiter(model.T, dtype=np.int64, count=len(model.T))
+    violated = {}
+    for level, valley, peak, lower, upper in STORAGE_BOUNDS:
+        levels = _values(model.component(level))
+        low = pyo.value(model.component(valley))
+        high = pyo.value(model.component(peak))
+        eps = tol * max(high - low, 1.0)
+        violated[lower] = hours[levels < low - eps]
+        violated[upper] = hours[levels > high + eps]
+    return violated
+
+
+def solve_lazy_storage(model, solver_name='gurobi', options=None, max_rounds=MAX_LAZY_ROUNDS, tol=LAZY_TOL):
+    # Same return values as solve_model; telemetry is summed over the rounds
+    # and records how many rounds and storage rows were needed
+    solver = pyo.SolverFactory(solver_name)
+    _set_storage_bounds(model, False)
+    telemetries = []
+    rows_added = 0
+    for _ in range(max_rounds):
+        results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                                  solver=solver)
+        telemetries.append(telemetry)
+        if not optimal:
+            break
+        violated = violated_hours(model, tol)
+        n_violated = sum(len(h) for h in violated.values())
+        if n_violated == 0:
+            break
+        for name, hours in violated.items():
+            rows = model.component(name)
+            for t in hours.tolist():
+                rows[t].activate()
+        rows_added += n_violated
+    else:
+        # Out of rounds: restore the full model so the last solve is exact
+        _set_storage_bounds(model, True)
+        results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                                  solver=solver)
+        telemetries.append(telemetry)
+        rows_added = 2 * sum(len(model.component(lower)) for _, _, _, lower, _ in STORAGE_BOUNDS)
+
+    telemetry = combine_telemetry(telemetries)
+    telemetry['Lazy_rounds'] = len(telemetries)
+    telemetry['Lazy_storage_rows'] = rows_added
+    return results, optimal, telemetry
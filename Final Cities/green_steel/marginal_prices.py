@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pyomo.environ as pyo
+
+# ======================
+# HOURLY MARGINAL PRICES
+# ======================
+# Hourly shadow prices of electricity (P_Balance_AC2) and stored hydrogen
+# (CGH2_t1 / CGH2_mb with CGH2_annual) from the LP duals. The objective is in $/t
+# steel, so a dual times dem_SFS is the marginal cost in $ per unit of the
+# constraint (MWh, t H2). Unlike LCOH_USD_per_kg, which allocates total
+# cost by energy share, these are the values the plots should show.
+
+PRICE_PERCENTILES = (5, 25, 50, 75, 95)
+
+# hourly_power_balance is implied by P_Balance_AC1/DC1/DC2,
+# ely_power_source_strict and the inverter rows, so its dual is arbitrary.
+# The price is read from P_Balance_AC2 instead, where every AC process load
+# enters: one more MWh of load in the row raises its RHS, so its dual is
+# the cost of one more MWh.
+# Hydrogen is priced as one more t of compressed hydrogen entering storage
+# in hour t. Raising the RHS of CGH2_mb (CGH2_t1 in the first hour) alone
+# does not give that: CGH2_annual makes storage inflow equal outflow over
+# the horizon, so the extra hydrogen could never leave storage and its
+# dual is an arbitrary subgradient of a degenerate row. The hydrogen must
+# also count as inflow in CGH2_annual, whose body is inflow minus outflow,
+# so the value of hydrogen is minus the storage row's dual plus the
+# CGH2_annual dual.
+# The LP cannot curtail (RE_dispatch_limit fixes P_RE at VRE_prod * c_RE
+# and P_curtail is not linked to any balance), so every MWh generated must
+# be consumed; in hours where that binds, more load is worth having and the
+# electricity price is negative.
+ELECTRICITY_DUAL_SIGN = 1.0
+HYDROGEN_DUAL_SIGN = -1.0
+HYDROGEN_ANNUAL_DUAL_SIGN = 1.0
+
+
+def attach_duals(model):
+    # Must be called before solving
+    if model.component('dual') is None:
+        model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+
+
+def _duals(model, constraints):
+    return np.array([model.dual.get(con, np.nan) for con in constraints], dtype=np.float64)
+
+
+def hourly_marginal_prices(model):
+    # {'electricity_USD_per_MWh', 'hydrogen_USD_per_kg'}: arrays over model.T
+    if model.component('dual') is None or len(model.dual) == 0:
+        raise ValueError("No duals on the model; call attach_duals() before solving")
+    if model.objective_name != 'cost':
+        raise ValueError(f"Marginal prices need the cost objective, not '{model.objective_name}'")
+    to_usd = pyo.value(model.dem_SFS)
+    hours = list(model.T)
+
+    electricity = _duals(model, [model.P_Balance_AC2[t] for t in hours])
+    storage = _duals(model, [model.CGH2_t1] + [model.CGH2_mb[t] for t in hours[1:]])
+    annual = model.dual.get(model.CGH2_annual, np.nan)
+    hydrogen = HYDROGEN_DUAL_SIGN * storage + HYDROGEN_ANNUAL_DUAL_SIGN * annual
+    return {
+        'electricity_USD_per_MWh': ELECTRICITY_DUAL_SIGN * to_usd * electricity,
+        'hydrogen_USD_per_kg': to_usd * hydrogen / 1000,
+    }
+
+
+def duration_curve(prices):
+    # Prices sorted from highest to lowest hour
+    return np.sort(prices)[::-1]
+
+
+def price_summary(prices, weights=None, prefix=''):
+    # Time average, quantity-weighted average and percentiles of one array
+    summary = {f'{prefix}avg': float(np.nanmean(prices))}
+    if weights is not None:
+        total = np.sum(weights)
+        summary[f'{prefix}weighted_avg'] = float(np.dot(weights, prices) / total) if total > 0 else np.nan
+    for p, value in zip(PRICE_PERCENTILES, np.nanpercentile(prices, PRICE_PERCENTILES)):
+        summary[f'{prefix}p{p}'] = float(value)
+    summary[f'{prefix}zero_price_hours'] = int(np.sum(np.isclose(prices, 0.0)))
+    return summary
+
+
+def marginal_results(model, prices=None):
+    # Results columns built from the hourly prices. LCOH_marginal prices the
+    # electrolyser's hourly DC load at the marginal electricity price and
+    # adds its annualised CAPEX.
+    if prices is None:
+        prices = hourly_marginal_prices(model)
+    hours = list(model.T)
+    ely_load = np.array([pyo.value(model.P_di_ely[t]) for t in hours])
+    h2_output = np.array([pyo.value(model.H2_ely[t]) for t in hours])
+
+    row = {}
+    row.update(price_summary(prices['electricity_USD_per_MWh'], ely_load, prefix='Marginal_elec_USD_per_MWh_'))
+    row.update(price_summary(prices['hydrogen_USD_per_kg'], h2_output, prefix='Marginal_H2_USD_per_kg_'))
+
+    total_h2_kg = pyo.value(model.T_H2) * 1000
+    ely_electricity_usd = float(np.dot(prices['electricity_USD_per_MWh'], ely_load))
+    row['Marginal_Ely_Electricity_mUSD_per_year'] = ely_electricity_usd / 1e6
+    row['LCOH_marginal_USD_per_kg'] = (
+        (pyo.value(model.aCAPEX_ely) * 1e6 + ely_electricity_usd) / total_h2_kg if total_h2_kg > 0 else np.nan
+    )
+    return row
+
+
+def save_hourly_prices(prices, path):
+    # One .npz per solve: hourly arrays plus their duration curves
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrays = dict(prices)
+    for name, values in prices.items():
+        arrays[f'{name}_duration'] = duration_curve(values)
+    np.savez_compressed(path, **arrays)
+    return path
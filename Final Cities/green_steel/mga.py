@@ -0,0 +1,212 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.frontier import DEFAULT_FRONTIER_SOLVER, warm_start_options
+from green_steel.model import extract_results, solve_model
+from green_steel.runner import build_job_model, build_jobs
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.tariffs import restrict_to_param_updates
+
+# ======================
+# MODELLING TO GENERATE ALTERNATIVES
+# ======================
+# Near-optimal designs within a cost slack of the minimum $/t. After the
+# cost-optimal solve, obj becomes a constraint (obj <= (1 + slack) * min)
+# and a weighted sum of the capacities is optimised instead. Only weights
+# and scales change between solves, so the persistent solver updates
+# objective coefficients and re-solves from the previous basis.
+# Directions: each capacity pushed to its minimum and maximum (in units of
+# its cost-optimal size), then, with every capacity in units of its range
+# over those solves, the solar/wind and battery/CGH2 trade-offs both ways
+# and Hop-Skip-Jump rounds that minimise the capacities most often used.
+# The range also scales the distances between designs, so a capacity that
+# is zero at the optimum weighs no more than one sized in the thousands.
+# The returned designs are the most mutually different distinct ones found.
+
+MGA_CAPACITIES = {
+    'Solar': lambda m: m.c_RE['s'],
+    'Wind': lambda m: m.c_RE['w'],
+    'Electrolyzer': lambda m: m.c_ely,
+    'FuelCell': lambda m: m.c_FC,
+    'Battery_storage_capacity_MWh': lambda m: m.Lmax_bat_st,
+    'CGH2_storage_capacity_t': lambda m: m.Lmax_CGH2_st,
+}
+TRADEOFFS = [('Solar', 'Wind'), ('Battery_storage_capacity_MWh', 'CGH2_storage_capacity_t')]
+DEFAULT_SLACK = 0.02
+HSJ_ROUNDS = 4
+USED_CAPACITY_TOL = 1e-3  # Share of its scale above which a capacity counts as used by HSJ
+DISTINCT_DESIGN_TOL = 1e-3  # Scaled distance below which two designs count as the same
+
+
+def mga_directions(names=tuple(MGA_CAPACITIES)):
+    # (label, {capacity: weight}) pairs; the objective is always minimised
+    directions = []
+    for name in names:
+        directions.append((f'min_{name}', {name: 1.0}))
+        directions.append((f'max_{name}', {name: -1.0}))
+    for a, b in TRADEOFFS:
+        directions.append((f'{a}_over_{b}', {a: -1.0, b: 1.0}))
+        directions.append((f'{b}_over_{a}', {a: 1.0, b: -1.0}))
+    return directions
+
+
+def add_mga_components(model, scale):
+    # Cost budget constraint and weighted capacity objective, both inactive
+    model.MGA = pyo.Set(initialize=list(MGA_CAPACITIES))
+    model.mga_scale = pyo.Param(model.MGA, mutable=True, initialize=scale)
+    model.mga_weight = pyo.Param(model.MGA, mutable=True, initialize=0.0)
+    model.mga_budget = pyo.Param(mutable=True, initialize=1e12)
+    model.mga_cost_cap = pyo.Constraint(expr=model.obj.expr <= model.mga_budget)
+    model.mga_obj = pyo.Objective(expr=sum(model.mga_weight[i] * MGA_CAPACITIES[i](model) / model.mga_scale[i]
+                                           for i in model.MGA), sense=pyo.minimize)
+    model.mga_obj.deactivate()
+
+
+def _scaled_capacities(designs, scale):
+    return designs[list(MGA_CAPACITIES)].to_numpy(dtype=np.float64) / np.array([scale[n] for n in MGA_CAPACITIES])
+
+
+def range_scale(designs):
+    # Each capacity's range over the designs; 1 where it does not vary
+    X = designs[list(MGA_CAPACITIES)].to_numpy(dtype=np.float64)
+    spread = X.max(axis=0) - X.min(axis=0)
+    floor = USED_CAPACITY_TOL * np.maximum(np.abs(X).max(axis=0), 1.0)
+    return {name: float(r) if r > f else 1.0 for name, r, f in zip(MGA_CAPACITIES, spread, floor)}
+
+
+def distinct_designs(designs, scale, tol=DISTINCT_DESIGN_TOL):
+    # First occurrence of every design, in order
+    X = _scaled_capacities(designs, scale)
+    kept = []
+    for i in range(len(X)):
+        if all(np.linalg.norm(X[i] - X[j]) >= tol for j in kept):
+            kept.append(i)
+    return designs.iloc[kept].reset_index(drop=True)
+
+
+def select_diverse(designs, scale, k):
+    # Greedy farthest-point selection on the scaled capacity vectors of the
+    # distinct designs, starting from the cost-optimal design (row 0); fewer
+    # than k when fewer distinct designs were found
+    designs = distinct_designs(designs, scale)
+    X = _scaled_capacities(designs, scale)
+    chosen = [0]
+    while len(chosen) < min(k, len(designs)):
+        nearest = np.min([np.linalg.norm(X - X[c], axis=1) for c in chosen], axis=0)
+        chosen.append(int(np.argmax(nearest)))
+    return designs.iloc[chosen].reset_index(drop=True)
+
+
+def near_optimal_designs(job, slack=DEFAULT_SLACK, n_designs=8, hsj_rounds=HSJ_ROUNDS,
+                         solver_name=DEFAULT_FRONTIER_SOLVER, store_dir=None):
+    model = build_job_model(job, store_dir)
+    solver = pyo.SolverFactory(solver_name)
+    options = warm_start_options(solver_name)
+    case = f"{job['City']} ({job['Ycase']}, {job['Scase']})"
+
+    def solve(label):
+        _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                            solver=solver)
+        if not optimal:
+            raise ValueError(f"{case}: MGA solve '{label}' ended {telemetry['Solve_termination']}")
+        return telemetry
+
+    def design(label, telemetry):
+        row = {name: pyo.value(get(model)) for name, get in MGA_CAPACITIES.items()}
+        row.update({
+            'City': job['City'],
+            'Ycase': job['Ycase'],
+            'Scase': job['Scase'],
+            'Direction': label,
+            'Cost_per_tonne': pyo.value(model.obj.expr),
+            'Total_Land_km2': pyo.value(model.total_land),
+            'Solve_simplex_iterations': telemetry['Solve_simplex_iterations'],
+            'Solve_wall_time_s': telemetry['Solve_wall_time_s'],
+        })
+        return row
+
+    telemetry = solve('cost_optimal')
+    optimum = extract_results(model)
+    rows = [design('cost_optimal', telemetry)]
+    scale = {name: max(abs(rows[0][name]), 1.0) for name in MGA_CAPACITIES}
+
+    add_mga_components(model, scale)
+    model.mga_budget.set_value((1 + slack) * pyo.value(model.obj.expr))
+    model.obj.deactivate()
+    model.mga_obj.activate()
+
+    def solve_direction(label, weights):
+        for name in MGA_CAPACITIES:
+            model.mga_weight[name] = weights.get(name, 0.0)
+        rows.append(design(label, solve(label)))
+
+    # The first MGA solve loads the new rows; after it only Params change
+    directions = mga_directions()
+    solve_direction(*directions[0])
+    restrict_to_param_updates(solver)
+    n_extremes = 2 * len(MGA_CAPACITIES)
+    for label, weights in directions[1:n_extremes]:
+        solve_direction(label, weights)
+
+    scale = range_scale(pd.DataFrame(rows))
+    for name in MGA_CAPACITIES:
+        model.mga_scale[name] = scale[name]
+    for label, weights in directions[n_extremes:]:
+        solve_direction(label, weights)
+
+    # Hop-Skip-Jump: minimise the capacities, each weighted by how many
+    # designs so far have used it
+    for h in range(hsj_rounds):
+        weights = {name: float(sum(row[name] > USED_CAPACITY_TOL * scale[name] for row in rows))
+                   for name in MGA_CAPACITIES}
+        solve_direction(f'hsj_{h + 1}', weights)
+
+    designs = pd.DataFrame(rows)
+    designs['Cost_increase_pct'] = 100 * (designs['Cost_per_tonne'] / optimum['Cost_per_tonne'] - 1)
+    X = _scaled_capacities(designs, scale)
+    designs['Distance_from_optimum'] = np.linalg.norm(X - X[0], axis=1)
+    return select_diverse(designs, scale, n_designs)
+
+
+def mga_path(city, profile_path, out_dir=None):
+    folder = out_dir if out_dir is not None else os.path.dirname(profile_path)
+    return os.path.join(folder, f'mga_designs_{city}.csv')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find maximally different designs within a cost slack")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--ycases', nargs='*', default=['YCurrent'])
+    parser.add_argument('--scases', nargs='*', default=['S1'])
+    parser.add_argument('--slack', type=float, default=DEFAULT_SLACK, help="Allowed cost increase (0.02 = 2%%)")
+    parser.add_argument('--designs', type=int, default=8)
+    parser.add_argument('--hsj-rounds', type=int, default=HSJ_ROUNDS)
+    parser.add_argument('--solver', default=DEFAULT_FRONTIER_SOLVER, help="A persistent (appsi_*) solver")
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out-dir', default=None)
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    jobs = build_jobs(sites, args.ycases, args.scases)
+
+    frames = []
+    for job in jobs:
+        print(f" {job['City']} ({job['Ycase']}, {job['Scase']}): near-optimal designs", flush=True)
+        frames.append(near_optimal_designs(job, args.slack, args.designs, args.hsj_rounds, args.solver,
+                                           args.store_dir))
+    if not frames:
+        raise SystemExit("No jobs to run")
+    profiles = {job['City']: job['Profile'] for job in jobs}
+    for city, df in pd.concat(frames, ignore_index=True).groupby('City'):
+        path = mga_path(city, profiles[city], args.out_dir)
+        df.to_csv(path, index=False)
+        print(f" MGA designs saved to '{path}'.")
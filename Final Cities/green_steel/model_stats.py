@@ -0,0 +1,163 @@
+import argparse
+import json
+import sys
+
+import pandas as pd
+import pyomo.environ as pyo
+from pyomo.core.expr.visitor import identify_variables
+
+from green_steel.model import build_city_model
+
+# ======================
+# MODEL STATISTICS
+# ======================
+# Per-component size report for a built model: variable and constraint
+# counts, nonzeros and dense rows per constraint family, the share of fixed
+# or unused variables, and the approximate memory held by the Pyomo
+# objects. Used to decide which hourly families to reformulate first.
+
+STAT_COLUMNS = ['Component', 'Type', 'Hourly', 'Count', 'Nonzeros', 'Max_row_nonzeros', 'Dense_rows',
+                'Fixed', 'Unused', 'Fixed_pct', 'Unused_pct', 'Memory_MB']
+DENSE_ROW_NONZEROS = 100  # A row with more nonzeros than this counts as dense
+TOP_DENSE_ROWS = 20
+
+
+def _is_hourly(component, model):
+    # Indexed by the hour set model.T (alone or with other sets)
+    if not component.is_indexed():
+        return False
+    index_set = component.index_set()
+    subsets = list(index_set.subsets()) if hasattr(index_set, 'subsets') else [index_set]
+    return any(s is model.T for s in subsets)
+
+
+def _expression_sizeof(expr):
+    # Bytes held by the expression tree nodes (leaf variables and
+    # parameters belong to their own components and are not counted)
+    total = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if not hasattr(node, 'is_expression_type') or not node.is_expression_type():
+            continue
+        total += sys.getsizeof(node)
+        args = getattr(node, '_args_', None)
+        if args is not None:
+            total += sys.getsizeof(args)
+        stack.extend(node.args)
+    return total
+
+
+def model_statistics(model, dense_threshold=DENSE_ROW_NONZEROS, top_dense=TOP_DENSE_ROWS):
+    # Returns a JSON-serialisable dict: summary, components, dense_rows
+    used = set()
+    components = []
+    dense_rows = []
+
+    for con in model.component_objects(pyo.Constraint, active=True, descend_into=True):
+        nonzeros = max_row = n_dense = n_rows = 0
+        memory = sys.getsizeof(con)
+        for data in con.values():
+            if not data.active:
+                continue
+            row_vars = {id(v): v for v in identify_variables(data.body, include_fixed=False)}
+            used.update(row_vars)
+            n_rows += 1
+            nonzeros += len(row_vars)
+            max_row = max(max_row, len(row_vars))
+            if len(row_vars) > dense_threshold:
+                n_dense += 1
+                dense_rows.append({'Row': data.name, 'Nonzeros': len(row_vars)})
+            memory += sys.getsizeof(data) + _expression_sizeof(data.expr)
+        components.append({
+            'Component': con.name, 'Type': 'Constraint', 'Hourly': _is_hourly(con, model), 'Count': n_rows,
+            'Nonzeros': nonzeros, 'Max_row_nonzeros': max_row, 'Dense_rows': n_dense,
+            'Fixed': None, 'Unused': None, 'Memory_MB': memory / 1024 ** 2,
+        })
+
+    for obj in model.component_objects(pyo.Objective, active=True, descend_into=True):
+        for data in obj.values():
+            used.update(id(v) for v in identify_variables(data.expr, include_fixed=False))
+
+    for var in model.component_objects(pyo.Var, active=True, descend_into=True):
+        fixed = unused = 0
+        memory = sys.getsizeof(var)
+        for data in var.values():
+            fixed += data.fixed
+            unused += not data.fixed and id(data) not in used
+            memory += sys.getsizeof(data)
+        components.append({
+            'Component': var.name, 'Type': 'Var', 'Hourly': _is_hourly(var, model), 'Count': len(var),
+            'Nonzeros': None, 'Max_row_nonzeros': None, 'Dense_rows': None,
+            'Fixed': fixed, 'Unused': unused, 'Memory_MB': memory / 1024 ** 2,
+        })
+
+    for comp in model.component_objects((pyo.Param, pyo.Expression), active=True, descend_into=True):
+        memory = sys.getsizeof(comp)
+        if comp.is_indexed() or comp.ctype is pyo.Expression:
+            for data in comp.values():
+                memory += sys.getsizeof(data)
+                if comp.ctype is pyo.Expression:
+                    memory += _expression_sizeof(data.expr)
+        components.append({
+            'Component': comp.name, 'Type': comp.ctype.__name__, 'Hourly': _is_hourly(comp, model),
+            'Count': len(comp), 'Nonzeros': None, 'Max_row_nonzeros': None, 'Dense_rows': None,
+            'Fixed': None, 'Unused': None, 'Memory_MB': memory / 1024 ** 2,
+        })
+
+    for row in components:
+        if row['Type'] == 'Var' and row['Count']:
+            row['Fixed_pct'] = 100 * row['Fixed'] / row['Count']
+            row['Unused_pct'] = 100 * row['Unused'] / row['Count']
+        else:
+            row['Fixed_pct'] = row['Unused_pct'] = None
+
+    variables = [r for r in components if r['Type'] == 'Var']
+    constraints = [r for r in components if r['Type'] == 'Constraint']
+    n_vars = sum(r['Count'] for r in variables)
+    summary = {
+        'Hours': len(model.T),
+        'Variables': n_vars,
+        'Constraints': sum(r['Count'] for r in constraints),
+        'Nonzeros': sum(r['Nonzeros'] for r in constraints),
+        'Dense_rows': sum(r['Dense_rows'] for r in constraints),
+        'Fixed_pct': 100 * sum(r['Fixed'] for r in variables) / n_vars if n_vars else 0.0,
+        'Unused_pct': 100 * sum(r['Unused'] for r in variables) / n_vars if n_vars else 0.0,
+        'Hourly_nonzeros_pct': 100 * sum(r['Nonzeros'] for r in constraints if r['Hourly'])
+                               / max(sum(r['Nonzeros'] for r in constraints), 1),
+        'Memory_MB': sum(r['Memory_MB'] for r in components),
+    }
+    dense_rows.sort(key=lambda r: r['Nonzeros'], reverse=True)
+    return {'summary': summary, 'components': components, 'dense_rows': dense_rows[:top_dense]}
+
+
+def statistics_table(stats):
+    # Components, largest first (nonzeros for constraints, count for the rest)
+    table = pd.DataFrame(stats['components'], columns=STAT_COLUMNS)
+    table['_size'] = table['Nonzeros'].fillna(table['Count']).astype(float)
+    table = table.sort_values(['Type', '_size'], ascending=[True, False])
+    return table.drop(columns='_size').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report per-component size statistics of a built model")
+    parser.add_argument('--city', default='Wuhai')
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--hours', type=int, default=8760)
+    parser.add_argument('--types', nargs='*', default=['Constraint', 'Var'],
+                        help="Component types to print (Constraint, Var, Param, Expression)")
+    parser.add_argument('--json', default=None, help="Write the full report to this JSON file")
+    args = parser.parse_args()
+
+    stats = model_statistics(build_city_model(args.city, args.ycase, args.scase, args.hours))
+    table = statistics_table(stats)
+    pd.set_option('display.width', 200)
+    print(table[table['Type'].isin(args.types)].to_string(index=False, float_format='%.2f'))
+    print()
+    for key, value in stats['summary'].items():
+        print(f"  {key}: {value:,.2f}" if isinstance(value, float) else f"  {key}: {value:,}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(stats, f, indent=2)
+        print(f"\n Statistics saved to '{args.json}'.")
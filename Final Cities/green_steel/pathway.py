@@ -0,0 +1,296 @@
+import argparse
+import os
+
+import pandas as pd
+import pyomo.environ as pyo
+from pyomo.common.collections import ComponentMap
+
+from green_steel.model import (F_SCRAP, ROM_GRADE, YCASES, create_complete_green_steel_model, extract_results,
+                               initialize_model_parameters, solve_model)
+from green_steel.profiles import HOURS_PER_YEAR, VRE_SOURCES, set_vre_profile
+from green_steel.runner import build_jobs, job_profile
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.validation import compare_to_estimate, reduced_estimate, redispatch
+
+# ======================
+# MULTI-PERIOD PATHWAY
+# ======================
+# One LP over the four Ycases as consecutive investment periods. The hour
+# set and the VRE profile Param are built once on the pathway model; each
+# period is one entry of the indexed Block pathway.period, populated by
+# create_complete_green_steel_model with its own technology coefficients
+# and unit costs on the shared hours, so period rows are indexed by
+# (period, t) and all periods see the same representative operations.
+# The em_tech capacities (solar, wind, battery, electrolyser, fuel cell)
+# are no longer greenfield per period. A vintage built at the start of a
+# period is paid for (annualised CAPEX and maintenance) in each of the next
+# model.n years that fall within the pathway, priced at the unit cost of
+# the period it was built in (with the existing rep replacement factor for
+# battery, electrolyser and fuel cell). Each period block represents every
+# year of its period, so a vintage only counts as installed capacity in
+# periods it survives to the end of; in a period where it retires part-way
+# it is charged for its remaining years but not counted. Other plant
+# equipment keeps its per-period annualised cost. The objective is the
+# present value of the annual costs over the pathway.
+#
+# The operations are not shared across periods: every period has its own
+# technology coefficients, so the LP carries one block of hourly rows per
+# period, about four single-year models in size. What is shared is the hour
+# set and the profile Param (built once), and a representative horizon
+# (n_hours) keeps the combined LP small. 'myopic' solving is a heuristic,
+# not an exact decomposition (see solve_pathway).
+
+PERIOD_START = {'YCurrent': 2025, 'Y2030': 2030, 'Y2040': 2040, 'Y2050': 2050}
+PATHWAY_END = 2060
+PATHWAY_TECHS = ['s', 'w', 'bat', 'ely', 'FC']
+DECOMPOSITIONS = ('monolithic', 'myopic')
+
+# Block capacity variable and the single-year CAPEX constraint it replaces
+_CAPACITY = {
+    's': (lambda b: b.c_RE['s'], 'CAPEX_s', 'CAPEX1'),
+    'w': (lambda b: b.c_RE['w'], 'CAPEX_w', 'CAPEX2'),
+    'bat': (lambda b: b.Lmax_bat_st, 'CAPEX_bat', 'CAPEX3'),
+    'ely': (lambda b: b.c_ely, 'CAPEX_ely', 'CAPEX4'),
+    'FC': (lambda b: b.c_FC, 'CAPEX_FC', 'CAPEX5'),
+}
+
+
+def period_years(periods):
+    # {period: the calendar years it represents}, the last one up to PATHWAY_END
+    starts = [PERIOD_START[p] for p in periods]
+    return {p: range(start, end) for p, start, end in zip(periods, starts, starts[1:] + [PATHWAY_END])}
+
+
+def _discount(year, periods, r):
+    return 1 / (1 + r) ** (year - PERIOD_START[periods[0]])
+
+
+def period_weight(ycase, periods, r):
+    # Discounted years represented by one period (discounted to the first start)
+    return sum(_discount(year, periods, r) for year in period_years(periods)[ycase])
+
+
+def vintage_shares(periods, lifetime, r):
+    # {(p, q): discounted share of period p's years in which the vintage
+    # built at the start of period q is still being paid for}
+    years = period_years(periods)
+    shares = {}
+    for p in periods:
+        total = sum(_discount(year, periods, r) for year in years[p])
+        for q in periods:
+            paid = [year for year in years[p] if PERIOD_START[q] <= year < PERIOD_START[q] + lifetime]
+            if paid:
+                shares[p, q] = sum(_discount(year, periods, r) for year in paid) / total
+    return shares
+
+
+def available_vintages(periods, lifetime):
+    # {p: vintages installed for the whole of period p}
+    years = period_years(periods)
+    return {p: [q for q in periods
+                if PERIOD_START[q] <= PERIOD_START[p] and PERIOD_START[q] + lifetime >= years[p].stop]
+            for p in periods}
+
+
+def unit_capital(block, ycase, tech):
+    # m$ per unit of block capacity built in this period, as in CAPEX1..CAPEX5
+    ucost = block.var_ucost[ycase, tech]
+    if tech == 'bat':
+        return ucost * block.rep / block.h_bat
+    if tech in ('ely', 'FC'):
+        return ucost * block.rep
+    return ucost
+
+
+def _detach_block(block):
+    # Period blocks keep their equations but not their own objective or
+    # greenfield CAPEX rows for the em_tech capacities
+    block.obj.deactivate()
+    for _, _, greenfield in _CAPACITY.values():
+        block.component(greenfield).deactivate()
+
+
+def _period_block(ycase, scase, transport_cost_per_tonne, profile, block=None, hours=None, vre_prod=None):
+    # A detached single-year model of one period; with block/hours/vre_prod
+    # given, that period of the pathway on the pathway's shared hours and
+    # profile (which must already hold the profile)
+    n_hours = profile.shape[0]
+    block = create_complete_green_steel_model(
+        ycase=ycase,
+        scase=scase,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[scase],
+        f_t=n_hours / HOURS_PER_YEAR,
+        transport_cost_per_tonne=transport_cost_per_tonne,
+        n_hours=n_hours,
+        block=block,
+        hours=hours,
+        vre_prod=vre_prod,
+    )
+    initialize_model_parameters(block, ycase, scase, profile if vre_prod is None else None)
+    _detach_block(block)
+    return block
+
+
+def create_pathway_model(profile, scase, transport_cost_per_tonne, periods=YCASES, n_hours=None):
+    # profile: (hours x 2) array shared by every period block. n_hours picks
+    # a representative horizon (first n_hours) to keep the LP small.
+    n_hours = profile.shape[0] if n_hours is None else n_hours
+    profile = profile[:n_hours]
+    f_t = n_hours / HOURS_PER_YEAR
+
+    pathway = pyo.ConcreteModel()
+    pathway.P = pyo.Set(initialize=list(periods), ordered=True)
+    pathway.TECH = pyo.Set(initialize=PATHWAY_TECHS)
+    pathway.T = pyo.Set(initialize=range(1, n_hours + 1))
+    pathway.I = pyo.Set(initialize=VRE_SOURCES)
+    pathway.VRE_prod = pyo.Param(pathway.T, pathway.I, mutable=True, default=0.0,
+                                 doc='Renewable energy production profiles [MW/MW installed]')
+    set_vre_profile(pathway, profile)
+    pathway.period = pyo.Block(pathway.P, rule=lambda b, p: _period_block(
+        p, scase, transport_cost_per_tonne, profile, block=b, hours=pathway.T, vre_prod=pathway.VRE_prod))
+    pathway.blocks = {p: pathway.period[p] for p in periods}
+
+    lifetime = pathway.blocks[periods[0]].n
+    r = pathway.blocks[periods[0]].r
+    pathway.build = pyo.Var(pathway.P, pathway.TECH, within=pyo.NonNegativeReals)
+    pathway.available = available_vintages(periods, lifetime)
+    pathway.shares = vintage_shares(periods, lifetime, r)
+
+    def rule_installed(m, p, tech):
+        capacity, _, _ = _CAPACITY[tech]
+        return capacity(m.blocks[p]) <= sum(m.build[q, tech] for q in m.available[p])
+    pathway.installed = pyo.Constraint(pathway.P, pathway.TECH, rule=rule_installed)
+
+    def rule_vintage_capex(m, p, tech):
+        # Capital whose annuity period p pays (in the years of p it is still due)
+        _, capex, _ = _CAPACITY[tech]
+        return m.blocks[p].component(capex)[p] == sum(
+            share * unit_capital(m.blocks[q], q, tech) * m.build[q, tech]
+            for (paying, q), share in m.shares.items() if paying == p)
+    pathway.vintage_capex = pyo.Constraint(pathway.P, pathway.TECH, rule=rule_vintage_capex)
+
+    # Annual cost of each period (m$/year), undoing the f_t horizon scaling
+    pathway.weight = pyo.Param(pathway.P, initialize={p: period_weight(p, periods, r) for p in periods})
+    pathway.annual_cost = pyo.Expression(pathway.P, rule=lambda m, p: m.blocks[p].T_cost / f_t)
+    pathway.obj = pyo.Objective(expr=sum(pathway.weight[p] * pathway.annual_cost[p] for p in pathway.P),
+                                sense=pyo.minimize)
+    # Myopic objectives, one period at a time (the 'myopic' heuristic of solve_pathway)
+    pathway.period_obj = pyo.Objective(pathway.P, rule=lambda m, p: m.annual_cost[p], sense=pyo.minimize)
+    pathway.period_obj.deactivate()
+    return pathway
+
+
+def solve_pathway(pathway, decomposition='monolithic', solver_name='gurobi', tee=False, options=None):
+    # 'monolithic' solves all periods at once. 'myopic' is a heuristic, not
+    # a decomposition: each period is solved on its own annual cost with
+    # earlier builds fixed, so it ignores what later periods need and its
+    # pathway cost is only an upper bound on the monolithic one. It keeps one
+    # 8760-hour block active at a time for when the combined LP is too large.
+    if decomposition not in DECOMPOSITIONS:
+        raise ValueError(f"Unknown decomposition '{decomposition}'; choose from {DECOMPOSITIONS}")
+    if decomposition == 'monolithic':
+        _, optimal, telemetry = solve_model(pathway, solver_name=solver_name, tee=tee, options=options)
+        return optimal, [telemetry]
+
+    pathway.obj.deactivate()
+    telemetries = []
+    try:
+        for p in pathway.P:
+            # Only period p's block and linking rows are sent to the solver
+            for q, block in pathway.blocks.items():
+                components = [block] + [pathway.installed[q, tech] for tech in pathway.TECH] \
+                    + [pathway.vintage_capex[q, tech] for tech in pathway.TECH]
+                for component in components:
+                    if q == p:
+                        component.activate()
+                    else:
+                        component.deactivate()
+            pathway.period_obj[p].activate()
+            _, optimal, telemetry = solve_model(pathway, solver_name=solver_name, tee=tee, options=options)
+            pathway.period_obj[p].deactivate()
+            telemetries.append(telemetry)
+            if not optimal:
+                return False, telemetries
+            for tech in pathway.TECH:
+                pathway.build[p, tech].fix()
+    finally:
+        pathway.build.unfix()
+        pathway.obj.activate()
+        for block in pathway.blocks.values():
+            block.activate()
+            _detach_block(block)
+        pathway.installed.activate()
+        pathway.vintage_capex.activate()
+    return True, telemetries
+
+
+def validate_pathway(pathway, profile, scase, transport_cost_per_tonne, solver_name='gurobi'):
+    # Re-dispatch each period on the full profile with that period's
+    # installed capacities and vintage CAPEX held (see green_steel.validation).
+    # Periods are independent once the builds are fixed, so only one
+    # full-year block is held at a time.
+    rows = []
+    for p, block in pathway.blocks.items():
+        full = _period_block(p, scase, transport_cost_per_tonne, profile)
+        fixed = ComponentMap((full.component(capex)[p], pyo.value(block.component(capex)[p]))
+                             for _, capex, _ in _CAPACITY.values())
+        optimal, telemetry = redispatch(full, reduced_estimate(block)['capacities'], solver_name, fixed)
+        row = {'Ycase': p}
+        row.update(compare_to_estimate(full, reduced_estimate(block), optimal, telemetry))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def extract_pathway_results(pathway):
+    rows = []
+    for p, block in pathway.blocks.items():
+        row = extract_results(block)
+        row['Period_start'] = PERIOD_START[p]
+        row['Period_weight'] = pyo.value(pathway.weight[p])
+        row['Annual_cost_mUSD'] = pyo.value(pathway.annual_cost[p])
+        for tech in PATHWAY_TECHS:
+            row[f'New_build_{tech}'] = pyo.value(pathway.build[p, tech])
+            row[f'Installed_{tech}'] = sum(pyo.value(pathway.build[q, tech]) for q in pathway.available[p])
+        rows.append(row)
+    results = pd.DataFrame(rows)
+    results['Pathway_PV_cost_mUSD'] = pyo.value(pathway.obj)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Co-optimise YCurrent -> Y2050 as one investment pathway")
+    parser.add_argument('city')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--hours', type=int, default=HOURS_PER_YEAR, help="Representative horizon per period")
+    parser.add_argument('--decomposition', choices=DECOMPOSITIONS, default='monolithic',
+                        help="'myopic' is a heuristic: one period at a time, giving an upper bound on the cost")
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--no-validate', action='store_true',
+                        help="Skip the full-year re-dispatch check of a shortened horizon")
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    sites = sites[sites['City'] == args.city]
+    if sites.empty:
+        raise ValueError(f"No {args.year} profile for {args.city}")
+    job = build_jobs(sites, [YCASES[0]], [args.scase])[0]
+    profile = job_profile(job, args.store_dir)
+    pathway = create_pathway_model(profile, args.scase, job['TransportCost_USD_per_t'], n_hours=args.hours)
+    optimal, _ = solve_pathway(pathway, args.decomposition, solver_name=args.solver)
+    if not optimal:
+        raise SystemExit(f"Pathway for {args.city} did not solve to optimality")
+
+    results = extract_pathway_results(pathway)
+    if args.hours < profile.shape[0] and not args.no_validate:
+        validation = validate_pathway(pathway, profile, args.scase, job['TransportCost_USD_per_t'], args.solver)
+        results = results.merge(validation, on='Ycase', how='left')
+        print(validation.to_string(index=False, float_format='%.2f'))
+    out_path = os.path.join(os.path.dirname(job['Profile']),
+                            f'pathway_results_{args.city}_{args.scase}_{args.decomposition}.csv')
+    results.to_csv(out_path, index=False)
+    print(f"\n Pathway results saved to '{out_path}'.")
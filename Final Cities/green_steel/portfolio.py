@@ -0,0 +1,201 @@
+import argparse
+import os
+
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.fingerprints import FINGERPRINT_COLUMN, job_fingerprint
+from green_steel.model import solve_model
+from green_steel.runner import build_jobs, run_jobs
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+
+# ======================
+# NATIONAL PORTFOLIO
+# ======================
+# Allocates a national steel target across the candidate cities by
+# Dantzig-Wolfe style column generation over the city blocks. A column is
+# one city solved at one annual output level (an ordinary city LP with
+# dem_SFS_annual changed); the master LP picks convex combinations of each
+# city's columns (or none of them) subject to the national total and
+# per-province caps. City subproblems are solved in parallel by the runner.
+#
+# The LP master is a relaxation: a city taken at weight 0.5 pays half of
+# its fixed costs (e.g. the 68.75 m$ EAF and 4.5351 m$ compressor CAPEX
+# terms), which no real plant can. Once pricing stops, an integer master
+# over the same columns picks at most one output level per city, so every
+# chosen city pays the full cost of its LP column; that selection is the
+# reported allocation, and the LP master cost bounds it from below over
+# the same columns.
+#
+# Pricing is a heuristic: it only walks each city's output grid to the
+# neighbours of levels that price in, and only over the grid levels, so
+# the allocation is not guaranteed optimal even over the grid.
+
+DEMAND_LEVELS_T = (0.5e6, 1.0e6, 2.0e6, 3.0e6)
+REFERENCE_DEMAND_T = 1.0e6
+UNSERVED_PENALTY_MUSD_PER_T = 1e-2  # 10,000 $/t, keeps the first masters feasible
+REDUCED_COST_TOL = 1e-6
+MAX_ITERATIONS = 20
+
+
+def demand_job(job, demand_t):
+    job = dict(job, Demand_t=float(demand_t))
+    job[FINGERPRINT_COLUMN] = job_fingerprint(job)
+    return job
+
+
+def solve_master(columns, sites, target_t, province_caps=None, solver_name='gurobi', integer=False):
+    # columns: DataFrame with City, Demand_t, TotalCost (m$/yr)
+    # Returns (master model, {column index: weight}, duals). integer=True
+    # makes the weights binary (at most one level per city) and returns no
+    # duals; the national row is >= so a city may overshoot the target.
+    province_caps = province_caps or {}
+    province = dict(zip(sites['City'], sites['Province']))
+    cities = sorted(columns['City'].unique())
+    keys = list(columns.index)
+
+    m = pyo.ConcreteModel()
+    m.K = pyo.Set(initialize=keys)
+    m.C = pyo.Set(initialize=cities)
+    m.P = pyo.Set(initialize=sorted(province_caps))
+    m.weight = pyo.Var(m.K, within=pyo.Binary if integer else pyo.NonNegativeReals)
+    m.unserved = pyo.Var(within=pyo.NonNegativeReals)
+
+    output = {k: columns.at[k, 'Demand_t'] for k in keys}
+    cost = {k: columns.at[k, 'TotalCost'] for k in keys}
+    city_of = {k: columns.at[k, 'City'] for k in keys}
+
+    m.convexity = pyo.Constraint(m.C, rule=lambda m, c: sum(m.weight[k] for k in m.K if city_of[k] == c) <= 1)
+    m.national = pyo.Constraint(expr=sum(output[k] * m.weight[k] for k in m.K) + m.unserved >= target_t)
+    m.province_cap = pyo.Constraint(m.P, rule=lambda m, p: sum(
+        output[k] * m.weight[k] for k in m.K if province[city_of[k]] == p) <= province_caps[p])
+    m.obj = pyo.Objective(expr=sum(cost[k] * m.weight[k] for k in m.K)
+                          + UNSERVED_PENALTY_MUSD_PER_T * m.unserved, sense=pyo.minimize)
+    if not integer:
+        m.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+
+    _, optimal, telemetry = solve_model(m, solver_name=solver_name, tee=False)
+    if not optimal:
+        raise ValueError(f"Portfolio master ended {telemetry['Solve_termination']}")
+    weights = {k: pyo.value(m.weight[k]) for k in keys}
+    if integer:
+        return m, weights, None
+    duals = {
+        'national': m.dual[m.national],
+        'convexity': {c: m.dual[m.convexity[c]] for c in m.C},
+        'province': {p: m.dual[m.province_cap[p]] for p in m.P},
+    }
+    return m, weights, duals
+
+
+def reduced_cost(city, demand_t, cost, province, duals):
+    price = duals['national'] + duals['province'].get(province, 0.0)
+    return cost - price * demand_t - duals['convexity'].get(city, 0.0)
+
+
+def _neighbours(level, levels):
+    i = levels.index(level)
+    return levels[max(i - 1, 0):i] + levels[i + 1:i + 2]
+
+
+def solve_portfolio(sites, target_t, province_caps=None, ycase='YCurrent', scase='S1',
+                    levels=DEMAND_LEVELS_T, workers=1, solver_name='gurobi', store_dir=None,
+                    max_iterations=MAX_ITERATIONS):
+    levels = sorted(levels)
+    base_jobs = {job['City']: job for job in build_jobs(sites, [ycase], [scase])}
+    province = dict(zip(sites['City'], sites['Province']))
+    start = min(levels, key=lambda d: abs(d - REFERENCE_DEMAND_T))
+
+    columns = pd.DataFrame(columns=['City', 'Demand_t', 'TotalCost'])
+    pending = [demand_job(job, start) for job in base_jobs.values()]
+    history = []
+    for iteration in range(1, max_iterations + 1):
+        rows = run_jobs(pending, workers=workers, solver_name=solver_name, store_dir=store_dir, quiet=True)
+        solved = pd.DataFrame(rows, columns=['City', 'Demand_t', 'TotalCost'])
+        columns = pd.concat([columns, solved], ignore_index=True).drop_duplicates(['City', 'Demand_t'])
+        columns = columns.astype({'Demand_t': float, 'TotalCost': float}).reset_index(drop=True)
+
+        master, weights, duals = solve_master(columns, sites, target_t, province_caps, solver_name)
+        history.append({'Iteration': iteration, 'Master': 'LP', 'Columns': len(columns),
+                        'Master_cost_mUSD': pyo.value(master.obj), 'Unserved_t': pyo.value(master.unserved),
+                        'National_price_USD_per_t': duals['national'] * 1e6})
+        print(f" Iteration {iteration}: {len(columns)} columns, master cost {pyo.value(master.obj):,.1f} m$",
+              flush=True)
+
+        # Price the untried neighbours of every column with a non-positive reduced cost
+        known = set(zip(columns['City'], columns['Demand_t']))
+        pending = []
+        for col in columns.itertuples():
+            rc = reduced_cost(col.City, col.Demand_t, col.TotalCost, province[col.City], duals)
+            if rc > REDUCED_COST_TOL:
+                continue
+            for level in _neighbours(col.Demand_t, levels):
+                if (col.City, level) not in known:
+                    known.add((col.City, level))
+                    pending.append(demand_job(base_jobs[col.City], level))
+        if not pending:
+            break
+
+    # Whole columns only, each at its full LP cost
+    integer_master, integer_weights, _ = solve_master(columns, sites, target_t, province_caps, solver_name,
+                                                      integer=True)
+    history.append({'Iteration': len(history) + 1, 'Master': 'integer', 'Columns': len(columns),
+                    'Master_cost_mUSD': pyo.value(integer_master.obj),
+                    'Unserved_t': pyo.value(integer_master.unserved), 'National_price_USD_per_t': float('nan')})
+    print(f" Integer master: {pyo.value(integer_master.obj):,.1f} m$ "
+          f"(LP master over the same columns {pyo.value(master.obj):,.1f} m$)", flush=True)
+
+    columns['LP_weight'] = [weights[k] for k in columns.index]
+    columns['Weight'] = [round(integer_weights[k]) for k in columns.index]
+    columns['Province'] = columns['City'].map(province)
+    columns['Reduced_cost_mUSD'] = [reduced_cost(c.City, c.Demand_t, c.TotalCost, c.Province, duals)
+                                    for c in columns.itertuples()]
+    allocation = columns.assign(Output_t=columns['Demand_t'] * columns['Weight'],
+                                Cost_mUSD=columns['TotalCost'] * columns['Weight'])
+    allocation = allocation.groupby(['City', 'Province'], as_index=False)[['Output_t', 'Cost_mUSD']].sum()
+    allocation = allocation[allocation['Output_t'] > 1e-6].sort_values('Output_t', ascending=False)
+    allocation['Cost_per_tonne'] = allocation['Cost_mUSD'] * 1e6 / allocation['Output_t']
+    return allocation.reset_index(drop=True), columns, pd.DataFrame(history)
+
+
+def read_province_caps(values):
+    # ["Hebei=2.5", ...] in Mt -> {province: tonnes}
+    caps = {}
+    for item in values or []:
+        name, _, cap = item.rpartition('=')
+        if not name:
+            raise ValueError(f"Province cap '{item}' should look like Province=Mt")
+        caps[name] = float(cap) * 1e6
+    return caps
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Allocate a national green steel target across cities")
+    parser.add_argument('--target-mt', type=float, required=True, help="National annual output (Mt)")
+    parser.add_argument('--province-cap', nargs='*', default=None, help="Province=Mt caps")
+    parser.add_argument('--levels-mt', nargs='*', type=float, default=[d / 1e6 for d in DEMAND_LEVELS_T])
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out-dir', default=CITIES_DIR)
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    allocation, columns, history = solve_portfolio(
+        sites, args.target_mt * 1e6, read_province_caps(args.province_cap), args.ycase, args.scase,
+        [d * 1e6 for d in args.levels_mt], args.workers, args.solver, args.store_dir)
+
+    print(allocation.to_string(index=False, float_format='%.2f'))
+    tag = f'{args.target_mt:g}Mt_{args.ycase}_{args.scase}'
+    allocation.to_csv(os.path.join(args.out_dir, f'portfolio_allocation_{tag}.csv'), index=False)
+    columns.to_csv(os.path.join(args.out_dir, f'portfolio_columns_{tag}.csv'), index=False)
+    history.to_csv(os.path.join(args.out_dir, f'portfolio_iterations_{tag}.csv'), index=False)
+    print(f"\n Portfolio results saved to '{args.out_dir}'.")
@@ -0,0 +1,143 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from green_steel.profiles import HOURS_PER_YEAR, VRE_SOURCES, load_vre_profile
+from green_steel.sites import CITIES_DIR, scan_profiles
+
+# ======================
+# CONSOLIDATED PROFILE STORE
+# ======================
+# All city profiles of one weather year packed into a single
+# (n_cities x 8760 x 2) .npy array plus a City -> row index table.
+# Workers open the array with mmap_mode='r' so the pages are shared by the
+# OS instead of every process re-parsing its own CSV.
+#
+# Hourly grid price series (tariffs or wholesale price years) live next to
+# them as one (n_series x 8760) float64 array in $/MWh with a Series -> row
+# index table, packed from a CSV with a t column and one column per series.
+
+DEFAULT_STORE_DIR = os.path.join(CITIES_DIR, 'profile_store')
+
+# float32 keeps ~7 significant digits; profiles are read back rounded to
+# this many decimals so the LP sees the same coefficients as the CSVs.
+STORE_DECIMALS = 6
+
+
+def store_paths(store_dir, year):
+    return (os.path.join(store_dir, f'vre_profiles_{year}.npy'),
+            os.path.join(store_dir, f'vre_profiles_{year}_index.csv'))
+
+
+def grid_price_paths(store_dir):
+    return (os.path.join(store_dir, 'grid_prices.npy'),
+            os.path.join(store_dir, 'grid_prices_index.csv'))
+
+
+def build_profile_store(profile_paths, store_dir=DEFAULT_STORE_DIR, year=2019, dtype=np.float32):
+    # profile_paths: {city: csv path}
+    if not profile_paths:
+        raise ValueError("No profiles to pack into the store")
+    os.makedirs(store_dir, exist_ok=True)
+    array_path, index_path = store_paths(store_dir, year)
+
+    cities = list(profile_paths)
+    packed = np.lib.format.open_memmap(array_path, mode='w+', dtype=dtype,
+                                       shape=(len(cities), HOURS_PER_YEAR, len(VRE_SOURCES)))
+    for row, city in enumerate(cities):
+        packed[row] = load_vre_profile(profile_paths[city])
+    packed.flush()
+    del packed
+
+    pd.DataFrame({
+        'City': cities,
+        'Row': range(len(cities)),
+        'Source': [os.path.relpath(profile_paths[c], store_dir) for c in cities],
+    }).to_csv(index_path, index=False)
+    return array_path, index_path
+
+
+def open_profile_store(store_dir=DEFAULT_STORE_DIR, year=2019):
+    # Returns (read-only memory-mapped array, {City: row})
+    array_path, index_path = store_paths(store_dir, year)
+    if not os.path.isfile(array_path):
+        raise FileNotFoundError(f"No profile store for {year} in {store_dir}; "
+                                f"build it with `python -m green_steel.profile_store`")
+    profiles = np.load(array_path, mmap_mode='r')
+    index = pd.read_csv(index_path)
+    rows = dict(zip(index['City'], index['Row']))
+    if len(rows) != profiles.shape[0]:
+        raise ValueError(f"{index_path} lists {len(rows)} cities but the store holds {profiles.shape[0]}")
+    return profiles, rows
+
+
+def build_grid_price_store(csv_path, store_dir=DEFAULT_STORE_DIR):
+    prices = pd.read_csv(csv_path, encoding='utf-8-sig')
+    if 't' not in prices.columns:
+        raise ValueError(f"{csv_path}: missing column 't'")
+    series = [c for c in prices.columns if c != 't']
+    if not series:
+        raise ValueError(f"{csv_path}: no price series besides 't'")
+    if len(prices) != HOURS_PER_YEAR:
+        raise ValueError(f"{csv_path}: expected {HOURS_PER_YEAR} hourly rows, got {len(prices)}")
+    values = prices[series].to_numpy(dtype=np.float64).T
+    if not np.isfinite(values).all():
+        raise ValueError(f"{csv_path}: grid prices contain missing or non-finite values")
+
+    os.makedirs(store_dir, exist_ok=True)
+    array_path, index_path = grid_price_paths(store_dir)
+    np.save(array_path, np.ascontiguousarray(values))
+    pd.DataFrame({'Series': [str(c) for c in series], 'Row': range(len(series))}).to_csv(index_path, index=False)
+    return array_path, index_path
+
+
+def open_grid_prices(store_dir=DEFAULT_STORE_DIR):
+    # Returns (read-only memory-mapped array, {Series: row})
+    array_path, index_path = grid_price_paths(store_dir)
+    if not os.path.isfile(array_path):
+        raise FileNotFoundError(f"No grid prices in {store_dir}; "
+                                f"pack them with `python -m green_steel.profile_store --grid-prices <csv>`")
+    prices = np.load(array_path, mmap_mode='r')
+    index = pd.read_csv(index_path, dtype={'Series': str})
+    return prices, dict(zip(index['Series'], index['Row']))
+
+
+def store_grid_prices(store, series):
+    # float64 copy of one hourly price series ($/MWh)
+    prices, rows = store
+    if series not in rows:
+        raise KeyError(f"Grid price series '{series}' is not in the profile store")
+    values = np.array(prices[rows[series]], dtype=np.float64)
+    values.setflags(write=False)
+    return values
+
+
+def store_profile(store, city):
+    # float64 (8760 x 2) copy of one city's profile, ready for set_vre_profile
+    profiles, rows = store
+    if city not in rows:
+        raise KeyError(f"City '{city}' is not in the profile store")
+    profile = np.round(profiles[rows[city]].astype(np.float64), STORE_DECIMALS)
+    profile.setflags(write=False)
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack all city VRE profiles into one memory-mappable store")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--grid-prices', default=None, help="CSV of hourly grid price series ($/MWh) to pack")
+    args = parser.parse_args()
+
+    if args.grid_prices:
+        array_path, index_path = build_grid_price_store(args.grid_prices, args.store_dir)
+        print(f"Packed grid price series from {args.grid_prices} into {array_path}")
+
+    found = scan_profiles(args.profiles_dir, args.year)
+    paths = dict(zip(found['City'], found['Profile']))
+    array_path, index_path = build_profile_store(paths, args.store_dir, args.year)
+    print(f"Packed {len(paths)} city profiles into {array_path}")
+    print(f"City index written to {index_path}")
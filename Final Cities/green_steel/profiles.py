@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ======================
+# VRE PROFILE LOADING
+# ======================
+# Profiles are hourly capacity factors [MW/MW installed] stored as
+# <City>_<year>.csv with columns t (t1..t8760), s (solar) and w (wind).
+
+HOURS_PER_YEAR = 8760
+VRE_SOURCES = ('s', 'w')  # Column order of every profile array
+_CSV_DTYPES = {'t': str, 's': np.float64, 'w': np.float64}
+
+# Parsed profiles keyed by (absolute path, modification time), so the
+# 12 scenarios of a city only read the CSV once per process.
+_profile_cache = {}
+
+
+def validate_vre_profile(profile, labels=None, source='profile', first_hour=1):
+    if profile.ndim != 2 or profile.shape[1] != len(VRE_SOURCES):
+        raise ValueError(f"{source}: expected an (hours x {len(VRE_SOURCES)}) array, got shape {profile.shape}")
+    if profile.shape[0] % HOURS_PER_YEAR != 0:
+        raise ValueError(f"{source}: expected a multiple of {HOURS_PER_YEAR} rows, got {profile.shape[0]}")
+
+    if labels is not None:
+        expected = np.array([f't{i}' for i in range(first_hour, first_hour + profile.shape[0])])
+        mismatch = np.flatnonzero(labels != expected)
+        if mismatch.size:
+            i = mismatch[0]
+            raise ValueError(f"{source}: row {first_hour + i} is labelled '{labels[i]}', expected '{expected[i]}'")
+
+    if not np.isfinite(profile).all():
+        raise ValueError(f"{source}: profile contains missing or non-finite values")
+    if profile.min() < 0 or profile.max() > 1:
+        raise ValueError(f"{source}: capacity factors must lie in [0, 1] "
+                         f"(found {profile.min():.4f} to {profile.max():.4f})")
+
+
+def _frame_to_profile(vre_data, source):
+    missing = [c for c in ('t',) + VRE_SOURCES if c not in vre_data.columns]
+    if missing:
+        raise ValueError(f"{source}: missing column(s) {missing}")
+    profile = np.ascontiguousarray(vre_data[list(VRE_SOURCES)].to_numpy(dtype=np.float64))
+    labels = vre_data['t'].str.strip().to_numpy()
+    return profile, labels
+
+
+def read_vre_csv(path):
+    vre_data = pd.read_csv(path, encoding='utf-8-sig', dtype=_CSV_DTYPES)
+    return _frame_to_profile(vre_data, path)
+
+
+def load_vre_profile(path):
+    # Returns a read-only, C-contiguous float64 array of shape (8760, 2)
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    profile = _profile_cache.get(key)
+    if profile is None:
+        profile, labels = read_vre_csv(path)
+        if profile.shape[0] != HOURS_PER_YEAR:
+            raise ValueError(f"{path}: expected {HOURS_PER_YEAR} hourly rows, got {profile.shape[0]}")
+        validate_vre_profile(profile, labels, source=path)
+        profile.setflags(write=False)
+        _profile_cache[key] = profile
+    return profile
+
+
+def stream_vre_csv(path, window_hours=HOURS_PER_YEAR):
+    # Yields validated (window_hours x 2) windows of a profile CSV without
+    # ever holding more than one window. Nothing is cached.
+    first_hour = 1
+    for chunk in pd.read_csv(path, encoding='utf-8-sig', dtype=_CSV_DTYPES, chunksize=window_hours):
+        profile, labels = _frame_to_profile(chunk, path)
+        if profile.shape[0] != window_hours:
+            raise ValueError(f"{path}: last window has {profile.shape[0]} rows, expected {window_hours}")
+        validate_vre_profile(profile, labels, source=path, first_hour=first_hour)
+        yield profile
+        first_hour += window_hours
+
+
+def set_vre_profile(model, profile, first_hour=1):
+    # Bulk assignment of model.VRE_prod[t, i] from an (hours x 2) array
+    # covering hours first_hour .. first_hour + len(profile) - 1.
+    # store_values(check=False) skips the per-element Param validation,
+    # which is safe because the whole array has already been validated.
+    n_hours = len(model.T)
+    last_hour = first_hour + profile.shape[0] - 1
+    if profile.ndim != 2 or profile.shape[1] != len(VRE_SOURCES) or first_hour < 1 or last_hour > n_hours:
+        raise ValueError(f"Profile shape {profile.shape} starting at hour {first_hour} "
+                         f"does not fit the model horizon of {n_hours} hours")
+
+    keys = [(t, i) for t in range(first_hour, last_hour + 1) for i in VRE_SOURCES]
+    model.VRE_prod.store_values(dict(zip(keys, profile.ravel().tolist())), check=False)
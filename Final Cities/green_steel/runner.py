@@ -0,0 +1,310 @@
+import argparse
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.checks import physical_checks
+from green_steel.fingerprints import FINGERPRINT_COLUMN
+from green_steel.jobs import build_job_model, build_jobs, job_profile
+from green_steel.lazy_storage import solve_lazy_storage
+from green_steel.marginal_prices import attach_duals, hourly_marginal_prices, marginal_results, save_hourly_prices
+from green_steel.model import SCASES, YCASES, extract_results, print_results, solve_model
+from green_steel.scaling import apply_unit_scaling
+from green_steel.solver_profiles import DEFAULT_PROFILE, available_profiles, solver_options
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.warm_start import (BASELINE_SAMPLE_EVERY, SEED_KEYS, basis_path, nearest_seed, pick_anchors,
+                                    profile_features, save_basis, seed_table, solve_seeded, warm_start_row)
+
+# ======================
+# SCENARIO RUNNER
+# ======================
+# One job per (site, Ycase, Scase) (green_steel.jobs). Jobs are plain dicts
+# so they pickle cheaply to worker processes; every worker builds its own
+# model.
+
+JOB_KEYS = ['City', 'WeatherYear', 'Ycase', 'Scase', 'Objective', FINGERPRINT_COLUMN]
+ROW_KEYS = ['Objective', 'WeatherYear', 'Ycase', 'Scase']  # One results row per key within a city file
+# Where the CLI writes results unless asked to replace the committed
+# all_scenario_results_<City>.csv next to each profile (--in-place)
+DEFAULT_RESULTS_DIR = os.path.join(CITIES_DIR, 'results')
+
+
+def prices_path(job, prices_dir):
+    return os.path.join(prices_dir, f"{job['City']}_{job['WeatherYear']}_{job['Objective']}_"
+                                    f"{job['Ycase']}_{job['Scase']}.npz")
+
+
+def run_job(job, solver_name='gurobi', tee=False, store_dir=None, scaled=False, solver_profile=DEFAULT_PROFILE,
+            prices_dir=None, lazy_storage=False, bases_dir=None):
+    # prices_dir: also save hourly marginal prices there and add their summaries to the row.
+    # lazy_storage: add the storage peak/valley rows by cutting planes (green_steel.lazy_storage);
+    # the bounds are exact, and physical_checks reports any storage bound breach
+    # bases_dir: save the final simplex basis there, for warm starts of other jobs
+    model = build_job_model(job, store_dir)
+    if scaled:
+        apply_unit_scaling(model)
+    if prices_dir is not None:
+        attach_duals(model)
+    options = solver_options(solver_profile, solver_name)
+    seed = job.get('WarmStart')
+    solver = pyo.SolverFactory(solver_name) if bases_dir is not None else None
+    if seed is not None:
+        results, optimal, telemetry, cold_telemetry = solve_seeded(model, seed, solver_name, options, solver)
+    elif lazy_storage:
+        results, optimal, telemetry = solve_lazy_storage(model, solver_name, options)
+    else:
+        results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=tee, options=options,
+                                                  solver=solver)
+    if not optimal:
+        print(f"\n No optimal solution for {job['City']} ({job['Ycase']}, {job['Scase']}):"
+              f" {telemetry['Solve_termination']}")
+        return None
+    if bases_dir is not None:
+        save_basis(solver, basis_path(job, bases_dir))
+    if tee:
+        print_results(model)
+    row = extract_results(model, objective=job['Objective'])
+    row.update({k: job[k] for k in JOB_KEYS})
+    row.update(physical_checks(model))
+    if not row['Physical_checks_passed']:
+        print(f"\n Physical checks failed for {job['City']} ({job['Ycase']}, {job['Scase']}):"
+              f" {row['Physical_check_failures']}")
+    if 'Demand_t' in job:
+        row['Demand_t'] = job['Demand_t']
+    row.update(telemetry)
+    row['Solve_profile'] = solver_profile
+    if seed is not None:
+        row.update(warm_start_row(seed, telemetry, cold_telemetry))
+    if prices_dir is not None:
+        prices = hourly_marginal_prices(model)
+        row.update(marginal_results(model, prices))
+        save_hourly_prices(prices, prices_path(job, prices_dir))
+    return row
+
+
+def run_jobs(jobs, workers=1, solver_name='gurobi', tee=False, store_dir=None, quiet=False, scaled=False,
+             solver_profile=DEFAULT_PROFILE, prices_dir=None, warm_start=False, seeds=None, lazy_storage=False,
+             bases_dir=None):
+    # quiet=True drops the per-job progress lines as well as the solver log.
+    # warm_start=True seeds jobs from the most similar solved city (see
+    # green_steel.warm_start); seeds are earlier results rows with a Profile,
+    # usable when their basis is in bases_dir (default: a temporary folder
+    # holding this run's bases only).
+    solver_options(solver_profile, solver_name)  # Fail on an unknown profile before starting workers
+    if lazy_storage and (scaled or warm_start):
+        raise ValueError("lazy_storage re-solves the model in place and cannot be combined with scaled or warm_start")
+    solve = partial(run_job, solver_name=solver_name, tee=tee and not quiet, store_dir=store_dir, scaled=scaled,
+                    solver_profile=solver_profile, prices_dir=prices_dir, lazy_storage=lazy_storage)
+    if not warm_start:
+        return _execute(jobs, solve, workers, quiet)
+    if scaled:
+        raise ValueError("Warm starts load a basis into the model's own solver and cannot be combined with scaled=True")
+    if bases_dir is not None:
+        os.makedirs(bases_dir, exist_ok=True)
+        return _run_warm_started(jobs, partial(solve, bases_dir=bases_dir), workers, quiet, store_dir, seeds or [],
+                                 bases_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        return _run_warm_started(jobs, partial(solve, bases_dir=tmp), workers, quiet, store_dir, seeds or [], tmp)
+
+
+def _run_warm_started(jobs, solve, workers, quiet, store_dir, seeds, bases_dir):
+    # Jobs of a scenario with no solved city yet start with a few cold
+    # anchors; every other job is then seeded from its nearest solved city
+    features = {}
+    for item in list(jobs) + list(seeds):
+        if item['City'] not in features:
+            features[item['City']] = profile_features(job_profile(item, store_dir))
+    known = seed_table(seeds, bases_dir)
+
+    groups = {}
+    for job in jobs:
+        groups.setdefault(tuple(job[k] for k in SEED_KEYS), []).append(job)
+    anchors = []
+    for key, group in groups.items():
+        solved = known
+        for k, value in zip(SEED_KEYS, key):
+            solved = solved[solved[k] == value]
+        if solved.empty:
+            anchors.extend(pick_anchors(group, features, max(workers, 1)))
+    rows = _execute(anchors, solve, workers, quiet)
+
+    known = seed_table(list(seeds) + rows, bases_dir)
+    anchor_ids = {id(job) for job in anchors}
+    seeded = []
+    n_seeded = 0
+    for job in jobs:
+        if id(job) in anchor_ids:
+            continue
+        seed = nearest_seed(job, known, features)
+        if seed is None:
+            seeded.append(job)
+            continue
+        # A sample of seeded jobs is also solved cold, for their own baseline
+        seed['Measure_baseline'] = n_seeded % BASELINE_SAMPLE_EVERY == 0
+        n_seeded += 1
+        seeded.append(dict(job, WarmStart=seed))
+    return rows + _execute(seeded, solve, workers, quiet)
+
+
+def _execute(jobs, solve, workers, quiet):
+    rows = []
+    if workers <= 1:
+        for job in jobs:
+            if not quiet:
+                print(f"\n Solving {job['City']}: Ycase={job['Ycase']}, Scase={job['Scase']}")
+            row = solve(job)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(solve, job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            row = future.result()
+            if not quiet:
+                print(f" [{done}/{len(jobs)}] {job['City']} ({job['Ycase']}, {job['Scase']})"
+                      f" {'solved' if row is not None else 'not optimal'}")
+            if row is not None:
+                rows.append(row)
+    return rows
+
+
+def results_path(city, profile_path, out_dir=None):
+    # Default: next to the site's profile, as for the per-city scripts
+    folder = out_dir if out_dir is not None else os.path.dirname(profile_path)
+    return os.path.join(folder, f'all_scenario_results_{city}.csv')
+
+
+def _read_existing(path):
+    existing = pd.read_csv(path)
+    for col in ('WeatherYear', FINGERPRINT_COLUMN):
+        if col not in existing.columns:
+            existing[col] = np.nan
+    return existing
+
+
+def read_results_store(sites, out_dir=None):
+    # Every results row already saved for these sites, with its site's Profile
+    rows = []
+    for site in sites.to_dict('records'):
+        path = results_path(site['City'], site['Profile'], out_dir)
+        if os.path.isfile(path):
+            for row in _read_existing(path).to_dict('records'):
+                row.update(City=site['City'], WeatherYear=site['WeatherYear'], Profile=site['Profile'])
+                rows.append(row)
+    return rows
+
+
+def stale_jobs(jobs, out_dir=None):
+    # Jobs with no results row yet, or whose row was solved from other inputs.
+    # Rows written before fingerprints existed always count as stale.
+    known = {}
+    stale = []
+    for job in jobs:
+        path = results_path(job['City'], job['Profile'], out_dir)
+        if path not in known:
+            known[path] = {}
+            if os.path.isfile(path):
+                existing = _read_existing(path)
+                known[path] = {tuple(r[k] for k in ROW_KEYS): r[FINGERPRINT_COLUMN]
+                               for r in existing.to_dict('records')}
+        if known[path].get(tuple(job[k] for k in ROW_KEYS)) != job[FINGERPRINT_COLUMN]:
+            stale.append(job)
+    return stale
+
+
+def _merge_rows(existing, new):
+    # Replace the existing rows that the new rows re-solve (legacy rows
+    # without a WeatherYear match on Objective/Ycase/Scase alone)
+    new_keys = set(map(tuple, new[ROW_KEYS].to_numpy().tolist()))
+    short_keys = {k[:1] + k[2:] for k in new_keys}
+    replaced = [tuple(r[k] for k in ROW_KEYS) in new_keys or
+                (pd.isna(r['WeatherYear']) and (r['Objective'], r['Ycase'], r['Scase']) in short_keys)
+                for r in existing.to_dict('records')]
+    return pd.concat([existing[~np.array(replaced, dtype=bool)], new], ignore_index=True)
+
+
+def write_results(rows, jobs, out_dir=None, merge=False, overwrite=False):
+    # One all_scenario_results_<City>.csv per site, scenarios in Ycase/Scase order.
+    # With merge=True only the re-solved rows of an existing file are patched.
+    # out_dir=None writes next to the profiles, over the committed per-city
+    # results, and so needs overwrite=True.
+    if out_dir is None and not overwrite:
+        raise ValueError("Writing next to the profiles replaces the committed per-city results; "
+                         "pass an out_dir or overwrite=True")
+    if not rows:
+        return []
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    df = pd.DataFrame(rows)
+    profiles = {job['City']: job['Profile'] for job in jobs}
+
+    written = []
+    for city, city_df in df.groupby('City', sort=True):
+        path = results_path(city, profiles[city], out_dir)
+        if merge and os.path.isfile(path):
+            city_df = _merge_rows(_read_existing(path), city_df)
+        city_df = city_df.assign(Ycase=pd.Categorical(city_df['Ycase'], YCASES, ordered=True),
+                                 Scase=pd.Categorical(city_df['Scase'], SCASES, ordered=True))
+        city_df.sort_values(['Objective', 'WeatherYear', 'Ycase', 'Scase']).to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discover sites and solve every (site, Ycase, Scase) job")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--manifest', default=None, help="CSV with City, Profile, TransportCost_USD_per_t")
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None, help="Only run these sites")
+    parser.add_argument('--store-dir', default=None, help="Use a memory-mapped profile store")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--solver-profile', default=DEFAULT_PROFILE, choices=sorted(available_profiles()),
+                        help="Named solver option set (see green_steel.solver_profiles)")
+    parser.add_argument('--out-dir', default=DEFAULT_RESULTS_DIR,
+                        help="Folder for the all_scenario_results_<City>.csv files (also read by --incremental "
+                             "and --warm-start)")
+    parser.add_argument('--in-place', action='store_true',
+                        help="Write next to each site's profile instead, replacing the committed results")
+    parser.add_argument('--tee', action='store_true', help="Stream solver logs and print full results")
+    parser.add_argument('--quiet', action='store_true', help="No per-job console output")
+    parser.add_argument('--scaled', action='store_true', help="Solve in rescaled units (see green_steel.scaling)")
+    parser.add_argument('--prices-dir', default=None,
+                        help="Save hourly marginal electricity and hydrogen prices (.npz) to this folder")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-solve jobs whose input fingerprint changed and patch their rows")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Seed each job with the basis of the most similar solved city (needs appsi_highs "
+                             "or appsi_gurobi)")
+    parser.add_argument('--bases-dir', default=None,
+                        help="Keep the warm-start bases in this folder so later runs can seed from them")
+    parser.add_argument('--lazy-storage', action='store_true',
+                        help="Add the hourly storage peak/valley rows only in the hours that break them; "
+                             "measured slower than the full LP with appsi_highs (see green_steel.lazy_storage)")
+    args = parser.parse_args()
+    out_dir = None if args.in_place else args.out_dir
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year, args.manifest)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    jobs = build_jobs(sites)
+    print(f"Discovered {len(sites)} sites -> {len(jobs)} jobs")
+    seeds = read_results_store(sites, out_dir) if args.warm_start else None
+    if args.incremental:
+        jobs = stale_jobs(jobs, out_dir)
+        print(f"{len(jobs)} jobs have changed inputs")
+
+    rows = run_jobs(jobs, workers=args.workers, solver_name=args.solver, tee=args.tee, store_dir=args.store_dir,
+                    quiet=args.quiet, scaled=args.scaled, solver_profile=args.solver_profile,
+                    prices_dir=args.prices_dir, warm_start=args.warm_start, seeds=seeds,
+                    lazy_storage=args.lazy_storage, bases_dir=args.bases_dir)
+    for path in write_results(rows, jobs, out_dir, merge=args.incremental, overwrite=args.in_place):
+        print(f" Results saved to '{path}'.")
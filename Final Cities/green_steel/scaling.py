@@ -0,0 +1,169 @@
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+from pyomo.repn import generate_standard_repn
+
+from green_steel.model import build_city_model
+
+# ======================
+# NUMERICAL SCALING
+# ======================
+# coefficient_ranges() reports the matrix, RHS, bound and objective
+# coefficient ranges of every constraint family. apply_unit_scaling()
+# attaches a scaling_factor suffix that solve_model() honours: annual
+# totals are solved in kt / GWh instead of t / MWh, the hydrogen-heat energy
+# balance in GJ instead of MJ, and every row is equilibrated by a power of
+# two. Solutions (and duals) are mapped back onto the original model, so
+# extract_results() still reports t, MWh and $.
+
+# Variable family: (factor, unit the solver sees). value_scaled = factor * value
+UNIT_SCALES = {
+    'En_H2heat': (1e-3, 'GJ'),
+    **{name: (1e-3, 'GWh') for name in (
+        'T_RE', 'T_P_curtail', 'T_P_cons', 'T_P_ely', 'T_P_H2heat', 'T_P_cmp2b', 'T_P_cmp200b',
+        'T_P_CDRIheat', 'T_P_EAF', 'T_P_cst', 'T_P_grid_import', 'T_P_FC')},
+    **{name: (1e-3, 'kt') for name in (
+        'T_H2', 'T_CGH2', 'T_CGH2_DRI', 'T_CGH2_FC', 'T_HBI', 'T_HDRI', 'T_CDRI')},
+}
+
+RANGE_COLUMNS = ['Family', 'Kind', 'Rows', 'Min_abs', 'Max_abs', 'Span_decades']
+
+
+def _power_of_two(x):
+    # Scaling by powers of two is exact in floating point
+    return 2.0 ** round(math.log2(x))
+
+
+def _linear_repn(expr, name):
+    repn = generate_standard_repn(expr, compute_values=True)
+    if repn.nonlinear_expr is not None or repn.quadratic_vars:
+        raise ValueError(f"{name} is not linear; coefficient ranges are only defined for the LP")
+    return repn
+
+
+def _range_row(family, kind, rows, values):
+    values = np.abs(np.asarray(values, dtype=np.float64))
+    values = values[values > 0]
+    if values.size == 0:
+        return {'Family': family, 'Kind': kind, 'Rows': rows,
+                'Min_abs': np.nan, 'Max_abs': np.nan, 'Span_decades': np.nan}
+    return {'Family': family, 'Kind': kind, 'Rows': rows, 'Min_abs': values.min(), 'Max_abs': values.max(),
+            'Span_decades': math.log10(values.max() / values.min())}
+
+
+def _var_factor(var, var_factors):
+    return var_factors.get(var, 1.0) if var_factors else 1.0
+
+
+def coefficient_ranges(model, var_factors=None, con_factors=None, obj_factor=1.0):
+    # With the factors of apply_unit_scaling() the ranges are those the
+    # solver sees after scaling; without them, those of the model as written.
+    rows = []
+    for con in model.component_objects(pyo.Constraint, active=True, descend_into=True):
+        matrix, rhs = [], []
+        n_rows = 0
+        for data in con.values():
+            if not data.active:
+                continue
+            n_rows += 1
+            repn = _linear_repn(data.body, data.name)
+            row_factor = con_factors.get(data, 1.0) if con_factors else 1.0
+            matrix.extend(row_factor * c / _var_factor(v, var_factors)
+                          for c, v in zip(repn.linear_coefs, repn.linear_vars))
+            for bound in (data.lower, data.upper):
+                if bound is not None:
+                    rhs.append(row_factor * (pyo.value(bound) - repn.constant))
+        rows.append(_range_row(con.name, 'matrix', n_rows, matrix))
+        rows.append(_range_row(con.name, 'rhs', n_rows, rhs))
+
+    for var in model.component_objects(pyo.Var, active=True, descend_into=True):
+        bounds = []
+        for data in var.values():
+            for bound in (data.lb, data.ub):
+                if bound is not None:
+                    bounds.append(bound * _var_factor(data, var_factors))
+        if bounds:
+            rows.append(_range_row(var.name, 'bounds', len(var), bounds))
+
+    for obj in model.component_objects(pyo.Objective, active=True, descend_into=True):
+        for data in obj.values():
+            repn = _linear_repn(data.expr, data.name)
+            rows.append(_range_row(data.name, 'objective', 1,
+                                   [obj_factor * c / _var_factor(v, var_factors)
+                                    for c, v in zip(repn.linear_coefs, repn.linear_vars)]))
+
+    ranges = pd.DataFrame(rows, columns=RANGE_COLUMNS)
+    for kind in ('matrix', 'rhs', 'bounds', 'objective'):
+        part = ranges[ranges['Kind'] == kind]
+        if part['Max_abs'].notna().any():
+            ranges.loc[len(ranges)] = {
+                'Family': 'ALL', 'Kind': kind, 'Rows': part['Rows'].sum(),
+                'Min_abs': part['Min_abs'].min(), 'Max_abs': part['Max_abs'].max(),
+                'Span_decades': math.log10(part['Max_abs'].max() / part['Min_abs'].min()),
+            }
+    return ranges
+
+
+def apply_unit_scaling(model, unit_scales=UNIT_SCALES):
+    # Attaches model.scaling_factor. Variable factors come from unit_scales;
+    # each row is then divided by the power of two nearest the geometric
+    # mean of its smallest and largest scaled coefficients.
+    if model.component('scaling_factor') is not None:
+        raise ValueError("Model already has a scaling_factor suffix")
+    var_factors = pyo.ComponentMap()
+    for name, (factor, _) in unit_scales.items():
+        var = model.component(name)
+        if var is None:
+            raise ValueError(f"No variable '{name}' to rescale")
+        for data in var.values():
+            var_factors[data] = factor
+
+    con_factors = pyo.ComponentMap()
+    for data in model.component_data_objects(pyo.Constraint, active=True, descend_into=True):
+        repn = _linear_repn(data.body, data.name)
+        coefs = [abs(c / _var_factor(v, var_factors)) for c, v in zip(repn.linear_coefs, repn.linear_vars)]
+        coefs = [c for c in coefs if c > 0]
+        if coefs:
+            con_factors[data] = 1 / _power_of_two(math.sqrt(min(coefs) * max(coefs)))
+
+    obj_factor = 1.0
+    for data in model.component_data_objects(pyo.Objective, active=True, descend_into=True):
+        repn = _linear_repn(data.expr, data.name)
+        coefs = [abs(c / _var_factor(v, var_factors)) for c, v in zip(repn.linear_coefs, repn.linear_vars)]
+        coefs = [c for c in coefs if c > 0]
+        if coefs:
+            obj_factor = 1 / _power_of_two(max(coefs))
+
+    model.scaling_factor = pyo.Suffix(direction=pyo.Suffix.EXPORT)
+    for var, factor in var_factors.items():
+        model.scaling_factor[var] = factor
+    for con, factor in con_factors.items():
+        model.scaling_factor[con] = factor
+    for data in model.component_data_objects(pyo.Objective, active=True, descend_into=True):
+        model.scaling_factor[data] = obj_factor
+    return var_factors, con_factors, obj_factor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report LP coefficient ranges before and after unit scaling")
+    parser.add_argument('--city', default='Wuhai')
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--hours', type=int, default=168, help="Horizon to build (coefficients repeat hourly)")
+    parser.add_argument('--out', default=None, help="Also write the ranges to this CSV")
+    args = parser.parse_args()
+
+    model = build_city_model(args.city, args.ycase, args.scase, args.hours)
+    before = coefficient_ranges(model)
+    after = coefficient_ranges(model, *apply_unit_scaling(model))
+    report = before.merge(after, on=['Family', 'Kind', 'Rows'], suffixes=('', '_scaled'))
+    report = report.sort_values('Span_decades', ascending=False, na_position='last')
+
+    pd.set_option('display.width', 200)
+    print(report.to_string(index=False, float_format='%.3g'))
+    if args.out:
+        report.to_csv(args.out, index=False)
+        print(f"\n Coefficient ranges saved to '{args.out}'.")
@@ -0,0 +1,184 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from green_steel.model import (ALPHA_CMP2B, ALPHA_CST, ALPHA_DRI, ALPHA_H2HEAT, CGH2_STORAGE_UCOST, CMP2B_FIXED,
+                               CMP2B_UCOST, CST_UCOST, DRI_YIELD_EAF, DRP_UCOST, EAF_FIXED, EAF_UCOST, EFF_INV, F_CR,
+                               F_MAINT, F_MET_BASE, F_MET_SCRAP, F_SCRAP, LAB_DRI, LAB_EAF_CST, MASS_ALY, MASS_ELD,
+                               PRICE_ALLOYS, PRICE_ELECTRODE, PRICE_LIME, PRICE_LMP, PRICE_PEL, PRICE_SCR, REP,
+                               ROM_GRADE, ely_values, plant_mass_flows, ucost_data)
+from green_steel.profile_store import DEFAULT_STORE_DIR, open_profile_store
+from green_steel.profiles import HOURS_PER_YEAR
+from green_steel.sites import DEFAULT_METADATA, read_site_metadata
+
+# ======================
+# ANALYTICAL SITE PRE-SCREEN
+# ======================
+# Ranks candidate sites from their VRE profiles alone, without building an
+# LP. Energy, efficiency and cost coefficients are imported from
+# green_steel.model, and plant_flows takes its mass balances from
+# model.plant_mass_flows, as initialize_model_parameters does. The estimate
+# is meant for ordering sites, the LP stays the reference for results.
+# The plant mass flows, plant CAPEX and fixed OPEX below are shared with
+# the dispatch simulator (green_steel.dispatch_sim).
+
+DEM_SFS = 1e6  # t steel / year
+
+
+def plant_flows(ycase, scase, dem=DEM_SFS):
+    # Annual mass flows and ore subsystem energy (model.plant_mass_flows)
+    # plus the per-tonne-of-steel DRI intake of the EAF (flow_DRI_scr1 with
+    # flow_DRI_scr2 and flow_aly substituted)
+    f_scrap = F_SCRAP[scase]
+    flows = plant_mass_flows(dem, f_scrap, ROM_GRADE)
+    f_met = F_MET_SCRAP * f_scrap + F_MET_BASE
+    flows['DRI_per_t_steel'] = (1 - MASS_ALY) / f_met / (DRI_YIELD_EAF + f_scrap / (1 - f_scrap))
+    return flows
+
+
+def plant_capex(flows, c_EAF, LS_max):
+    # $ million of the DRP, its 2 bar compressor, the EAF and the caster
+    # (CAPEX_DRP, CAPEX_cmp2b, CAPEX_EAF, CAPEX_cst)
+    return {
+        'DRP': DRP_UCOST * flows['T_DRI'],
+        'cmp2b': CMP2B_UCOST * flows['T_DRI'] / 1e6 + CMP2B_FIXED,
+        'EAF': EAF_UCOST * c_EAF + EAF_FIXED,
+        'cst': CST_UCOST * LS_max,
+    }
+
+
+def plant_opex(flows, transport_cost_per_tonne, dem=DEM_SFS):
+    # $ million / year of materials, labour and ore transport (aOPEX without maintenance)
+    return (flows['T_DR_pel'] * PRICE_PEL + flows['T_DR_lmp'] * PRICE_LMP + flows['T_scr'] * PRICE_SCR
+            + flows['T_lime'] * PRICE_LIME + dem * MASS_ALY * PRICE_ALLOYS + dem * MASS_ELD * PRICE_ELECTRODE
+            + LAB_DRI * flows['T_DRI'] + LAB_EAF_CST * dem
+            + flows['T_ore_ROM'] * transport_cost_per_tonne) / 1e6
+
+
+def energy_per_tonne(ycase, scase):
+    # MWh per t steel drawn from the hourly power balance, with DRI hydrogen
+    # heating met electrically. Electrolysis is counted on both the DC bus
+    # and the AC inverter feed, as in the LP.
+    dri = plant_flows(ycase, scase, 1.0)['DRI_per_t_steel']
+    p_ely_dc = ely_values[ycase] * ALPHA_DRI * dri
+    return p_ely_dc * (1 + 1 / EFF_INV) + (ALPHA_CMP2B + ALPHA_H2HEAT / 3600) * dri + ALPHA_CST, p_ely_dc
+
+
+def plant_cost_per_tonne(ycase, scase, transport_cost_per_tonne):
+    # Non-VRE annualised cost ($/t steel) with the plant running flat out:
+    # DRP, compressors, EAF, caster and electrolyser at their minimum size,
+    # plus materials, labour and ore transport.
+    dem = DEM_SFS
+    flows = plant_flows(ycase, scase, dem)
+    c_EAF = dem / HOURS_PER_YEAR
+    c_ely = energy_per_tonne(ycase, scase)[1] * dem / HOURS_PER_YEAR
+    capex = sum(plant_capex(flows, c_EAF, c_EAF).values()) + ucost_data['ely'][ycase] * REP * c_ely
+    return (capex * (F_CR + F_MAINT) + plant_opex(flows, transport_cost_per_tonne, dem)) * 1e6 / dem
+
+
+def _storage_hours(profiles, cf, solar_shares):
+    # Cumulative residual of a mean-normalised generation mix against flat
+    # load; its range is the storage (in hours of mean load) needed to
+    # serve that load without curtailment or grid import.
+    safe_cf = np.where(cf > 0, cf, 1.0)
+    norm = profiles / safe_cf[:, None, :]                         # (n, 8760, 2)
+    a = solar_shares[None, :, None]
+    gen = a * norm[:, None, :, 0] + (1 - a) * norm[:, None, :, 1]   # (n, k, 8760)
+    residual = np.cumsum(gen - 1.0, axis=2)
+    hours = residual.max(axis=2) - residual.min(axis=2)
+
+    # Mixes relying on a source that never generates at the site are infeasible
+    infeasible = ((cf[:, [0]] <= 0) & (solar_shares > 0)) | ((cf[:, [1]] <= 0) & (solar_shares < 1))
+    return np.where(infeasible, np.nan, hours)
+
+
+def screen_sites(profiles, sites, transport_cost_per_tonne=0.0, ycase='YCurrent', scase='S1',
+                 n_mix=11, chunk_size=64):
+    # profiles: (n_sites x 8760 x 2) array, e.g. the memory-mapped profile store
+    profiles = np.asarray(profiles)
+    n_sites = profiles.shape[0]
+    if len(sites) != n_sites:
+        raise ValueError(f"{len(sites)} site names for {n_sites} profiles")
+    transport = np.broadcast_to(np.asarray(transport_cost_per_tonne, dtype=np.float64), (n_sites,))
+
+    energy, p_ely_dc = energy_per_tonne(ycase, scase)
+    E = energy * DEM_SFS  # MWh / year
+    solar_shares = np.linspace(0, 1, n_mix)
+    vre_ucost = np.array([ucost_data['s'][ycase], ucost_data['w'][ycase]])
+    mwh_per_t_H2 = ely_values[ycase] * (1 + 1 / EFF_INV)
+
+    cf = np.empty((n_sites, 2))
+    corr = np.empty(n_sites)
+    storage = np.empty((n_sites, n_mix))
+    for start in range(0, n_sites, chunk_size):
+        block = np.asarray(profiles[start:start + chunk_size], dtype=np.float64)
+        block_cf = block.mean(axis=1)
+        cf[start:start + len(block)] = block_cf
+
+        centred = block - block_cf[:, None, :]
+        std = np.sqrt((centred**2).mean(axis=1))
+        cov = (centred[:, :, 0] * centred[:, :, 1]).mean(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr[start:start + len(block)] = cov / (std[:, 0] * std[:, 1])
+        storage[start:start + len(block)] = _storage_hours(block, block_cf, solar_shares)
+
+    # $ million / year of VRE for each mix (capex per MWh/year of output,
+    # infinite where the source never generates) ...
+    a = solar_shares[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit_vre = np.where(cf > 0, vre_ucost / (cf * HOURS_PER_YEAR), np.inf)
+        vre_cost = E * (F_CR + F_MAINT) * (np.where(a > 0, a * unit_vre[:, [0]], 0) +
+                                            np.where(a < 1, (1 - a) * unit_vre[:, [1]], 0))
+
+    # ... and of CGH2 storage holding the residual as hydrogen
+    storage_cost = storage * E / HOURS_PER_YEAR / mwh_per_t_H2 * CGH2_STORAGE_UCOST * (F_CR + F_MAINT)
+    storage_cost = np.nan_to_num(storage_cost, nan=np.inf)
+
+    best = np.argmin(vre_cost + storage_cost, axis=1)
+    rows = np.arange(n_sites)
+    fixed = np.array([plant_cost_per_tonne(ycase, scase, t) for t in transport])
+
+    df = pd.DataFrame({
+        'City': list(sites),
+        'Ycase': ycase,
+        'Scase': scase,
+        'CF_solar': cf[:, 0],
+        'CF_wind': cf[:, 1],
+        'Corr_solar_wind': corr,
+        'Best_solar_share': solar_shares[best],
+        'Storage_proxy_h': storage[rows, best],
+        'LCOS_no_storage_estimate': fixed + vre_cost.min(axis=1) * 1e6 / DEM_SFS,
+        'LCOS_estimate': fixed + (vre_cost + storage_cost)[rows, best] * 1e6 / DEM_SFS,
+    })
+    df = df.sort_values('LCOS_estimate', kind='stable').reset_index(drop=True)
+    df['Rank'] = np.arange(1, n_sites + 1)
+    return df
+
+
+def top_sites(screen, n):
+    return screen.nsmallest(n, 'LCOS_estimate')['City'].tolist()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank sites in the profile store before full LP solves")
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA, help="Per-city ore transport costs")
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--out', default='site_screening.csv')
+    args = parser.parse_args()
+
+    profiles, rows = open_profile_store(args.store_dir, args.year)
+    sites = sorted(rows, key=rows.get)
+    metadata = read_site_metadata(args.metadata)
+    transport = dict(zip(metadata['City'], metadata['TransportCost_USD_per_t']))
+    missing = [site for site in sites if site not in transport]
+    if missing:
+        raise ValueError(f"No transport cost in {args.metadata} for {missing}")
+    screen = screen_sites(profiles, sites, [transport[site] for site in sites], ycase=args.ycase, scase=args.scase)
+    screen.to_csv(args.out, index=False)
+    print(screen.head(args.top).to_string(index=False))
+    print(f"\n Screening of {len(sites)} sites saved to '{args.out}'.")
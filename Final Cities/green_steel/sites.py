@@ -0,0 +1,74 @@
+import os
+import re
+
+import pandas as pd
+
+# ======================
+# SITE DISCOVERY
+# ======================
+# A site is any <Site>_<year>.csv profile found under a profiles directory,
+# joined to a metadata table (cities.csv) giving at least its ore transport
+# cost. Alternatively a manifest CSV lists City, Profile and
+# TransportCost_USD_per_t explicitly. Adding a site is then a data change.
+
+CITIES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_METADATA = os.path.join(CITIES_DIR, 'cities.csv')
+PROFILE_PATTERN = re.compile(r'^(?P<site>.+)_(?P<year>\d{4})\.csv$')
+SITE_COLUMNS = ['City', 'Province', 'TransportCost_USD_per_t', 'WeatherYear', 'Profile']
+
+
+def scan_profiles(profiles_dir=CITIES_DIR, year=None):
+    # All <Site>_<year>.csv files below profiles_dir (optionally one year only)
+    found = []
+    for root, dirs, files in os.walk(profiles_dir):
+        dirs.sort()
+        for name in sorted(files):
+            match = PROFILE_PATTERN.match(name)
+            if match is None or (year is not None and int(match.group('year')) != year):
+                continue
+            found.append({'City': match.group('site'),
+                          'WeatherYear': int(match.group('year')),
+                          'Profile': os.path.join(root, name)})
+    return pd.DataFrame(found, columns=['City', 'WeatherYear', 'Profile'])
+
+
+def read_site_metadata(path=DEFAULT_METADATA):
+    metadata = pd.read_csv(path)
+    if 'City' not in metadata.columns or 'TransportCost_USD_per_t' not in metadata.columns:
+        raise ValueError(f"{path}: expected at least City and TransportCost_USD_per_t columns")
+    metadata['City'] = metadata['City'].astype(str).str.strip()
+    if metadata['City'].duplicated().any():
+        raise ValueError(f"{path}: duplicate cities {sorted(metadata['City'][metadata['City'].duplicated()])}")
+    if 'Province' not in metadata.columns:
+        metadata['Province'] = ''
+    return metadata
+
+
+def read_manifest(path):
+    manifest = read_site_metadata(path)
+    if 'Profile' not in manifest.columns:
+        raise ValueError(f"{path}: a manifest needs a Profile column")
+    base = os.path.dirname(os.path.abspath(path))
+    manifest['Profile'] = [p if os.path.isabs(p) else os.path.join(base, p) for p in manifest['Profile']]
+    if 'WeatherYear' not in manifest.columns:
+        years = [PROFILE_PATTERN.match(os.path.basename(p)) for p in manifest['Profile']]
+        manifest['WeatherYear'] = [int(m.group('year')) if m else None for m in years]
+    return manifest[SITE_COLUMNS]
+
+
+def discover_sites(profiles_dir=CITIES_DIR, metadata_path=DEFAULT_METADATA, year=2019, manifest=None):
+    if manifest is not None:
+        sites = read_manifest(manifest)
+    else:
+        profiles = scan_profiles(profiles_dir, year)
+        metadata = read_site_metadata(metadata_path)
+        sites = profiles.merge(metadata, on='City', how='left')
+        missing = sorted(sites.loc[sites['TransportCost_USD_per_t'].isna(), 'City'])
+        if missing:
+            raise ValueError(f"No transport cost in {metadata_path} for: {', '.join(missing)}")
+        sites = sites[SITE_COLUMNS]
+
+    duplicated = sites['City'][sites.duplicated(['City', 'WeatherYear'])]
+    if len(duplicated):
+        raise ValueError(f"More than one profile for: {', '.join(sorted(set(duplicated)))}")
+    return sites.sort_values(['City', 'WeatherYear']).reset_index(drop=True)
@@ -0,0 +1,80 @@
+import json
+import os
+
+from green_steel.sites import CITIES_DIR
+
+# ======================
+# SOLVER PROFILES
+# ======================
+# Named option sets per solver family. 'fast-screening' trades a little
+# precision for speed (barrier, no crossover, relaxed tolerances);
+# 'publication' tightens tolerances and keeps crossover so reported
+# numbers come from a basic solution. Profiles saved by the tuning harness
+# live in solver_profiles.json and extend (or override) the built-in ones.
+
+DEFAULT_PROFILE = 'default'
+USER_PROFILES_PATH = os.path.join(CITIES_DIR, 'solver_profiles.json')
+
+SOLVER_PROFILES = {
+    'default': {
+        'gurobi': {},
+        'highs': {},
+    },
+    'fast-screening': {
+        'gurobi': {'Method': 2, 'Crossover': 0, 'BarConvTol': 1e-5,
+                   'FeasibilityTol': 1e-5, 'OptimalityTol': 1e-5},
+        'highs': {'solver': 'ipm', 'run_crossover': 'off', 'ipm_optimality_tolerance': 1e-5,
+                  'primal_feasibility_tolerance': 1e-5, 'dual_feasibility_tolerance': 1e-5},
+    },
+    'publication': {
+        'gurobi': {'Method': 2, 'Crossover': 1, 'BarConvTol': 1e-10, 'NumericFocus': 1,
+                   'FeasibilityTol': 1e-9, 'OptimalityTol': 1e-9},
+        'highs': {'solver': 'ipm', 'run_crossover': 'on', 'ipm_optimality_tolerance': 1e-10,
+                  'primal_feasibility_tolerance': 1e-9, 'dual_feasibility_tolerance': 1e-9},
+    },
+}
+
+
+def solver_family(solver_name):
+    # 'gurobi', 'gurobi_direct', 'appsi_gurobi', ... -> 'gurobi'
+    name = solver_name.lower()
+    for family in ('gurobi', 'highs'):
+        if family in name:
+            return family
+    return name
+
+
+def load_user_profiles(path=USER_PROFILES_PATH):
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def available_profiles(path=USER_PROFILES_PATH):
+    profiles = {name: dict(by_family) for name, by_family in SOLVER_PROFILES.items()}
+    for name, by_family in load_user_profiles(path).items():
+        profiles.setdefault(name, {}).update(by_family)
+    return profiles
+
+
+def solver_options(profile, solver_name, path=USER_PROFILES_PATH):
+    # Option dict for solver.solve(options=...) under the named profile
+    profiles = available_profiles(path)
+    if profile not in profiles:
+        raise ValueError(f"Unknown solver profile '{profile}'; choose from {sorted(profiles)}")
+    family = solver_family(solver_name)
+    if family not in profiles[profile]:
+        if profile == DEFAULT_PROFILE:
+            return {}
+        raise ValueError(f"Solver profile '{profile}' has no options for {solver_name}")
+    return dict(profiles[profile][family])
+
+
+def save_user_profile(profile, solver_name, options, path=USER_PROFILES_PATH):
+    # Adds (or replaces) one family's options under a named profile
+    profiles = load_user_profiles(path)
+    profiles.setdefault(profile, {})[solver_family(solver_name)] = options
+    with open(path, 'w') as f:
+        json.dump(profiles, f, indent=2, sort_keys=True)
+    return path
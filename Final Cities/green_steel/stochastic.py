@@ -0,0 +1,287 @@
+import argparse
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.model import (F_SCRAP, ROM_GRADE, create_complete_green_steel_model, extract_results,
+                               initialize_model_parameters, solve_model)
+from green_steel.profiles import HOURS_PER_YEAR, load_vre_profile
+from green_steel.validation import FIRST_STAGE, compare_to_estimate, reduced_estimate, redispatch
+from green_steel.weather_years import find_weather_year_profiles
+
+# ======================
+# TWO-STAGE STOCHASTIC CAPACITY (PROGRESSIVE HEDGING)
+# ======================
+# Weather years are equally likely scenarios. Capacities are first-stage
+# decisions shared by every scenario; hourly dispatch is second stage.
+# Progressive hedging solves one ordinary single-year LP per scenario per
+# iteration, adding w.x + rho/2 |x - xbar|^2 on the first-stage variables
+# (in units of their first-iteration average), until the scenario designs
+# agree. Each weather year is pinned to one worker process for the whole
+# run (one single-process pool per worker), which keeps that year's model
+# and solver between iterations: only the ph_w and ph_xbar Params change
+# from one iteration to the next, and a persistent solver re-solves from
+# the model it already holds. Each process keeps at most max_resident
+# models (least recently used ones are dropped and rebuilt when next
+# needed), so at most workers x max_resident year models are in memory at
+# once; set max_resident to at least ceil(years / workers) to keep every
+# model between iterations. The proximal term makes the subproblems QPs,
+# so the solver must accept a convex quadratic objective (gurobi; HiGHS's
+# QP solver stalls on these degenerate models). With linearize=True the
+# square is replaced by its tangents at +-PROXIMAL_BREAKPOINTS (exact at
+# those deviations, below the square in between), which keeps every
+# subproblem an LP for any LP solver.
+#
+# The reported design is xbar. It is evaluated year by year through
+# validation.redispatch: capacities fixed and steel demand soft, so a year
+# the consensus plant cannot serve (grid import is ruled out by
+# renewable_share) reports its unserved steel instead of failing.
+
+DEFAULT_RHO = 1000.0  # $/t steel per (relative deviation from xbar)^2
+PH_TOLERANCE = 1e-3  # Mean relative distance of the scenario designs from xbar
+MAX_PH_ITERATIONS = 50
+MAX_RESIDENT_MODELS = 4  # Scenario models kept per process
+PROXIMAL_BREAKPOINTS = (0.003, 0.01, 0.03, 0.1, 0.3, 1.0)  # Relative deviations of the linearised proximal term
+
+# Scenario models of this process, each with its solver, least recently
+# used first: {key: (model, solver)}
+_scenario_cache = OrderedDict()
+
+
+def _build_scenario(path, ycase, scase, transport_cost_per_tonne, n_hours, linearize):
+    # n_hours < HOURS_PER_YEAR: the first n_hours of each year, f_t scaled
+    model = create_complete_green_steel_model(
+        ycase=ycase,
+        scase=scase,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[scase],
+        f_t=n_hours / HOURS_PER_YEAR,
+        transport_cost_per_tonne=transport_cost_per_tonne,
+        n_hours=n_hours,
+    )
+    initialize_model_parameters(model, ycase, scase, load_vre_profile(path)[:n_hours])
+
+    model.FS = pyo.Set(initialize=list(FIRST_STAGE))
+    model.ph_w = pyo.Param(model.FS, mutable=True, initialize=0.0)
+    model.ph_xbar = pyo.Param(model.FS, mutable=True, initialize=0.0)
+    model.ph_scale = pyo.Param(model.FS, mutable=True, initialize=1.0)
+    model.ph_rho = pyo.Param(mutable=True, initialize=0.0)
+
+    def deviation(m, i):
+        return FIRST_STAGE[i](m) / m.ph_scale[i] - m.ph_xbar[i]
+
+    if linearize:
+        # ph_q[i] >= deviation^2 through its tangents 2 a d - a^2
+        model.PH_A = pyo.Set(initialize=[-a for a in reversed(PROXIMAL_BREAKPOINTS)] + list(PROXIMAL_BREAKPOINTS))
+        model.ph_q = pyo.Var(model.FS, within=pyo.NonNegativeReals)
+        model.ph_tangent = pyo.Constraint(model.FS, model.PH_A,
+                                          rule=lambda m, i, a: m.ph_q[i] >= 2 * a * deviation(m, i) - a ** 2)
+
+    def rule_ph_obj(m):
+        proximal = sum(m.ph_q[i] if linearize else deviation(m, i) ** 2 for i in m.FS)
+        return (m.obj.expr
+                + sum(m.ph_w[i] * FIRST_STAGE[i](m) / m.ph_scale[i] for i in m.FS)
+                + m.ph_rho / 2 * proximal)
+    model.ph_obj = pyo.Objective(rule=rule_ph_obj, sense=pyo.minimize)
+    model.ph_obj.deactivate()
+    return model
+
+
+def _scenario_key(path, ycase, scase, transport_cost_per_tonne, solver_name, n_hours, linearize):
+    return path, ycase, scase, transport_cost_per_tonne, solver_name, n_hours, linearize
+
+
+def _scenario_model(key, max_resident):
+    if key in _scenario_cache:
+        _scenario_cache.move_to_end(key)
+    else:
+        while len(_scenario_cache) >= max_resident:
+            _scenario_cache.popitem(last=False)
+        path, ycase, scase, transport_cost_per_tonne, solver_name, n_hours, linearize = key
+        _scenario_cache[key] = (_build_scenario(path, ycase, scase, transport_cost_per_tonne, n_hours, linearize),
+                                pyo.SolverFactory(solver_name))
+    return _scenario_cache[key]
+
+
+def evaluate_design(model, task, solver_name):
+    # Re-dispatch one year with the task's 'fixed' capacities and soft
+    # demand; the results row carries the validation columns against the
+    # year's last PH 'estimate'
+    if model.ph_obj.active:
+        model.ph_obj.deactivate()
+        model.obj.activate()
+    optimal, telemetry = redispatch(model, task['fixed'], solver_name)
+    result = {'Year': task['Year'], 'optimal': optimal, 'telemetry': telemetry}
+    if optimal:
+        result['row'] = extract_results(model)
+        result['row'].update(compare_to_estimate(model, task['estimate'], optimal, telemetry))
+    return result
+
+
+def solve_scenario(task, ycase, scase, transport_cost_per_tonne, solver_name, n_hours=HOURS_PER_YEAR,
+                   max_resident=MAX_RESIDENT_MODELS, linearize=False):
+    # task: {'Year', 'Profile'} plus either PH weights ('w', 'xbar', 'scale',
+    # 'rho') or 'fixed' capacities with their 'estimate'. Returns first-stage
+    # values and cost. scale and rho are constant over a run, so they are
+    # only written when the PH objective is switched on; later iterations
+    # change w and xbar.
+    key = _scenario_key(task['Profile'], ycase, scase, transport_cost_per_tonne, solver_name, n_hours, linearize)
+    model, solver = _scenario_model(key, max_resident)
+    if task.get('fixed') is not None:
+        # redispatch reshapes the model for good, so it leaves the cache
+        del _scenario_cache[key]
+        return evaluate_design(model, task, solver_name)
+
+    use_ph = task.get('rho', 0.0) > 0
+    if use_ph:
+        if not model.ph_obj.active:
+            for i in FIRST_STAGE:
+                model.ph_scale[i] = task['scale'][i]
+            model.ph_rho = task['rho']
+            model.obj.deactivate()
+            model.ph_obj.activate()
+        for i in FIRST_STAGE:
+            model.ph_w[i] = task['w'][i]
+            model.ph_xbar[i] = task['xbar'][i]
+    elif model.ph_obj.active:
+        model.ph_obj.deactivate()
+        model.obj.activate()
+
+    _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, solver=solver)
+    result = {'Year': task['Year'], 'optimal': optimal, 'telemetry': telemetry}
+    if optimal:
+        result['x'] = {i: pyo.value(FIRST_STAGE[i](model)) for i in FIRST_STAGE}
+        result['cost'] = pyo.value(model.obj.expr)
+        result['estimate'] = reduced_estimate(model)
+    return result
+
+
+def _solve_all(tasks, solve, lanes):
+    # lanes: one single-process pool per worker (none: solve in this
+    # process). Task k always goes to lane k % len(lanes), so with the
+    # tasks in year order every year is solved by the same process.
+    if not lanes:
+        results = [solve(task) for task in tasks]
+    else:
+        futures = [lanes[k % len(lanes)].submit(solve, task) for k, task in enumerate(tasks)]
+        results = [future.result() for future in futures]
+    failed = [r['Year'] for r in results if not r['optimal']]
+    if failed:
+        raise ValueError(f"Scenario subproblem(s) for weather year(s) {failed} did not solve to optimality")
+    return results
+
+
+def progressive_hedging(paths_by_year, transport_cost_per_tonne, ycase='YCurrent', scase='S1', rho=DEFAULT_RHO,
+                        tol=PH_TOLERANCE, max_iterations=MAX_PH_ITERATIONS, workers=1, solver_name='gurobi',
+                        n_hours=HOURS_PER_YEAR, max_resident=MAX_RESIDENT_MODELS, linearize=False):
+    # Returns (design {first-stage name: value}, iteration history, per-year results at the design)
+    if not paths_by_year:
+        raise ValueError("No weather-year profiles given")
+    if max_resident < 1:
+        raise ValueError(f"max_resident must be at least 1, got {max_resident}")
+    years = sorted(paths_by_year)
+    prob = 1.0 / len(years)
+    solve = partial(solve_scenario, ycase=ycase, scase=scase, transport_cost_per_tonne=transport_cost_per_tonne,
+                    solver_name=solver_name, n_hours=n_hours, max_resident=max_resident, linearize=linearize)
+    tasks = [{'Year': year, 'Profile': paths_by_year[year]} for year in years]
+
+    with ExitStack() as stack:
+        lanes = [stack.enter_context(ProcessPoolExecutor(max_workers=1))
+                 for _ in range(min(workers, len(years)))] if workers > 1 else []
+        stack.callback(_scenario_cache.clear)  # Serial runs cache in this process
+        # Iteration 0: independent designs
+        results = _solve_all(tasks, solve, lanes)
+        x = {r['Year']: r['x'] for r in results}
+        xbar = {i: prob * sum(x[year][i] for year in years) for i in FIRST_STAGE}
+        scale = {i: max(abs(xbar[i]), 1.0) for i in FIRST_STAGE}
+        w = {year: {i: rho * (x[year][i] - xbar[i]) / scale[i] for i in FIRST_STAGE} for year in years}
+
+        def distance():
+            return prob * sum(abs(x[year][i] - xbar[i]) / scale[i] for year in years for i in FIRST_STAGE) \
+                / len(FIRST_STAGE)
+
+        history = [{'Iteration': 0, 'Distance': distance(),
+                    'Expected_cost_per_tonne': prob * sum(r['cost'] for r in results), **xbar}]
+        print(f" PH iteration 0: distance {history[-1]['Distance']:.2e}", flush=True)
+
+        iteration = 0
+        while history[-1]['Distance'] >= tol and iteration < max_iterations:
+            iteration += 1
+            ph_tasks = [dict(task, w=w[task['Year']], xbar={i: xbar[i] / scale[i] for i in FIRST_STAGE},
+                             scale=scale, rho=rho) for task in tasks]
+            results = _solve_all(ph_tasks, solve, lanes)
+            x = {r['Year']: r['x'] for r in results}
+            xbar = {i: prob * sum(x[year][i] for year in years) for i in FIRST_STAGE}
+            for year in years:
+                for i in FIRST_STAGE:
+                    w[year][i] += rho * (x[year][i] - xbar[i]) / scale[i]
+            history.append({'Iteration': iteration, 'Distance': distance(),
+                            'Expected_cost_per_tonne': prob * sum(r['cost'] for r in results), **xbar})
+            print(f" PH iteration {iteration}: distance {history[-1]['Distance']:.2e}", flush=True)
+        if history[-1]['Distance'] >= tol:
+            print(f" PH stopped after {max_iterations} iterations without reaching tolerance {tol:g}")
+
+        # Expected cost and unserved steel of the consensus design, one year at a time
+        estimates = {r['Year']: dict(r['estimate'], capacities=xbar) for r in results}
+        results = _solve_all([dict(task, fixed=xbar, estimate=estimates[task['Year']]) for task in tasks],
+                             solve, lanes)
+        rows = []
+        for r in results:
+            row = r['row']
+            row['WeatherYear'] = r['Year']
+            row.update(r['telemetry'])
+            rows.append(row)
+        scenarios = pd.DataFrame(rows)
+        # Per tonne served, so a year the design cannot fully serve does not lower it
+        scenarios['Expected_cost_per_tonne'] = float(np.mean(scenarios['Full_cost_per_tonne']))
+        scenarios['Expected_penalised_cost_per_tonne'] = float(np.mean(scenarios['Full_penalised_cost_per_tonne']))
+        scenarios['Expected_unserved_steel_t'] = float(np.mean(scenarios['Unserved_steel_t']))
+    return xbar, pd.DataFrame(history), scenarios
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Size one site across weather years by progressive hedging")
+    parser.add_argument('site_dir', help="Folder holding <Site>_<year>.csv profiles")
+    parser.add_argument('--transport-cost', type=float, required=True, help="Ore transport cost ($/t)")
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--years', nargs='*', type=int, default=None)
+    parser.add_argument('--rho', type=float, default=DEFAULT_RHO)
+    parser.add_argument('--tol', type=float, default=PH_TOLERANCE)
+    parser.add_argument('--max-iterations', type=int, default=MAX_PH_ITERATIONS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--solver', default='gurobi', help="Must accept a quadratic objective unless --linearize")
+    parser.add_argument('--linearize', action='store_true', help="Linearised proximal term (LP subproblems)")
+    parser.add_argument('--hours', type=int, default=HOURS_PER_YEAR, help="Solve the first N hours of each year")
+    parser.add_argument('--max-resident', type=int, default=MAX_RESIDENT_MODELS,
+                        help="Scenario models kept in memory per worker")
+    args = parser.parse_args()
+
+    site_dir = os.path.abspath(args.site_dir)
+    site = os.path.basename(site_dir)
+    paths = find_weather_year_profiles(site_dir, site)
+    if args.years:
+        missing = sorted(set(args.years) - set(paths))
+        if missing:
+            raise ValueError(f"No profile for {site} in year(s) {missing}")
+        paths = {year: paths[year] for year in args.years}
+    design, history, scenarios = progressive_hedging(paths, args.transport_cost, args.ycase, args.scase, args.rho,
+                                                     args.tol, args.max_iterations, args.workers, args.solver,
+                                                     args.hours, args.max_resident, args.linearize)
+
+    for name, value in design.items():
+        print(f"  {name}: {value:,.2f}")
+    print(f"  Expected cost per tonne: ${scenarios['Expected_cost_per_tonne'].iloc[0]:,.2f}")
+    print(f"  Expected cost with the unserved steel penalty: "
+          f"${scenarios['Expected_penalised_cost_per_tonne'].iloc[0]:,.2f}")
+    print(f"  Expected unserved steel: {scenarios['Expected_unserved_steel_t'].iloc[0]:,.0f} t")
+    tag = f'{site}_{args.ycase}_{args.scase}'
+    scenarios.to_csv(os.path.join(site_dir, f'stochastic_results_{tag}.csv'), index=False)
+    history.to_csv(os.path.join(site_dir, f'stochastic_ph_iterations_{tag}.csv'), index=False)
+    print(f"\n Stochastic results saved to '{site_dir}'.")
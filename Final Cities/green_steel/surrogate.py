@@ -0,0 +1,259 @@
+import argparse
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from green_steel.fingerprints import FINGERPRINT_COLUMN
+from green_steel.model import F_SCRAP, ROM_GRADE, SCASES, YCASES, FC_values, ely_values, ucost_data
+from green_steel.runner import DEFAULT_RESULTS_DIR, build_jobs, job_profile, read_results_store
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.warm_start import profile_features
+
+# ======================
+# SURROGATE COST MODEL
+# ======================
+# Predicts a scenario's cost-optimal results from its inputs without
+# solving: profile_features of the VRE profile, the transport cost, the
+# Ycase unit costs and efficiencies, the scrap fraction and the ore grade
+# (plus the inverse capacity factors, which VRE cost scales with). Each
+# target is a ridge regression on standardised features, fitted from the
+# weighted normal equations X'WX and X'WY alone, so newly solved rows are
+# added without revisiting old ones and refitting is one small solve. Each
+# row's features and targets are kept too: when a scenario comes back with
+# a new fingerprint (re-solved with changed inputs), its superseded row's
+# contribution is subtracted before the new one is added.
+#
+# Uncertainty comes from online bagging: every member sees each row with
+# a Poisson(1) weight drawn from the row's key, and the spread of the
+# members is combined with the out-of-bag error: each row's residual
+# against the members that drew weight 0 for it, taken when it is added.
+# Everything is NumPy on the CPU.
+
+SURROGATE_TARGETS = ['Cost_per_tonne', 'Solar', 'Wind', 'Electrolyzer', 'FuelCell', 'EAF',
+                     'Battery_storage_capacity_MWh', 'Total_Land_km2']
+NON_NEGATIVE_TARGETS = SURROGATE_TARGETS[1:]
+N_MEMBERS = 16
+DEFAULT_RIDGE = 1e-2  # Penalty per row on each standardised coefficient
+MIN_CF = 0.01  # Floor on the capacity factors inverted as features
+DEFAULT_SURROGATE_PATH = os.path.join(DEFAULT_RESULTS_DIR, 'surrogate.npz')  # Generated, so kept out of git
+
+
+def scenario_features(features, transport_cost_per_tonne, ycase, scase):
+    # profile_features output -> full feature vector of one scenario
+    cf = np.maximum(features[:2], MIN_CF)
+    return np.concatenate([
+        features,
+        1 / cf,
+        [transport_cost_per_tonne],
+        [ucost_data[tech][ycase] for tech in ('s', 'w', 'bat', 'ely', 'FC')],
+        [ely_values[ycase], FC_values[ycase], F_SCRAP[scase], ROM_GRADE],
+    ])
+
+
+def new_surrogate(n_features, n_members=N_MEMBERS, ridge=DEFAULT_RIDGE):
+    p = n_features + 1  # Intercept first
+    n_targets = len(SURROGATE_TARGETS)
+    return {
+        'A': np.zeros((n_members, p, p)),
+        'b': np.zeros((n_members, p, n_targets)),
+        'coef': np.zeros((n_members, p, n_targets)),
+        'ridge': np.float64(ridge),
+        'keys': np.array([], dtype=str),
+        'scenarios': np.array([], dtype=str),
+        'X': np.zeros((0, n_features)),
+        'Y': np.zeros((0, n_targets)),
+        'oob_sq_err': np.zeros((0, n_targets)),  # NaN where every member drew the row
+    }
+
+
+def _fit(state):
+    # Ridge on standardised features, from the weighted moments alone
+    A, b = state['A'], state['b']
+    coef = np.zeros_like(b)
+    for k in range(len(A)):
+        n = A[k, 0, 0]
+        if n <= 0:
+            continue
+        mean = A[k, 0, 1:] / n
+        var = np.diag(A[k])[1:] / n - mean**2
+        var[var <= 1e-12] = 1.0
+        penalty = np.diag(np.concatenate([[0.0], state['ridge'] * n * var]))
+        coef[k] = np.linalg.lstsq(A[k] + penalty, b[k], rcond=None)[0]
+    state['coef'] = coef
+
+
+def _member_predictions(state, X):
+    Xa = np.hstack([np.ones((len(X), 1)), X])
+    return np.einsum('np,kpt->knt', Xa, state['coef'])
+
+
+def _bag_weights(keys, n_members):
+    # (members x rows) Poisson(1) weights, fixed by each row's key
+    return np.stack([np.random.default_rng(zlib.crc32(str(key).encode())).poisson(1.0, n_members) for key in keys],
+                    axis=1).astype(np.float64)
+
+
+def _accumulate(state, X, Y, W):
+    # Add (W > 0) or, with negative W, subtract rows from the normal equations
+    Xa = np.hstack([np.ones((len(X), 1)), X])
+    state['A'] = state['A'] + np.einsum('kn,np,nq->kpq', W, Xa, Xa)
+    state['b'] = state['b'] + np.einsum('kn,np,nt->kpt', W, Xa, Y)
+
+
+def oob_mse(state):
+    # Mean squared out-of-bag error per target (0 before any row has one)
+    counted = np.isfinite(state['oob_sq_err']).all(axis=1)
+    if not counted.any():
+        return np.zeros(len(SURROGATE_TARGETS))
+    return state['oob_sq_err'][counted].mean(axis=0)
+
+
+def predict(state, X):
+    # X: (n x features) -> (mean, std), each (n x targets) in SURROGATE_TARGETS order
+    members = _member_predictions(state, np.atleast_2d(X))
+    mean = members.mean(axis=0)
+    std = np.sqrt(members.var(axis=0) + oob_mse(state))
+    clip = [SURROGATE_TARGETS.index(t) for t in NON_NEGATIVE_TARGETS]
+    mean[:, clip] = np.maximum(mean[:, clip], 0.0)
+    return mean, std
+
+
+def update_surrogate(state, X, Y, keys, scenarios=None):
+    # Add solved rows not seen before; returns how many were added. A row
+    # whose scenario is already known under another key replaces that row.
+    # scenarios defaults to the keys (no row is ever superseded).
+    if X.shape[1] + 1 != state['A'].shape[1]:
+        raise ValueError(f"Surrogate expects {state['A'].shape[1] - 1} features, got {X.shape[1]}")
+    keys = np.asarray(keys)
+    scenarios = keys if scenarios is None else np.asarray(scenarios)
+    new = ~np.isin(keys, state['keys']) & np.isfinite(Y).all(axis=1)
+    for labels in (keys, scenarios):
+        _, first = np.unique(labels, return_index=True)
+        new &= np.isin(np.arange(len(labels)), first)
+    X, Y, keys, scenarios = X[new], Y[new], keys[new], scenarios[new]
+    if len(keys) == 0:
+        return 0
+
+    n_members = len(state['A'])
+    old = np.isin(state['scenarios'], scenarios)
+    if old.any():
+        _accumulate(state, state['X'][old], state['Y'][old], -_bag_weights(state['keys'][old], n_members))
+        for name in ('keys', 'scenarios', 'X', 'Y', 'oob_sq_err'):
+            state[name] = state[name][~old]
+
+    W = _bag_weights(keys, n_members)
+    _accumulate(state, X, Y, W)
+    _fit(state)
+
+    # Out-of-bag error: each new row against the members that did not draw it
+    out = (W == 0).astype(np.float64)
+    n_out = out.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        oob = np.einsum('kn,knt->nt', out, _member_predictions(state, X)) / n_out[:, None]
+    sq_err = np.where(n_out[:, None] > 0, (oob - Y)**2, np.nan)
+
+    state['keys'] = np.concatenate([state['keys'], keys.astype(str)])
+    state['scenarios'] = np.concatenate([state['scenarios'], scenarios.astype(str)])
+    state['X'] = np.vstack([state['X'], X])
+    state['Y'] = np.vstack([state['Y'], Y])
+    state['oob_sq_err'] = np.vstack([state['oob_sq_err'], sq_err])
+    return len(keys)
+
+
+def save_surrogate(state, path=DEFAULT_SURROGATE_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez(path, **state)
+
+
+def load_surrogate(path=DEFAULT_SURROGATE_PATH):
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _site_features(sites, store_dir=None):
+    # {(City, WeatherYear): profile_features}
+    features = {}
+    for site in sites.to_dict('records'):
+        job = {'City': site['City'], 'WeatherYear': site['WeatherYear'], 'Profile': site['Profile']}
+        features[(site['City'], site['WeatherYear'])] = profile_features(job_profile(job, store_dir))
+    return features
+
+
+def training_rows(sites, out_dir=None, store_dir=None):
+    # (X, Y, keys, scenarios) from every cost-objective row in the results
+    # store. Rows are keyed by input fingerprint, so a re-solve with changed
+    # inputs replaces its scenario's row; rows from before fingerprints use
+    # their scenario instead.
+    rows = [r for r in read_results_store(sites, out_dir) if r.get('Objective', 'cost') == 'cost']
+    if not rows:
+        empty = np.array([], dtype=str)
+        return np.empty((0, 0)), np.empty((0, len(SURROGATE_TARGETS))), empty, empty
+    features = _site_features(sites, store_dir)
+    transport = dict(zip(sites['City'], sites['TransportCost_USD_per_t']))
+    X = np.vstack([scenario_features(features[(r['City'], r['WeatherYear'])], transport[r['City']], r['Ycase'],
+                                     r['Scase']) for r in rows])
+    Y = np.array([[r.get(t, np.nan) for t in SURROGATE_TARGETS] for r in rows], dtype=np.float64)
+    scenarios = np.array([f"{r['City']}|{r['WeatherYear']}|{r['Ycase']}|{r['Scase']}" for r in rows])
+    keys = np.array([r[FINGERPRINT_COLUMN] if isinstance(r.get(FINGERPRINT_COLUMN), str) else scenario
+                     for r, scenario in zip(rows, scenarios)])
+    return X, Y, keys, scenarios
+
+
+def predict_sites(state, sites, ycases=YCASES, scases=SCASES, store_dir=None, transport_cost_per_tonne=None):
+    # One row per (site, Ycase, Scase) with each target and its std.
+    # transport_cost_per_tonne overrides every site's own (for what-ifs).
+    jobs = build_jobs(sites, ycases, scases)
+    features = _site_features(sites, store_dir)
+    X = np.vstack([scenario_features(features[(job['City'], job['WeatherYear'])],
+                                     job['TransportCost_USD_per_t'] if transport_cost_per_tonne is None
+                                     else transport_cost_per_tonne, job['Ycase'], job['Scase']) for job in jobs])
+    mean, std = predict(state, X)
+    df = pd.DataFrame([{k: job[k] for k in ('City', 'WeatherYear', 'Ycase', 'Scase')} for job in jobs])
+    for i, target in enumerate(SURROGATE_TARGETS):
+        df[target] = mean[:, i]
+        df[f'{target}_std'] = std[:, i]
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the surrogate on solved results, or predict with it")
+    parser.add_argument('action', choices=['update', 'predict'])
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--ycases', nargs='*', default=YCASES)
+    parser.add_argument('--scases', nargs='*', default=SCASES)
+    parser.add_argument('--transport-cost', type=float, default=None, help="Override every site's ($/t)")
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR,
+                        help="Folder of the results CSVs written by green_steel.runner")
+    parser.add_argument('--in-place', action='store_true',
+                        help="Train on the committed results next to each site's profile instead")
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--model', default=DEFAULT_SURROGATE_PATH)
+    parser.add_argument('--out', default='surrogate_predictions.csv')
+    args = parser.parse_args()
+    results_dir = None if args.in_place else args.results_dir
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+
+    if args.action == 'update':
+        X, Y, keys, scenarios = training_rows(sites, results_dir, args.store_dir)
+        if len(keys) == 0:
+            raise SystemExit("No solved results to train on")
+        state = load_surrogate(args.model) if os.path.isfile(args.model) else new_surrogate(X.shape[1])
+        added = update_surrogate(state, X, Y, keys, scenarios)
+        save_surrogate(state, args.model)
+        print(f" Added {added} new rows ({len(state['keys'])} in total); surrogate saved to '{args.model}'.")
+        for target, value in zip(SURROGATE_TARGETS, np.sqrt(oob_mse(state))):
+            print(f"  {target}: out-of-bag RMSE {value:,.3f}")
+    else:
+        state = load_surrogate(args.model)
+        predictions = predict_sites(state, sites, args.ycases, args.scases, args.store_dir, args.transport_cost)
+        predictions.to_csv(args.out, index=False)
+        print(predictions.head(10).to_string(index=False, float_format='%.2f'))
+        print(f"\n Predictions for {len(predictions)} scenarios saved to '{args.out}'.")
@@ -0,0 +1,133 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.model import extract_results, solve_model
+from green_steel.profile_store import DEFAULT_STORE_DIR, open_grid_prices, store_grid_prices
+from green_steel.runner import build_job_model, build_jobs
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+
+# ======================
+# HOURLY GRID TARIFFS
+# ======================
+# P_grid_import is priced hour by hour through model.grid_price_t ($/MWh,
+# like the series in the profile store). A price series is written
+# straight into the mutable Param, so on a persistent
+# (appsi_*) solver a new series only changes objective coefficients: the
+# model is built and loaded once and every further price year is a
+# re-solve from the previous basis.
+#
+# In the base model renewable_share forces grid import to 0 whatever the
+# price, so every series would give the same design. Tariff studies lower
+# model.min_renewable_share (default 0: no renewable requirement) so that
+# imports are actually priced (energy_adequacy still makes VRE plus imports
+# cover consumption); 1.0 restores the base model's rule.
+
+DEFAULT_TARIFF_SOLVER = 'appsi_highs'
+DEFAULT_MIN_RENEWABLE_SHARE = 0.0
+
+
+def set_grid_prices(model, prices):
+    # prices: hourly $/MWh covering the model horizon
+    prices = np.asarray(prices, dtype=np.float64)
+    hours = list(model.T)
+    if prices.shape != (len(hours),):
+        raise ValueError(f"Grid price series has shape {prices.shape}; the model horizon is {len(hours)} hours")
+    if not np.isfinite(prices).all():
+        raise ValueError("Grid price series contains missing or non-finite values")
+    model.grid_price_t.store_values(dict(zip(hours, prices.tolist())), check=False)
+
+
+def set_min_renewable_share(model, share):
+    # Share of consumption plus imports that must come from VRE (renewable_share)
+    if not 0.0 <= share <= 1.0:
+        raise ValueError(f"Minimum renewable share must lie in [0, 1], got {share}")
+    model.min_renewable_share.set_value(float(share))
+
+
+def restrict_to_param_updates(solver):
+    # After the first solve nothing but mutable Param values changes, so the
+    # persistent solver can skip its scan for new or modified components
+    config = getattr(solver, 'update_config', None)
+    if config is None:
+        raise ValueError(f"{type(solver).__name__} is not a persistent solver; use an appsi_* solver")
+    config.check_for_new_or_removed_constraints = False
+    config.check_for_new_or_removed_vars = False
+    config.check_for_new_or_removed_params = False
+    config.check_for_new_objective = False
+    config.update_constraints = False
+    config.update_vars = False
+    config.update_named_expressions = False
+    config.update_objective = False
+    config.update_params = True
+
+
+def tariff_study(job, series, solver_name=DEFAULT_TARIFF_SOLVER, store_dir=None, price_store_dir=DEFAULT_STORE_DIR,
+                 min_renewable_share=DEFAULT_MIN_RENEWABLE_SHARE):
+    # One results row per price series, all solved on one persistent model
+    model = build_job_model(job, store_dir)
+    set_min_renewable_share(model, min_renewable_share)
+    price_store = open_grid_prices(price_store_dir)
+    n_hours = len(model.T)
+    solver = pyo.SolverFactory(solver_name)
+    case = f"{job['City']} ({job['Ycase']}, {job['Scase']})"
+
+    rows = []
+    for i, name in enumerate(series):
+        prices = store_grid_prices(price_store, name)[:n_hours]
+        set_grid_prices(model, prices)
+        _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, solver=solver)
+        if not optimal:
+            raise ValueError(f"{case}: grid price series '{name}' ended {telemetry['Solve_termination']}")
+        if i == 0:
+            restrict_to_param_updates(solver)
+
+        imports = np.array([pyo.value(model.P_grid_import[t]) for t in model.T])
+        row = extract_results(model, objective=job['Objective'])
+        row.update({
+            'City': job['City'],
+            'WeatherYear': job['WeatherYear'],
+            'Grid_price_series': name,
+            'Min_renewable_share': min_renewable_share,
+            'Grid_price_avg_USD_per_MWh': float(prices.mean()),
+            'Grid_import_avg_price_USD_per_MWh': float(np.dot(imports, prices) / imports.sum())
+            if imports.sum() > 0 else np.nan,
+            'Grid_cost_mUSD': pyo.value(model.T_grid_cost),
+            'Solve_wall_time_s': telemetry['Solve_wall_time_s'],
+            'Solve_simplex_iterations': telemetry['Solve_simplex_iterations'],
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-solve one city across hourly grid price series")
+    parser.add_argument('city')
+    parser.add_argument('--series', nargs='*', default=None, help="Price series names (default: all in the store)")
+    parser.add_argument('--ycase', default='YCurrent')
+    parser.add_argument('--scase', default='S1')
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--solver', default=DEFAULT_TARIFF_SOLVER, help="A persistent (appsi_*) solver")
+    parser.add_argument('--store-dir', default=None, help="Profile store for the VRE profiles")
+    parser.add_argument('--price-store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--min-renewable-share', type=float, default=DEFAULT_MIN_RENEWABLE_SHARE,
+                        help="VRE share of consumption plus imports (1.0 forbids imports, as in the base model)")
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    sites = sites[sites['City'] == args.city]
+    if sites.empty:
+        raise ValueError(f"No {args.year} profile for {args.city}")
+    job = build_jobs(sites, [args.ycase], [args.scase])[0]
+    series = args.series or list(open_grid_prices(args.price_store_dir)[1])
+    results = tariff_study(job, series, args.solver, args.store_dir, args.price_store_dir, args.min_renewable_share)
+
+    out_path = os.path.join(os.path.dirname(job['Profile']),
+                            f'tariff_study_{args.city}_{args.ycase}_{args.scase}.csv')
+    results.to_csv(out_path, index=False)
+    print(f"\n Tariff study saved to '{out_path}'.")
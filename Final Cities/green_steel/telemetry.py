@@ -0,0 +1,151 @@
+import math
+import re
+
+# ======================
+# SOLVER TELEMETRY
+# ======================
+# Per-solve statistics parsed from the solver log instead of streaming it
+# to the console with tee=True. Gurobi and HiGHS logs are understood.
+# The appsi_* and pyomo.contrib.solver interfaces refuse a logfile, so for
+# them the same statistics are read from the underlying highspy or
+# gurobipy model. Anything a solver does not report is left as NaN.
+
+SOLVE_STAT_COLUMNS = [
+    'Solve_termination', 'Solve_wall_time_s', 'Solve_solver_time_s',
+    'Solve_rows', 'Solve_cols', 'Solve_nonzeros',
+    'Solve_presolve_rows_removed', 'Solve_presolve_cols_removed',
+    'Solve_barrier_iterations', 'Solve_crossover_time_s', 'Solve_simplex_iterations', 'Solve_gap',
+]
+
+_GUROBI = {
+    'size': re.compile(r'Optimize a model with (\d+) rows, (\d+) columns and (\d+) nonzeros'),
+    'presolve': re.compile(r'Presolve removed (\d+) rows and (\d+) columns'),
+    'barrier': re.compile(r'Barrier solved model in (\d+) iterations and ([\d.]+) seconds'),
+    'crossover': re.compile(r'Crossover log'),
+    'solved': re.compile(r'Solved in (\d+) iterations and ([\d.]+) seconds'),
+    'gap': re.compile(r'gap ([\d.]+)%'),
+}
+
+# HiGHS 1.15 prints "Presolve reductions:" and "P-D objective error"; the
+# "Reductions:" and "P-D gap" forms matched before are kept. A MIP reports
+# its gap and LP iterations in the closing "Solving report".
+_HIGHS = {
+    'size': re.compile(r'(?:LP|MIP)\s+\S*\s*has (\d+) rows; (\d+) cols; (\d+) nonzeros'),
+    'presolve': re.compile(r'[Rr]eductions: rows \d+\(-(\d+)\); columns \d+\(-(\d+)\)'),
+    'ipm': re.compile(r'IPM\s+iterations:\s*(\d+)'),
+    'simplex': re.compile(r'Simplex\s+iterations:\s*(\d+)'),
+    'mip_simplex': re.compile(r'^\s*LP iterations\s+(\d+)', re.M),
+    'gap': re.compile(r'P-D (?:gap|objective error)\s*:\s*([0-9.eE+-]+)'),
+    'mip_gap': re.compile(r'^\s*Gap\s+([\d.]+)%', re.M),
+}
+
+
+def _last(pattern, text):
+    matches = pattern.findall(text)
+    return matches[-1] if matches else None
+
+
+def parse_solver_log(text):
+    stats = {col: math.nan for col in SOLVE_STAT_COLUMNS[3:]}
+    if not text:
+        return stats
+
+    if 'Gurobi' in text:
+        size = _last(_GUROBI['size'], text)
+        if size:
+            stats['Solve_rows'], stats['Solve_cols'], stats['Solve_nonzeros'] = map(int, size)
+        presolve = _last(_GUROBI['presolve'], text)
+        if presolve:
+            stats['Solve_presolve_rows_removed'], stats['Solve_presolve_cols_removed'] = map(int, presolve)
+        barrier = _last(_GUROBI['barrier'], text)
+        solved = _last(_GUROBI['solved'], text)
+        if barrier:
+            stats['Solve_barrier_iterations'] = int(barrier[0])
+        if solved:
+            # Gurobi's final iteration count includes the barrier iterations
+            stats['Solve_simplex_iterations'] = int(solved[0]) - (int(barrier[0]) if barrier else 0)
+        if barrier and solved and _GUROBI['crossover'].search(text):
+            stats['Solve_crossover_time_s'] = max(float(solved[1]) - float(barrier[1]), 0.0)
+        gap = _last(_GUROBI['gap'], text)
+        if gap:
+            stats['Solve_gap'] = float(gap) / 100
+
+    elif 'HiGHS' in text:
+        size = _last(_HIGHS['size'], text)
+        if size:
+            stats['Solve_rows'], stats['Solve_cols'], stats['Solve_nonzeros'] = map(int, size)
+        presolve = _last(_HIGHS['presolve'], text)
+        if presolve:
+            stats['Solve_presolve_rows_removed'], stats['Solve_presolve_cols_removed'] = map(int, presolve)
+        for key, col in (('ipm', 'Solve_barrier_iterations'), ('simplex', 'Solve_simplex_iterations'),
+                         ('mip_simplex', 'Solve_simplex_iterations')):
+            value = _last(_HIGHS[key], text)
+            if value:
+                stats[col] = int(value)
+        mip_gap = _last(_HIGHS['mip_gap'], text)
+        gap = _last(_HIGHS['gap'], text)
+        if mip_gap:
+            stats['Solve_gap'] = float(mip_gap) / 100
+        elif gap:
+            stats['Solve_gap'] = float(gap)
+
+    return stats
+
+
+def accepts_logfile(solver):
+    # The appsi legacy interface and pyomo.contrib.solver wrappers raise
+    # NotImplementedError on solve(..., logfile=...)
+    return not type(solver).__module__.startswith(('pyomo.contrib.appsi', 'pyomo.contrib.solver'))
+
+
+def solver_api_stats(solver):
+    # Statistics of the last solve from the solver object behind a Pyomo
+    # interface that writes no log (HiGHS via highspy, or gurobipy)
+    inner = getattr(solver, '_solver_model', None)
+    if inner is None:
+        return {}
+    if hasattr(inner, 'getInfo'):
+        info = inner.getInfo()
+        return {
+            'Solve_solver_time_s': float(inner.getRunTime()),
+            'Solve_rows': int(inner.getNumRow()),
+            'Solve_cols': int(inner.getNumCol()),
+            'Solve_nonzeros': int(inner.getNumNz()),
+            'Solve_barrier_iterations': int(info.ipm_iteration_count),
+            'Solve_simplex_iterations': int(info.simplex_iteration_count),
+        }
+    if hasattr(inner, 'getAttr'):
+        return {
+            'Solve_solver_time_s': float(inner.Runtime),
+            'Solve_rows': int(inner.NumConstrs),
+            'Solve_cols': int(inner.NumVars),
+            'Solve_nonzeros': int(inner.NumNZs),
+            'Solve_barrier_iterations': int(inner.BarIterCount),
+            'Solve_simplex_iterations': int(inner.IterCount),
+        }
+    return {}
+
+
+def solver_telemetry(results, log_text, wall_time):
+    solver_time = getattr(results.solver, 'wallclock_time', None) or getattr(results.solver, 'time', None)
+    record = {
+        'Solve_termination': str(results.solver.termination_condition),
+        'Solve_wall_time_s': wall_time,
+        'Solve_solver_time_s': float(solver_time) if isinstance(solver_time, (int, float)) else math.nan,
+    }
+    record.update(parse_solver_log(log_text))
+    return record
+
+
+# Summed, rather than taken from the last solve, when solves are combined
+ADDITIVE_STAT_COLUMNS = ('Solve_wall_time_s', 'Solve_solver_time_s', 'Solve_barrier_iterations',
+                         'Solve_simplex_iterations')
+
+
+def combine_telemetry(telemetries):
+    # One telemetry dict for a sequence of solves of the same model
+    combined = dict(telemetries[-1])
+    for col in ADDITIVE_STAT_COLUMNS:
+        finite = [t[col] for t in telemetries if not math.isnan(t.get(col, math.nan))]
+        combined[col] = sum(finite) if finite else math.nan
+    return combined
@@ -0,0 +1,151 @@
+import argparse
+import itertools
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.model import solve_model
+from green_steel.runner import build_job_model, build_jobs
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+from green_steel.solver_profiles import (SOLVER_PROFILES, available_profiles, save_user_profile, solver_family,
+                                         solver_options)
+
+# ======================
+# SOLVER TUNING HARNESS
+# ======================
+# Solves a sample of (city, Ycase, Scase) jobs once with a reference
+# profile, then with every candidate option set. The winner is the fastest
+# candidate (total solve time over the sample) whose objectives all match
+# the reference within a relative tolerance.
+
+# Method / crossover / presolve grid per solver family
+CANDIDATE_GRID = {
+    'gurobi': {'Method': [1, 2, 3], 'Crossover': [-1, 0], 'Presolve': [-1, 2]},
+    'highs': {'solver': ['simplex', 'ipm'], 'run_crossover': ['on', 'off'], 'presolve': ['on', 'off']},
+}
+# Crossover only applies to barrier / interior point: for simplex methods
+# only the default crossover setting is kept
+_NO_CROSSOVER_CHOICE = {
+    'gurobi': ('Method', [1], 'Crossover', -1),
+    'highs': ('solver', ['simplex'], 'run_crossover', 'on'),
+}
+
+
+def candidate_options(solver_name):
+    # Named profiles plus the method/crossover/presolve grid, without duplicates
+    family = solver_family(solver_name)
+    if family not in CANDIDATE_GRID:
+        raise ValueError(f"No tuning grid for {solver_name}; choose a Gurobi or HiGHS solver")
+    candidates = {name: solver_options(name, solver_name) for name in SOLVER_PROFILES}
+
+    grid = CANDIDATE_GRID[family]
+    method_key, fixed_methods, crossover_key, crossover_default = _NO_CROSSOVER_CHOICE[family]
+    for values in itertools.product(*grid.values()):
+        options = dict(zip(grid, values))
+        if options[method_key] in fixed_methods and options[crossover_key] != crossover_default:
+            continue
+        label = ','.join(f'{k}={v}' for k, v in options.items())
+        candidates[label] = options
+
+    unique = {}
+    for label, options in candidates.items():
+        unique.setdefault(json.dumps(options, sort_keys=True), (label, options))
+    return dict(unique.values())
+
+
+def sample_jobs(jobs, n, seed=0):
+    if n >= len(jobs):
+        return list(jobs)
+    picks = np.random.default_rng(seed).choice(len(jobs), size=n, replace=False)
+    return [jobs[i] for i in sorted(picks)]
+
+
+def _solve_time(telemetry):
+    # Solver-reported time when available; wall time includes writing the LP
+    solver_time = telemetry['Solve_solver_time_s']
+    return telemetry['Solve_wall_time_s'] if math.isnan(solver_time) else solver_time
+
+
+def tune(jobs, solver_name='gurobi', candidates=None, reference_profile='publication', rel_tol=1e-5,
+         store_dir=None):
+    # Returns (per-solve trials, per-candidate summary sorted fastest first)
+    if candidates is None:
+        candidates = candidate_options(solver_name)
+
+    trials = []
+    for job in jobs:
+        case = f"{job['City']} ({job['Ycase']}, {job['Scase']})"
+        model = build_job_model(job, store_dir)
+        _, optimal, _ = solve_model(model, solver_name=solver_name, tee=False,
+                                    options=solver_options(reference_profile, solver_name))
+        if not optimal:
+            raise ValueError(f"Reference solve of {case} is not optimal")
+        reference = pyo.value(model.obj)
+
+        for label, options in candidates.items():
+            print(f" {case}: {label}", flush=True)
+            _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options)
+            objective = pyo.value(model.obj) if optimal else math.nan
+            trials.append({
+                'Candidate': label,
+                'City': job['City'],
+                'Ycase': job['Ycase'],
+                'Scase': job['Scase'],
+                'Optimal': optimal,
+                'Objective': objective,
+                'Reference_objective': reference,
+                'Rel_diff': abs(objective - reference) / max(abs(reference), 1e-12),
+                'Solve_s': _solve_time(telemetry),
+            })
+
+    trials = pd.DataFrame(trials)
+    summary = trials.groupby('Candidate', sort=False).agg(
+        Total_solve_s=('Solve_s', 'sum'),
+        Max_rel_diff=('Rel_diff', 'max'),
+        All_optimal=('Optimal', 'all'),
+    ).reset_index()
+    summary['Matches_reference'] = summary['All_optimal'] & (summary['Max_rel_diff'] <= rel_tol)
+    summary['Options'] = [json.dumps(candidates[c], sort_keys=True) for c in summary['Candidate']]
+    summary = summary.sort_values(['Matches_reference', 'Total_solve_s'], ascending=[False, True])
+    return trials, summary.reset_index(drop=True)
+
+
+def best_candidate(summary):
+    matches = summary[summary['Matches_reference']]
+    if matches.empty:
+        raise ValueError("No candidate matched the reference objectives within tolerance")
+    best = matches.iloc[0]
+    return best['Candidate'], json.loads(best['Options'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick the fastest solver options that reproduce reference objectives")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sample', type=int, default=4, help="Number of (city, Ycase, Scase) jobs to tune on")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--reference', default='publication', choices=sorted(available_profiles()))
+    parser.add_argument('--rel-tol', type=float, default=1e-5)
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out', default=None, help="Write the per-solve trials to this CSV")
+    parser.add_argument('--save-as', default=None, help="Save the winning options as a named solver profile")
+    args = parser.parse_args()
+
+    jobs = sample_jobs(build_jobs(discover_sites(args.profiles_dir, args.metadata, args.year)),
+                       args.sample, args.seed)
+    trials, summary = tune(jobs, solver_name=args.solver, reference_profile=args.reference,
+                           rel_tol=args.rel_tol, store_dir=args.store_dir)
+    print(summary.to_string(index=False, float_format='%.3g'))
+    if args.out:
+        trials.to_csv(args.out, index=False)
+
+    label, options = best_candidate(summary)
+    print(f"\n Fastest matching candidate: {label} {options}")
+    if args.save_as:
+        path = save_user_profile(args.save_as, args.solver, options)
+        print(f" Saved as solver profile '{args.save_as}' in '{path}'.")
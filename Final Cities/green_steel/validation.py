@@ -0,0 +1,178 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.model import (F_SCRAP, ROM_GRADE, create_complete_green_steel_model, initialize_model_parameters,
+                               solve_model)
+from green_steel.profiles import HOURS_PER_YEAR
+from green_steel.jobs import build_job_model, build_jobs, job_profile
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites
+
+# ======================
+# FULL-RESOLUTION VALIDATION
+# ======================
+# Checks a design from any reduced-fidelity solve (a shortened horizon,
+# a decomposition, a consensus design) against the full 8760-hour year:
+# its capacities are fixed, the plant is re-dispatched on the full profile,
+# and the resulting cost, unserved steel and grid import are compared with
+# what the reduced solve estimated. Steel demand becomes soft in the
+# re-dispatch (penalised at UNSERVED_PENALTY_USD_PER_T) so a design that
+# cannot meet it still returns a measurable shortfall instead of failing.
+# Full_cost_per_tonne is then the cost per tonne actually served, so an
+# undersized design does not look cheaper than it is, and
+# Full_penalised_cost_per_tonne adds the penalty over the full demand.
+#
+# Every reduced mode validates its designs this way by default: the
+# shortened horizon here, progressive hedging (green_steel.stochastic), the
+# worst and concatenated weather-year designs (green_steel.weather_years)
+# and propagated cluster results (green_steel.clustering; the farthest
+# member of each cluster by default, as re-dispatching a member costs
+# nearly as much as solving it). Lazy storage bounds (runner
+# --lazy-storage) are exact and only physically checked.
+#
+# The grid import columns only carry information when renewable_share is
+# relaxed: the re-dispatch model is built with the default
+# min_renewable_share = 1, under which no import is possible, so
+# Full_grid_import_MWh and Extra_grid_import_MWh are 0 unless that share
+# is lowered (green_steel.tariffs.set_min_renewable_share).
+
+# Design capacities carried from a reduced solve to the full year (also the
+# first-stage decisions of green_steel.stochastic). Every sized and costed
+# unit is held, including the CGH2 compressor (CGH2_in_st_max, CAPEX8) and
+# the caster (LS_out_EAF_max, CAPEX10), so the full-year cost is that of
+# the reduced design.
+FIRST_STAGE = {
+    'c_RE_s': lambda m: m.c_RE['s'],
+    'c_RE_w': lambda m: m.c_RE['w'],
+    'c_ely': lambda m: m.c_ely,
+    'c_FC': lambda m: m.c_FC,
+    'c_EAF': lambda m: m.c_EAF,
+    'Lmax_bat_st': lambda m: m.Lmax_bat_st,
+    'Lmax_CGH2_st': lambda m: m.Lmax_CGH2_st,
+    'CGH2_in_st_max': lambda m: m.CGH2_in_st_max,
+    'LS_out_EAF_max': lambda m: m.LS_out_EAF_max,
+}
+UNSERVED_PENALTY_USD_PER_T = 1e4
+VALIDATION_COLUMNS = ['Reduced_cost_per_tonne', 'Full_cost_per_tonne', 'Full_penalised_cost_per_tonne',
+                      'LCOS_gap_USD_per_t', 'LCOS_gap_pct', 'Unserved_steel_t', 'Unserved_steel_pct',
+                      'Reduced_grid_import_MWh', 'Full_grid_import_MWh', 'Extra_grid_import_MWh',
+                      'Validation_termination']
+
+
+def reduced_estimate(model):
+    # Capacities and annualised estimates of a solved (possibly reduced) model
+    f_t = pyo.value(model.f_t)
+    return {
+        'capacities': {name: pyo.value(get(model)) for name, get in FIRST_STAGE.items()},
+        'cost_per_tonne': pyo.value(model.T_cost) * 1e6 / pyo.value(model.dem_SFS),
+        'grid_import_MWh': pyo.value(model.T_P_grid_import) / f_t,
+    }
+
+
+def redispatch(model, capacities, solver_name='gurobi', fixed=None):
+    # Re-solve a built full-year model with the design capacities (and any
+    # other {component: value} in fixed) held, and steel demand made soft
+    for name, value in capacities.items():
+        FIRST_STAGE[name](model).fix(value)
+    for component, value in (fixed or {}).items():
+        component.fix(value)
+    model.unserved_steel = pyo.Var(within=pyo.NonNegativeReals)
+    model.demand_constraint.deactivate()
+    model.validation_demand = pyo.Constraint(
+        expr=sum(model.LS_out_EAF[t] for t in model.T) + model.unserved_steel == model.dem_SFS)
+    model.obj.deactivate()
+    model.validation_obj = pyo.Objective(
+        expr=(model.T_cost * 1e6 + UNSERVED_PENALTY_USD_PER_T * model.unserved_steel) / model.dem_SFS,
+        sense=pyo.minimize)
+    _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False)
+    return optimal, telemetry
+
+
+def compare_to_estimate(model, estimate, optimal, telemetry):
+    # One row of VALIDATION_COLUMNS from a re-dispatched model
+    row = dict.fromkeys(VALIDATION_COLUMNS, np.nan)
+    row['Reduced_cost_per_tonne'] = estimate['cost_per_tonne']
+    row['Reduced_grid_import_MWh'] = estimate['grid_import_MWh']
+    row['Validation_termination'] = telemetry['Solve_termination']
+    if not optimal:
+        return row
+    demand = pyo.value(model.dem_SFS)
+    unserved = pyo.value(model.unserved_steel)
+    served = demand - unserved
+    cost_usd = pyo.value(model.T_cost) * 1e6
+    full_cost = cost_usd / served if served > 0 else np.nan
+    full_import = pyo.value(model.T_P_grid_import)
+    row.update({
+        'Full_cost_per_tonne': full_cost,
+        'Full_penalised_cost_per_tonne': (cost_usd + UNSERVED_PENALTY_USD_PER_T * unserved) / demand,
+        'LCOS_gap_USD_per_t': full_cost - estimate['cost_per_tonne'],
+        'LCOS_gap_pct': 100 * (full_cost / estimate['cost_per_tonne'] - 1),
+        'Unserved_steel_t': unserved,
+        'Unserved_steel_pct': 100 * unserved / demand,
+        'Full_grid_import_MWh': full_import,
+        'Extra_grid_import_MWh': full_import - estimate['grid_import_MWh'],
+    })
+    return row
+
+
+def validate_design(job, estimate, solver_name='gurobi', store_dir=None):
+    model = build_job_model(job, store_dir)
+    optimal, telemetry = redispatch(model, estimate['capacities'], solver_name)
+    return compare_to_estimate(model, estimate, optimal, telemetry)
+
+
+def validate_model(job, model, solver_name='gurobi', store_dir=None):
+    # Validate a solved reduced model built for this job's Ycase/Scase
+    return validate_design(job, reduced_estimate(model), solver_name, store_dir)
+
+
+def solve_reduced_horizon(job, n_hours, solver_name='gurobi', store_dir=None):
+    # The job solved on only the first n_hours of its profile (f_t scaled)
+    y, s = job['Ycase'], job['Scase']
+    model = create_complete_green_steel_model(
+        ycase=y,
+        scase=s,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[s],
+        f_t=n_hours / HOURS_PER_YEAR,
+        objective=job['Objective'],
+        transport_cost_per_tonne=job['TransportCost_USD_per_t'],
+        n_hours=n_hours,
+    )
+    initialize_model_parameters(model, y, s, job_profile(job, store_dir)[:n_hours])
+    _, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False)
+    if not optimal:
+        raise ValueError(f"{job['City']} ({y}, {s}): {n_hours}-hour solve ended {telemetry['Solve_termination']}")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve on a shortened horizon and validate on the full year")
+    parser.add_argument('--hours', type=int, required=True, help="Reduced horizon (first N hours)")
+    parser.add_argument('--profiles-dir', default=CITIES_DIR)
+    parser.add_argument('--metadata', default=DEFAULT_METADATA)
+    parser.add_argument('--year', type=int, default=2019)
+    parser.add_argument('--sites', nargs='*', default=None)
+    parser.add_argument('--ycases', nargs='*', default=['YCurrent'])
+    parser.add_argument('--scases', nargs='*', default=['S1'])
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--store-dir', default=None)
+    parser.add_argument('--out', default='validation_results.csv')
+    args = parser.parse_args()
+
+    sites = discover_sites(args.profiles_dir, args.metadata, args.year)
+    if args.sites:
+        sites = sites[sites['City'].isin(args.sites)]
+    rows = []
+    for job in build_jobs(sites, args.ycases, args.scases):
+        print(f" {job['City']} ({job['Ycase']}, {job['Scase']}): {args.hours} h -> {HOURS_PER_YEAR} h", flush=True)
+        model = solve_reduced_horizon(job, args.hours, args.solver, args.store_dir)
+        row = {'City': job['City'], 'Ycase': job['Ycase'], 'Scase': job['Scase'], 'Reduced_hours': args.hours}
+        row.update(validate_model(job, model, args.solver, args.store_dir))
+        rows.append(row)
+    results = pd.DataFrame(rows)
+    print(results.to_string(index=False, float_format='%.2f'))
+    results.to_csv(args.out, index=False)
+    print(f"\n Validation results saved to '{args.out}'.")
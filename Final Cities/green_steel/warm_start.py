@@ -0,0 +1,181 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+
+from green_steel.model import solve_model
+from green_steel.profiles import HOURS_PER_YEAR, VRE_SOURCES
+
+try:
+    import highspy  # Only needed to load HiGHS bases
+except ImportError:
+    highspy = None
+
+# ======================
+# CROSS-CITY WARM STARTS
+# ======================
+# Each profile is reduced to a short feature vector: annual and monthly
+# capacity factors per source, the mean diurnal shape, and the hourly
+# solar-wind correlation. A new job is seeded with the final simplex basis
+# of the solved job of the same Objective/Ycase/Scase whose profile is
+# nearest in that (standardised) feature space: jobs of one scenario share
+# the model structure, so the basis loads as is and the solver only repairs
+# it for the new profile (about a third of the cold iterations between
+# cities at 168 h). Solved jobs leave their basis in bases_dir; a basis
+# that does not fit the model (another horizon) is skipped and the job is
+# solved cold. Fixing the seed's capacities for a first dispatch solve was
+# tried before and cost more iterations than it saved.
+#
+# Iterations come from the solver object (see telemetry.solver_api_stats),
+# as appsi_* solvers write no log. Every row reports the seeded solve's
+# own iterations. A seeded job's cold iterations are only known if it is
+# also solved cold, so every BASELINE_SAMPLE_EVERY-th seeded job is: it is
+# first solved from scratch on a fresh solver, which gives that job's
+# Warm_start_cold_iterations and Warm_start_iteration_savings (NaN elsewhere).
+
+SEED_KEYS = ['Objective', 'Ycase', 'Scase']
+WARM_START_COLUMNS = ['Warm_start_source', 'Warm_start_distance', 'Warm_start_seeded_iterations',
+                      'Warm_start_cold_iterations', 'Warm_start_iteration_savings']
+BASELINE_SAMPLE_EVERY = 10
+
+_MONTH_STARTS = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+
+
+def profile_features(profile):
+    # (8760 x 2) capacity factors -> 1-D feature vector
+    year = np.asarray(profile[:HOURS_PER_YEAR], dtype=np.float64)
+    hours_per_month = np.diff(np.append(_MONTH_STARTS, HOURS_PER_YEAR // 24)) * 24
+    monthly = np.add.reduceat(year, _MONTH_STARTS * 24, axis=0) / hours_per_month[:, None]
+    diurnal = year.reshape(-1, 24, len(VRE_SOURCES)).mean(axis=0)
+    s, w = year[:, 0], year[:, 1]
+    corr = np.corrcoef(s, w)[0, 1] if s.std() > 0 and w.std() > 0 else 0.0
+    return np.concatenate([year.mean(axis=0), monthly.ravel(), diurnal.ravel(), [corr]])
+
+
+def feature_distances(features, candidates):
+    # Distances from one feature vector to each row of candidates, with every
+    # feature standardised over the candidates and the query together
+    stacked = np.vstack([features, candidates])
+    scale = stacked.std(axis=0)
+    scale[scale == 0] = 1.0
+    return np.linalg.norm((candidates - features) / scale, axis=1)
+
+
+def basis_path(job, bases_dir):
+    return os.path.join(bases_dir, f"{job['City']}_{job['WeatherYear']}_{job['Objective']}_"
+                                   f"{job['Ycase']}_{job['Scase']}_basis.npz")
+
+
+def seed_table(rows, bases_dir):
+    # Solved results rows (dicts or DataFrame) whose basis is in bases_dir
+    seeds = pd.DataFrame(rows)
+    needed = ['City', 'WeatherYear'] + SEED_KEYS
+    if seeds.empty or any(col not in seeds.columns for col in needed):
+        return pd.DataFrame(columns=needed + ['Basis'])
+    seeds = seeds.assign(Basis=[basis_path(row, bases_dir) for row in seeds.to_dict('records')])
+    return seeds[seeds['Basis'].map(os.path.isfile)].reset_index(drop=True)
+
+
+def nearest_seed(job, seeds, features):
+    # features: {City: feature vector}. Returns the WarmStart dict for the
+    # job, or None when no other city has solved the same scenario.
+    match = seeds[(seeds['City'] != job['City']) & seeds['City'].isin(list(features))]
+    for key in SEED_KEYS:
+        match = match[match[key] == job[key]]
+    if match.empty:
+        return None
+    distances = feature_distances(features[job['City']], np.vstack([features[c] for c in match['City']]))
+    best = match.iloc[int(np.argmin(distances))]
+    return {
+        'Source': f"{best['City']} ({best['Ycase']}, {best['Scase']})",
+        'Distance': float(distances.min()),
+        'Basis': best['Basis'],
+    }
+
+
+def pick_anchors(jobs, features, n):
+    # n jobs to solve cold: the one nearest the group's mean profile, then
+    # repeatedly the one farthest from those already picked
+    X = np.vstack([features[job['City']] for job in jobs])
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = X / scale
+    chosen = [int(np.argmin(np.linalg.norm(Z - Z.mean(axis=0), axis=1)))]
+    while len(chosen) < min(n, len(jobs)):
+        nearest = np.min([np.linalg.norm(Z - Z[c], axis=1) for c in chosen], axis=0)
+        chosen.append(int(np.argmax(nearest)))
+    return [jobs[i] for i in chosen]
+
+
+def _basis_solver(solver):
+    # The highspy or gurobipy model behind a persistent appsi_* solver
+    inner = getattr(solver, '_solver_model', None)
+    if not (hasattr(inner, 'getBasis') or hasattr(inner, 'getVars')):
+        raise ValueError(f"{type(solver).__name__} exposes no simplex basis; use appsi_highs or appsi_gurobi")
+    return inner
+
+
+def save_basis(solver, path):
+    # Column and row statuses of the solver's last basis
+    inner = _basis_solver(solver)
+    if hasattr(inner, 'getBasis'):
+        basis = inner.getBasis()
+        cols, rows = [int(b) for b in basis.col_status], [int(b) for b in basis.row_status]
+    else:
+        cols, rows = inner.getAttr('VBasis', inner.getVars()), inner.getAttr('CBasis', inner.getConstrs())
+    np.savez(path, cols=np.array(cols, dtype=np.int8), rows=np.array(rows, dtype=np.int8))
+
+
+def load_basis(solver, path):
+    # Start the solver's next solve from a saved basis; False (and nothing
+    # loaded) when its size does not match the model the solver holds
+    inner = _basis_solver(solver)
+    with np.load(path) as saved:
+        cols, rows = saved['cols'].tolist(), saved['rows'].tolist()
+    if hasattr(inner, 'getBasis'):
+        if (len(cols), len(rows)) != (inner.getNumCol(), inner.getNumRow()):
+            return False
+        basis = highspy.HighsBasis()
+        basis.col_status = [highspy.HighsBasisStatus(b) for b in cols]
+        basis.row_status = [highspy.HighsBasisStatus(b) for b in rows]
+        basis.valid = True
+        return inner.setBasis(basis) == highspy.HighsStatus.kOk
+    variables, constraints = inner.getVars(), inner.getConstrs()
+    if (len(cols), len(rows)) != (len(variables), len(constraints)):
+        return False
+    inner.setAttr('VBasis', variables, cols)
+    inner.setAttr('CBasis', constraints, rows)
+    return True
+
+
+def solve_seeded(model, seed, solver_name, options=None, solver=None):
+    # Same return values as solve_model, plus the cold solve's telemetry when
+    # seed['Measure_baseline'] is set (else None). solver: the persistent
+    # (appsi_*) solver to load the seed's basis into (default: a new one).
+    solver = solver if solver is not None else pyo.SolverFactory(solver_name)
+    if getattr(solver, 'set_instance', None) is None:
+        raise ValueError(f"Warm starts need a persistent appsi_* solver, not '{solver_name}'")
+    cold_telemetry = None
+    if seed.get('Measure_baseline'):
+        _, _, cold_telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                           solver=pyo.SolverFactory(solver_name))
+    solver.set_instance(model)
+    if not load_basis(solver, seed['Basis']):
+        print(f" Basis from {seed['Source']} does not fit this model; solving cold")
+    results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=False, options=options,
+                                              solver=solver)
+    return results, optimal, telemetry, cold_telemetry
+
+
+def warm_start_row(seed, telemetry, cold_telemetry=None):
+    # telemetry: the seeded solve; cold_telemetry: the same job solved cold
+    seeded = telemetry['Solve_simplex_iterations']
+    cold = np.nan if cold_telemetry is None else cold_telemetry['Solve_simplex_iterations']
+    return {
+        'Warm_start_source': seed['Source'],
+        'Warm_start_distance': seed['Distance'],
+        'Warm_start_seeded_iterations': seeded,
+        'Warm_start_cold_iterations': cold,
+        'Warm_start_iteration_savings': cold - seeded,
+    }
@@ -0,0 +1,181 @@
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from green_steel.model import (F_SCRAP, ROM_GRADE, SCASES, YCASES, create_complete_green_steel_model,
+                               extract_results, initialize_model_parameters, print_results, solve_model)
+from green_steel.profiles import HOURS_PER_YEAR, set_vre_profile, stream_vre_csv
+from green_steel.validation import compare_to_estimate, redispatch, reduced_estimate
+
+# ======================
+# MULTI-WEATHER-YEAR RUNS
+# ======================
+# 'independent'  : one design per weather year
+# 'concatenated' : one design over all years back to back (f_t = number of years)
+# 'worst'        : one design on a single chosen (or automatically picked) year
+#
+# A 'concatenated' or 'worst' design is then re-dispatched on every weather
+# year on its own (green_steel.validation) and its row carries the
+# validation columns of the year it fares worst in (Validation_weather_year):
+# a design sized for one year, or for the average of several, can fall
+# short in another.
+#
+# Profiles are streamed one year at a time, so the CSVs are never all held
+# at once, but the model is not: a 'concatenated' horizon is a single LP of
+# n_years * 8760 hours (87,600 for ten years) whose every hour Pyomo holds
+# in memory, and whose size grows with the number of years. For long
+# records, 'worst' keeps the model to one year, and green_steel.stochastic
+# solves one 8760-hour model per year, each worker holding at most
+# max_resident of them.
+WEATHER_YEAR_MODES = ('independent', 'concatenated', 'worst')
+VALIDATED_MODES = ('concatenated', 'worst')
+
+
+def find_weather_year_profiles(site_dir, site):
+    # {year: path} for every <site>_<year>.csv in site_dir
+    pattern = re.compile(rf'^{re.escape(site)}_(\d{{4}})\.csv$')
+    found = {}
+    for name in os.listdir(site_dir):
+        match = pattern.match(name)
+        if match:
+            found[int(match.group(1))] = os.path.join(site_dir, name)
+    return dict(sorted(found.items()))
+
+
+def iter_weather_years(paths_by_year):
+    # Streams (year, 8760 x 2 profile) one year at a time
+    for year, path in sorted(paths_by_year.items()):
+        for profile in stream_vre_csv(path, HOURS_PER_YEAR):
+            yield year, profile
+
+
+def select_worst_year(paths_by_year):
+    # Worst year = the one whose better source has the lowest mean capacity
+    # factor, i.e. the year that needs the most installed VRE per MWh.
+    scores = {year: profile.mean(axis=0).max() for year, profile in iter_weather_years(paths_by_year)}
+    return min(scores, key=scores.get)
+
+
+def _weather_year_label(years):
+    years = sorted(years)
+    return str(years[0]) if len(years) == 1 else f"{years[0]}-{years[-1]}"
+
+
+def _build_horizon(paths_by_year, y, s, transport_cost_per_tonne):
+    # One model over every year of paths_by_year (n_years * 8760 hours)
+    n_years = len(paths_by_year)
+    model = create_complete_green_steel_model(
+        ycase=y,
+        scase=s,
+        ROM_grade_val=ROM_GRADE,
+        f_scrap_val=F_SCRAP[s],
+        f_t=float(n_years),
+        transport_cost_per_tonne=transport_cost_per_tonne,
+        n_hours=n_years * HOURS_PER_YEAR,
+    )
+
+    # Stream each weather year into its slice of the horizon
+    for k, (_, profile) in enumerate(iter_weather_years(paths_by_year)):
+        set_vre_profile(model, profile, first_hour=k * HOURS_PER_YEAR + 1)
+    initialize_model_parameters(model, y, s)
+    return model
+
+
+def _severity(row):
+    # Orders validation rows from best to worst: failed re-dispatch last,
+    # then by unserved steel and full-year cost
+    if np.isnan(row['Full_cost_per_tonne']):
+        return (1, 0.0, 0.0)
+    return (0, row['Unserved_steel_t'], row['Full_cost_per_tonne'])
+
+
+def validate_on_weather_years(model, paths_by_year, y, s, transport_cost_per_tonne, solver_name='gurobi'):
+    # Validation row of a solved horizon's design in the weather year it
+    # fares worst in (one full-year re-dispatch per year)
+    estimate = reduced_estimate(model)
+    rows = []
+    for year, path in paths_by_year.items():
+        full = _build_horizon({year: path}, y, s, transport_cost_per_tonne)
+        optimal, telemetry = redispatch(full, estimate['capacities'], solver_name)
+        row = compare_to_estimate(full, estimate, optimal, telemetry)
+        row['Validation_weather_year'] = year
+        rows.append(row)
+    return max(rows, key=_severity)
+
+
+def _solve_horizon(paths_by_year, y, s, transport_cost_per_tonne, solver_name, tee, validate_paths=None):
+    # validate_paths: {year: path} to validate the design on (None: no validation)
+    model = _build_horizon(paths_by_year, y, s, transport_cost_per_tonne)
+    results, optimal, telemetry = solve_model(model, solver_name=solver_name, tee=tee)
+    if not optimal:
+        print(f"\n No optimal solution for ({y}, {s}), weather year(s) {_weather_year_label(paths_by_year)}")
+        return None
+    if tee:
+        print_results(model)
+    row = extract_results(model)
+    row['WeatherYear'] = _weather_year_label(paths_by_year)
+    row['Horizon_years'] = len(paths_by_year)
+    row.update(telemetry)
+    if validate_paths:
+        row.update(validate_on_weather_years(model, validate_paths, y, s, transport_cost_per_tonne, solver_name))
+    return row
+
+
+def solve_weather_years(site, paths_by_year, transport_cost_per_tonne, mode='independent', worst_year=None,
+                        ycases=YCASES, scases=SCASES, solver_name='gurobi', tee=True, quiet=False, validate=True):
+    if mode not in WEATHER_YEAR_MODES:
+        raise ValueError(f"Unknown weather-year mode '{mode}'; choose from {WEATHER_YEAR_MODES}")
+    if not paths_by_year:
+        raise ValueError(f"No weather-year profiles given for {site}")
+
+    if mode == 'independent':
+        horizons = [{year: path} for year, path in paths_by_year.items()]
+    elif mode == 'concatenated':
+        horizons = [paths_by_year]
+    else:
+        if worst_year is None:
+            worst_year = select_worst_year(paths_by_year)
+        if worst_year not in paths_by_year:
+            raise ValueError(f"No {worst_year} profile for {site}")
+        horizons = [{worst_year: paths_by_year[worst_year]}]
+    validate_paths = paths_by_year if validate and mode in VALIDATED_MODES else None
+
+    rows = []
+    for horizon in horizons:
+        for y in ycases:
+            for s in scases:
+                if not quiet:
+                    print(f"\n Solving {site}: Ycase={y}, Scase={s}, weather year(s) {_weather_year_label(horizon)}")
+                row = _solve_horizon(horizon, y, s, transport_cost_per_tonne, solver_name, tee and not quiet,
+                                     validate_paths)
+                if row is not None:
+                    row['City'] = site
+                    row['WeatherMode'] = mode
+                    rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a site over several weather years")
+    parser.add_argument('site_dir', help="Folder holding <Site>_<year>.csv profiles")
+    parser.add_argument('--transport-cost', type=float, required=True, help="Ore transport cost ($/t)")
+    parser.add_argument('--mode', choices=WEATHER_YEAR_MODES, default='independent',
+                        help="'concatenated' builds one LP over all years' hours")
+    parser.add_argument('--worst-year', type=int, default=None)
+    parser.add_argument('--solver', default='gurobi')
+    parser.add_argument('--quiet', action='store_true', help="No solver logs or per-scenario output")
+    parser.add_argument('--skip-validation', action='store_true',
+                        help="Do not re-dispatch concatenated/worst designs on each weather year")
+    args = parser.parse_args()
+
+    site_dir = os.path.abspath(args.site_dir)
+    site = os.path.basename(site_dir)
+    df = solve_weather_years(site, find_weather_year_profiles(site_dir, site), args.transport_cost,
+                             mode=args.mode, worst_year=args.worst_year, solver_name=args.solver,
+                             quiet=args.quiet, validate=not args.skip_validation)
+    out_path = os.path.join(site_dir, f'all_scenario_results_{site}_{args.mode}_weather_years.csv')
+    df.to_csv(out_path, index=False)
+    print(f"\n Weather-year results saved to '{out_path}'.")
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyomo')
+
+import pandas as pd  # noqa: E402
+
+from green_steel.benchmark import HISTORY_COLUMNS, THRESHOLDS, check_regressions, run_case  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+CASE = {'City': 'Wuhai', 'Ycase': 'YCurrent', 'Scase': 'S1', 'Horizon': 'week', 'Solver': 'appsi_highs'}
+
+
+def _run(**metrics):
+    row = dict.fromkeys(HISTORY_COLUMNS, 0.0)
+    row.update(CASE, Build_s=2.0, Init_s=1.0, Solve_s=4.0, Extract_s=0.5, Peak_py_mem_MB=200.0,
+               Peak_rss_MB=500.0, Rows=35040, Cols=26290, Nonzeros=96380)
+    row.update(metrics)
+    return row
+
+
+def _history(solve_times):
+    return pd.DataFrame([_run(Solve_s=t) for t in solve_times], columns=HISTORY_COLUMNS)
+
+
+def test_a_slowdown_must_pass_both_ratio_and_floor():
+    history = _history([4.0, 3.0, 5.0, 4.0, 4.5])  # Baseline: median 4.0 s
+    ratio, floor = THRESHOLDS['Solve_s']
+    slow = 4.0 * ratio + floor + 0.1
+    [flag] = check_regressions(pd.DataFrame([_run(Solve_s=slow)]), history)
+    assert flag.startswith('Wuhai (YCurrent, S1) week: Solve_s')
+
+    # Above the ratio but within the noise floor of a fast case
+    fast = _history([0.2] * 5)
+    assert check_regressions(pd.DataFrame([_run(Solve_s=0.2 * ratio + 0.1)]), fast) == []
+    # Another solver's history is no baseline
+    assert check_regressions(pd.DataFrame([_run(Solve_s=slow, Solver='gurobi')]), history) == []
+
+
+def test_baseline_is_the_median_of_the_last_runs():
+    # Old slow runs drop out of the BASELINE_RUNS window
+    history = _history([20.0] * 3 + [4.0] * 5)
+    assert check_regressions(pd.DataFrame([_run(Solve_s=4.0)]), history) == []
+    assert check_regressions(pd.DataFrame([_run(Solve_s=20.0)]), history) != []
+
+
+def test_any_lp_size_change_is_flagged():
+    history = _history([4.0] * 3)
+    flags = check_regressions(pd.DataFrame([_run(Rows=35041)]), history)
+    assert flags == ['Wuhai (YCurrent, S1) week: Rows changed from 35040 to 35041']
+    assert check_regressions(pd.DataFrame([_run()]), pd.DataFrame()) == []
+
+
+def test_run_case_times_a_short_horizon():
+    pytest.importorskip('highspy')
+    row = run_case('Wuhai', 'YCurrent', 'S1', 24, 10.0, os.path.join(CITIES_DIR, 'Wuhai', 'Wuhai_2019.csv'),
+                   solver_name='appsi_highs')
+    assert row['Hours'] == 24
+    assert 'optimal' in row['Termination']
+    assert row['Rows'] > 0 and row['Cols'] > 0 and row['Nonzeros'] > row['Rows']
+    for col in ('Build_s', 'Init_s', 'Solve_s', 'Extract_s', 'Peak_py_mem_MB'):
+        assert row[col] > 0
+    assert row['Cost_per_tonne'] > 0
@@ -0,0 +1,41 @@
+import pytest
+
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('highspy')
+
+from green_steel.checks import physical_checks  # noqa: E402
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+@pytest.fixture(scope='module')
+def solved():
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    return model
+
+
+def test_optimal_solution_passes(solved):
+    row = physical_checks(solved)
+    assert row['Physical_checks_passed'], row['Physical_check_failures']
+
+
+@pytest.mark.parametrize('var, index, checks', [
+    ('L_bat_st', (50,), {'bat_storage'}),
+    ('LS_out_EAF', (80,), {'EAF_in_out', 'demand'}),
+    ('P_cons_AC', (12,), {'power_balance', 'renewable_share', 'energy_adequacy'}),
+])
+def test_corrupted_value_is_flagged(solved, var, index, checks):
+    data = solved.component(var)[index]
+    original = data.value
+    data.set_value(original + 1e3, skip_validation=True)
+    try:
+        row = physical_checks(solved)
+    finally:
+        data.set_value(original, skip_validation=True)
+    assert not row['Physical_checks_passed']
+    assert checks <= set(row['Physical_check_failures'].split(';'))
+    for name in checks:
+        assert row[f'Check_{name}_breaches'] >= 1
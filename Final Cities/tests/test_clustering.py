@@ -0,0 +1,152 @@
+import os
+import runpy
+import sys
+
+import pytest
+
+pytest.importorskip('pyomo')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from green_steel import clustering, runner, validation  # noqa: E402
+from green_steel.clustering import propagate_results  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+ANSHAN_CSV = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+
+
+def _rep_row(city, scase, cost):
+    return {'City': city, 'Objective': 'cost', 'WeatherYear': 2019, 'Ycase': 'YCurrent', 'Scase': scase,
+            'Cost_per_tonne': cost}
+
+
+def test_error_estimate_falls_back_to_other_scenarios():
+    # A and C represent clusters {A, B} and {C}; S2 was only solved for A
+    clusters = pd.DataFrame({'City': ['A', 'B', 'C'], 'Province': '', 'Cluster': [0, 0, 1],
+                             'Representative': ['A', 'A', 'C'], 'Profile_distance': [0.0, 1.0, 0.0],
+                             'Is_representative': [True, False, True]})
+    D = np.array([[0.0, 1.0, 2.0], [1.0, 0.0, 3.0], [2.0, 3.0, 0.0]])
+    rep_rows = [_rep_row('A', 'S1', 500.0), _rep_row('C', 'S1', 520.0), _rep_row('A', 'S2', 480.0)]
+    transport = {'A': 10.0, 'B': 10.0, 'C': 10.0}
+
+    results = propagate_results(clusters, D, rep_rows, transport).set_index(['City', 'Scase'])
+    estimate = results['LCOS_error_estimate_USD_per_t']
+    assert estimate[('A', 'S1')] == 0.0
+    assert estimate[('B', 'S1')] == pytest.approx(10.0)  # 20 $/t over distance 2
+    assert estimate[('B', 'S2')] == pytest.approx(10.0)
+
+
+def test_error_estimate_is_nan_with_one_representative():
+    clusters = pd.DataFrame({'City': ['A', 'B'], 'Province': '', 'Cluster': [0, 0], 'Representative': ['A', 'A'],
+                             'Profile_distance': [0.0, 1.0], 'Is_representative': [True, False]})
+    results = propagate_results(clusters, np.array([[0.0, 1.0], [1.0, 0.0]]), [_rep_row('A', 'S1', 500.0)],
+                                {'A': 10.0, 'B': 10.0})
+    assert np.isnan(results.loc[results['City'] == 'B', 'LCOS_error_estimate_USD_per_t']).all()
+
+
+def test_propagated_rows_are_validated_with_the_representative_design(monkeypatch):
+    design = dict(_rep_row('A', 'S1', 500.0), GridImport=0.0,
+                  **{col: float(i + 1) for i, col in enumerate(clustering.DESIGN_CAPACITIES)})
+    clusters = pd.DataFrame({'City': ['A', 'B', 'C'], 'Province': '', 'Cluster': [0, 0, 0],
+                             'Representative': ['A', 'A', 'A'], 'Profile_distance': [0.0, 1.0, 2.0],
+                             'Is_representative': [True, False, False]})
+    sites = pd.DataFrame({'City': ['A', 'B', 'C'], 'WeatherYear': 2019, 'Profile': ANSHAN_CSV,
+                          'TransportCost_USD_per_t': [10.0, 12.0, 14.0]})
+    validated = []
+
+    def fake_validate(job, estimate, solver_name, store_dir):
+        validated.append((job['City'], job['TransportCost_USD_per_t'], estimate))
+        unserved = 0.0 if job['City'] == 'B' else 5.0
+        return dict(dict.fromkeys(clustering.VALIDATION_COLUMNS, 0.0), Full_cost_per_tonne=530.0,
+                    Unserved_steel_t=unserved)
+
+    monkeypatch.setattr(clustering, 'validate_design', fake_validate)
+    D = np.array([[0.0, 1.0, 2.0], [1.0, 0.0, 3.0], [2.0, 3.0, 0.0]])
+    results = propagate_results(clusters, D, [design], {'A': 10.0, 'B': 12.0, 'C': 14.0})
+    results = clustering.add_validation(results, sites, [design]).set_index('City')
+
+    assert [(city, transport) for city, transport, _ in validated] == [('B', 12.0), ('C', 14.0)]
+    assert validated[0][2]['capacities'] == {name: float(i + 1)
+                                             for i, name in enumerate(clustering.DESIGN_CAPACITIES.values())}
+    assert validated[0][2]['cost_per_tonne'] == results.loc['B', 'Cost_per_tonne']
+    assert np.isnan(results.loc['A', 'Full_cost_per_tonne'])
+    assert results['LCOS_upper_bound_USD_per_t'].to_dict() == pytest.approx({'A': 500.0, 'B': 530.0, 'C': np.nan},
+                                                                            nan_ok=True)
+
+
+def test_validate_sample_re_dispatches_only_the_farthest_members(monkeypatch):
+    design = dict(_rep_row('A', 'S1', 500.0), GridImport=0.0,
+                  **{col: 1.0 for col in clustering.DESIGN_CAPACITIES})
+    clusters = pd.DataFrame({'City': ['A', 'B', 'C'], 'Province': '', 'Cluster': [0, 0, 0],
+                             'Representative': ['A', 'A', 'A'], 'Profile_distance': [0.0, 1.0, 2.0],
+                             'Is_representative': [True, False, False]})
+    sites = pd.DataFrame({'City': ['A', 'B', 'C'], 'WeatherYear': 2019, 'Profile': ANSHAN_CSV,
+                          'TransportCost_USD_per_t': 10.0})
+    validated = []
+
+    def fake_validate(job, estimate, solver_name, store_dir):
+        validated.append(job['City'])
+        return dict(dict.fromkeys(clustering.VALIDATION_COLUMNS, 0.0), Full_cost_per_tonne=490.0,
+                    LCOS_gap_USD_per_t=-10.0)
+
+    monkeypatch.setattr(clustering, 'validate_design', fake_validate)
+    cities = clustering.farthest_members(clusters, 1)
+    assert cities == {'C'}
+    D = np.array([[0.0, 1.0, 2.0], [1.0, 0.0, 3.0], [2.0, 3.0, 0.0]])
+    results = propagate_results(clusters, D, [design], {'A': 10.0, 'B': 10.0, 'C': 10.0})
+    results = clustering.add_validation(results, sites, [design], cities=cities).set_index('City')
+
+    assert validated == ['C']
+    assert np.isnan(results.loc['B', 'Full_cost_per_tonne'])
+    assert results['LCOS_upper_bound_USD_per_t'].to_dict() == pytest.approx({'A': 500.0, 'B': np.nan, 'C': 490.0},
+                                                                            nan_ok=True)
+    assert (results['Cluster_validated_gap_USD_per_t'] == 10.0).all()
+
+
+def test_cli_validates_from_the_default_results_dir(tmp_path, monkeypatch, capsys):
+    # Anshan and Anyang are propagated from Dalian, whose full design is
+    # read from runner's default results folder
+    results_dir = tmp_path / 'results'
+    results_dir.mkdir()
+    for city, cost in (('Baotou', 500.0), ('Dalian', 520.0)):
+        design = dict(_rep_row(city, 'S1', cost), GridImport=0.0,
+                      **{col: 1.0 for col in clustering.DESIGN_CAPACITIES})
+        pd.DataFrame([design]).to_csv(results_dir / f'all_scenario_results_{city}.csv', index=False)
+    validated = []
+
+    def fake_validate(job, estimate, solver_name, store_dir):
+        validated.append(job['City'])
+        return dict(dict.fromkeys(clustering.VALIDATION_COLUMNS, 0.0), Full_cost_per_tonne=530.0,
+                    Unserved_steel_t=0.0, LCOS_gap_USD_per_t=10.0)
+
+    monkeypatch.setattr(runner, 'DEFAULT_RESULTS_DIR', str(results_dir))
+    monkeypatch.setattr(validation, 'validate_design', fake_validate)
+    out = tmp_path / 'cluster_results.csv'
+    monkeypatch.setattr(sys, 'argv', ['clustering', '--clusters', '2', '--sites', 'Anshan', 'Anyang', 'Baotou',
+                                      'Dalian', '--ycases', 'YCurrent', '--scases', 'S1',
+                                      '--clusters-out', str(tmp_path / 'clusters.csv'), '--out', str(out)])
+    with pytest.warns(RuntimeWarning):  # green_steel.clustering is already imported
+        runpy.run_module('green_steel.clustering', run_name='__main__')
+
+    results = pd.read_csv(out).set_index('City')
+    assert validated == ['Anyang']  # The farthest member of Dalian's cluster
+    assert results.loc['Anyang', 'LCOS_upper_bound_USD_per_t'] == 530.0
+    assert np.isnan(results.loc['Anshan', 'Full_cost_per_tonne'])
+    assert 'Warning' not in capsys.readouterr().out
+
+
+def test_incomplete_designs_are_left_unvalidated(monkeypatch, capsys):
+    # Committed per-city results have no CGH2 compressor or caster size
+    design = dict(_rep_row('A', 'S1', 500.0), Solar=1.0, Wind=1.0)
+    clusters = pd.DataFrame({'City': ['A', 'B'], 'Province': '', 'Cluster': [0, 0], 'Representative': ['A', 'A'],
+                             'Profile_distance': [0.0, 1.0], 'Is_representative': [True, False]})
+    sites = pd.DataFrame({'City': ['A', 'B'], 'WeatherYear': 2019, 'Profile': ANSHAN_CSV,
+                          'TransportCost_USD_per_t': 10.0})
+    monkeypatch.setattr(clustering, 'validate_design', pytest.fail)
+    results = propagate_results(clusters, np.array([[0.0, 1.0], [1.0, 0.0]]), [design], {'A': 10.0, 'B': 10.0})
+    results = clustering.add_validation(results, sites, [design]).set_index('City')
+
+    assert np.isnan(results.loc['B', clustering.VALIDATION_COLUMNS].astype(float)).all()
+    assert np.isnan(results.loc['B', 'LCOS_upper_bound_USD_per_t'])
+    assert 'the saved design of A is missing' in capsys.readouterr().out
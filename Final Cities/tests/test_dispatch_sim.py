@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import pandas as pd  # noqa: E402
+
+from green_steel.dispatch_sim import DESIGN_COLUMNS, simulate_designs  # noqa: E402
+from green_steel.model import build_city_model, extract_results, solve_model  # noqa: E402
+from green_steel.profiles import load_vre_profile  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+SMOKE_HOURS = 168
+PROFILE = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+LP_COST_RTOL = 1e-3  # Simulated vs LP cost per tonne for the LP's own design
+
+
+def test_solved_design_has_every_design_column():
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    designs = pd.DataFrame([extract_results(model)])
+    assert set(DESIGN_COLUMNS) <= set(designs.columns)
+
+    profile = load_vre_profile(PROFILE)
+    results = simulate_designs(designs, profile, 'YCurrent', 'S1', 10.0)
+    assert len(results) == 1
+
+    with pytest.raises(ValueError, match='CGH2_storage_capacity_t'):
+        simulate_designs(designs.drop(columns='CGH2_storage_capacity_t'), profile, 'YCurrent', 'S1', 10.0)
+
+
+@pytest.mark.parametrize('scase', ['S1', 'S3'])
+def test_simulation_reproduces_the_lp_cost_of_its_design(scase):
+    model = build_city_model('Anshan', 'YCurrent', scase, n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    lp = extract_results(model)
+
+    profile = load_vre_profile(PROFILE)[:SMOKE_HOURS]
+    [sim] = simulate_designs(pd.DataFrame([lp]), profile, 'YCurrent', scase,
+                             model.transport_cost_per_tonne).to_dict('records')
+    assert sim['Cost_per_tonne'] == pytest.approx(lp['Cost_per_tonne'], rel=LP_COST_RTOL)
+    assert sim['Unserved_steel_t'] == pytest.approx(0.0, abs=1e-6)
+    assert sim['GridImport'] == pytest.approx(0.0, abs=1e-6)
+    assert sim['H2_Production'] == pytest.approx(lp['H2_Production'] / (SMOKE_HOURS / 8760), rel=LP_COST_RTOL)
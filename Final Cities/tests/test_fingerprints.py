@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyomo')
+
+from green_steel import fingerprints, model  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+JOB = {'City': 'Anshan', 'Profile': os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv'),
+       'TransportCost_USD_per_t': 1.49, 'Objective': 'cost', 'Ycase': 'Y2030', 'Scase': 'S2'}
+
+
+@pytest.mark.parametrize('name, value', [
+    ('GRID_PENALTY_USD_PER_MWH', 100.0),
+    ('ROM_GRADE', 0.67),
+    ('F_SCRAP', {'S1': 0, 'S2': 0.3, 'S3': 0.5}),
+    ('ely_values', dict(fingerprints.ely_values, Y2030=48.0)),
+    ('ucost_data', dict(fingerprints.ucost_data, s=dict(fingerprints.ucost_data['s'], Y2030=0.5))),
+])
+def test_changed_constant_changes_the_fingerprint(monkeypatch, name, value):
+    before = fingerprints.job_fingerprint(JOB)
+    monkeypatch.setattr(fingerprints, name, value)
+    assert fingerprints.job_fingerprint(JOB) != before
+
+
+@pytest.mark.parametrize('name, value', [('ALPHA_DRI', 0.06), ('EFF_BAT', 0.9), ('DISCOUNT_RATE', 0.07)])
+def test_changed_model_constant_changes_the_fingerprint(monkeypatch, name, value):
+    before = fingerprints.job_fingerprint(JOB)
+    monkeypatch.setattr(model, name, value)
+    assert fingerprints.job_fingerprint(JOB) != before
+
+
+def test_other_scenario_slices_leave_the_fingerprint(monkeypatch):
+    before = fingerprints.job_fingerprint(JOB)
+    monkeypatch.setattr(fingerprints, 'ucost_data',
+                        dict(fingerprints.ucost_data, s=dict(fingerprints.ucost_data['s'], Y2050=0.3)))
+    monkeypatch.setattr(fingerprints, 'F_SCRAP', {'S1': 0.1, 'S2': 0.25, 'S3': 0.5})
+    assert fingerprints.job_fingerprint(JOB) == before
+
+
+def test_source_hash_covers_the_build_path():
+    hashed = fingerprints.build_path_functions()
+    for name in ('green_steel.model.create_complete_green_steel_model', 'green_steel.model.objective_expression',
+                 'green_steel.model.initialize_model_parameters', 'green_steel.model.extract_results',
+                 'green_steel.jobs.build_job_model', 'green_steel.profiles.set_vre_profile'):
+        assert name in hashed
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import pandas as pd  # noqa: E402
+
+from green_steel import frontier  # noqa: E402
+from green_steel.model import build_city_model  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+@pytest.fixture
+def land_frontiers(monkeypatch):
+    monkeypatch.setattr(frontier, 'build_job_model', lambda job, store_dir: build_city_model(
+        job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS))
+    jobs = [{'City': 'Anshan', 'WeatherYear': 2019, 'Ycase': 'YCurrent', 'Scase': s} for s in ('S1', 'S3')]
+    return frontier.trace_frontiers(jobs, metrics=['land'], n_points=3, solver_name='appsi_highs')
+
+
+def test_land_frontier_trades_cost_for_land(land_frontiers):
+    for _, points in land_frontiers.groupby('Scase'):
+        assert points['Point'].tolist() == [0, 1, 2]
+        assert points['Metric_value'].is_monotonic_decreasing
+        assert points['Cost_per_tonne'].is_monotonic_increasing
+        assert points['Metric_value'].iloc[0] > points['Metric_value'].iloc[-1]
+        assert (points['Metric_value'] == points['Total_Land_km2']).all()
+
+
+def test_land_use_ratio_table_matches_the_plot_layout(land_frontiers):
+    sites = pd.DataFrame({'City': ['Anshan'], 'Province': ['Liaoning']})
+    table = frontier.land_use_ratio_table(land_frontiers, sites)
+    assert table.columns.tolist() == ['City', 'Province', 'YCurrent_S1', 'YCurrent_S3',
+                                      'YCurrent_S1_Land_Use', 'YCurrent_S3_Land_Use']
+    optimum = land_frontiers[land_frontiers['Point'] == 0].set_index('Scase')
+    assert table.loc[0, 'YCurrent_S3'] == optimum.loc['S3', 'Cost_per_tonne']
+    assert table.loc[0, 'YCurrent_S1_Land_Use'] == optimum.loc['S1', 'Total_Land_km2']
+    assert table.loc[0, 'Province'] == 'Liaoning'
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import pyomo.environ as pyo  # noqa: E402
+
+from green_steel.lazy_storage import MAX_LAZY_ROUNDS, STORAGE_BOUNDS, solve_lazy_storage, violated_hours  # noqa: E402
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def test_lazy_storage_matches_full_lp():
+    full = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(full, solver_name='appsi_highs', tee=False)
+    assert optimal
+
+    lazy = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, telemetry = solve_lazy_storage(lazy, solver_name='appsi_highs')
+    assert optimal
+    # Converged on cuts alone, with only some of the hourly rows added
+    assert telemetry['Lazy_rounds'] <= MAX_LAZY_ROUNDS
+    assert 0 < telemetry['Lazy_storage_rows'] < 4 * SMOKE_HOURS
+    active = sum(row.active for _, _, _, lower, upper in STORAGE_BOUNDS
+                 for name in (lower, upper) for row in lazy.component(name).values())
+    assert active == telemetry['Lazy_storage_rows']
+    assert pyo.value(lazy.obj) == pytest.approx(pyo.value(full.obj), rel=1e-6)
+    assert all(len(hours) == 0 for hours in violated_hours(lazy).values())
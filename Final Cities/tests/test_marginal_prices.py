@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import numpy as np  # noqa: E402
+import pyomo.environ as pyo  # noqa: E402
+
+from green_steel.marginal_prices import attach_duals, hourly_marginal_prices  # noqa: E402
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+
+SMOKE_HOURS = 168
+BUMP_MW = 0.1
+BUMP_T_H2 = 1e-4
+
+
+@pytest.fixture(scope='module')
+def solved():
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    attach_duals(model)
+    _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    # The tests below re-solve the model, so its base objective is kept here
+    return model, hourly_marginal_prices(model), _objective_usd(model)
+
+
+def _objective_usd(model):
+    # The cost objective is $/t steel
+    return pyo.value(model.obj) * pyo.value(model.dem_SFS)
+
+
+def _median_hour(model, price):
+    # A median-price hour, since in the extreme hours the plant may have no
+    # headroom for the bump
+    k = int(np.argsort(price)[len(price) // 2])
+    return k, list(model.T)[k]
+
+
+def test_electricity_prices_are_finite_in_every_hour(solved):
+    model, prices, _ = solved
+    for price in prices.values():
+        assert len(price) == SMOKE_HOURS
+        assert np.all(np.isfinite(price))
+
+
+def test_electricity_price_matches_objective_change(solved):
+    # The price of one hour must lie between the left and right slopes of
+    # the objective in an extra load added to that hour's balance row.
+    model, prices, base = solved
+    price = prices['electricity_USD_per_MWh']
+    k, t = _median_hour(model, price)
+    row = model.P_Balance_AC2[t]
+    lhs, rhs = row.expr.args
+    model.extra_AC_load = pyo.Param(mutable=True, initialize=0.0)
+    row.set_value(lhs == rhs + model.extra_AC_load)
+    slopes = []
+    try:
+        for bump in (-BUMP_MW, BUMP_MW):
+            model.extra_AC_load = bump
+            solve_model(model, solver_name='appsi_highs', tee=False)
+            slopes.append((_objective_usd(model) - base) / bump)
+    finally:
+        row.set_value(lhs == rhs)
+        model.del_component(model.extra_AC_load)
+    tol = 1e-4 * max(1.0, abs(price[k]))
+    assert slopes[0] - tol <= price[k] <= slopes[1] + tol
+
+
+def test_hydrogen_price_matches_objective_change(solved):
+    # Hydrogen added to storage in one hour lowers the cost by at most the
+    # price per kg when taken away and by at least the price when added.
+    # The hydrogen counts as storage inflow in CGH2_annual as well, or it
+    # could never be used.
+    model, prices, base = solved
+    price = prices['hydrogen_USD_per_kg']
+    k, t = _median_hour(model, price)
+    row = model.CGH2_t1 if k == 0 else model.CGH2_mb[t]
+    annual = model.CGH2_annual
+    (lhs, rhs), (inflow, outflow) = row.expr.args, annual.expr.args
+    model.extra_H2 = pyo.Param(mutable=True, initialize=0.0)
+    row.set_value(lhs == rhs + model.extra_H2)
+    annual.set_value(inflow + model.extra_H2 == outflow)
+    values = []
+    try:
+        for bump in (-BUMP_T_H2, BUMP_T_H2):
+            model.extra_H2 = bump
+            _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+            assert optimal
+            values.append((base - _objective_usd(model)) / bump / 1000)
+    finally:
+        row.set_value(lhs == rhs)
+        annual.set_value(inflow == outflow)
+        model.del_component(model.extra_H2)
+    tol = 1e-4 * max(1.0, abs(price[k]))
+    assert values[1] - tol <= price[k] <= values[0] + tol
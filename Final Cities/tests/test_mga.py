@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from green_steel import mga  # noqa: E402
+from green_steel.mga import DEFAULT_SLACK, MGA_CAPACITIES, range_scale, select_diverse  # noqa: E402
+from green_steel.model import build_city_model  # noqa: E402
+from green_steel.runner import build_jobs  # noqa: E402
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def _designs(*capacities):
+    return pd.DataFrame([dict(zip(MGA_CAPACITIES, c), Direction=f'd{i}') for i, c in enumerate(capacities)])
+
+
+def test_capacities_zero_at_the_optimum_are_scaled_by_their_range():
+    designs = _designs((1000, 2000, 500, 0, 0, 0), (900, 2100, 500, 0, 400, 0), (1100, 1900, 500, 0, 0, 200))
+    scale = range_scale(designs)
+    assert scale == {'Solar': 200.0, 'Wind': 200.0, 'Electrolyzer': 1.0, 'FuelCell': 1.0,
+                     'Battery_storage_capacity_MWh': 400.0, 'CGH2_storage_capacity_t': 200.0}
+
+
+def test_duplicate_designs_are_picked_once():
+    designs = _designs((1000, 2000, 500, 0, 0, 0), (1000, 2000, 500, 0, 0, 0), (900, 2100, 500, 0, 400, 0),
+                       (1000, 2000, 500, 0, 0, 1e-9))
+    picked = select_diverse(designs, range_scale(designs), k=5)
+    assert picked['Direction'].tolist() == ['d0', 'd2']
+
+
+def test_near_optimal_designs_are_distinct_and_range_scaled(monkeypatch):
+    pytest.importorskip('highspy')
+    monkeypatch.setattr(mga, 'build_job_model', lambda job, store_dir=None: build_city_model(
+        job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS))
+    sites = discover_sites(CITIES_DIR, DEFAULT_METADATA, 2019)
+    [job] = build_jobs(sites[sites['City'] == 'Anshan'], ['YCurrent'], ['S1'])
+
+    designs = mga.near_optimal_designs(job, n_designs=50, solver_name='appsi_highs')
+    assert designs['Direction'].iloc[0] == 'cost_optimal'
+    assert 1 < len(designs) < 50
+    assert (designs['Cost_increase_pct'] <= 100 * DEFAULT_SLACK + 1e-6).all()
+    # Every capacity lies within its min/max range, so no design is farther
+    # than sqrt(number of capacities) from the optimum
+    assert designs['Distance_from_optimum'].max() <= math.sqrt(len(MGA_CAPACITIES)) + 1e-6
+    capacities = designs[list(MGA_CAPACITIES)].round(3)
+    assert not capacities.duplicated().any()
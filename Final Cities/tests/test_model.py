@@ -0,0 +1,51 @@
+import importlib.util
+import os
+
+import pytest
+
+pyo = pytest.importorskip('pyomo.environ')
+pd = pytest.importorskip('pandas')
+
+from green_steel import model as package_model  # noqa: E402
+from green_steel.sites import CITIES_DIR, read_site_metadata  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def _city_scripts():
+    return sorted(city for city in os.listdir(CITIES_DIR)
+                  if os.path.isfile(os.path.join(CITIES_DIR, city, 'New Model.py')))
+
+
+def _load_script(city):
+    spec = importlib.util.spec_from_file_location(f'{city.lower()}_new_model',
+                                                  os.path.join(CITIES_DIR, city, 'New Model.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_city_scripts_only_supply_their_transport_cost():
+    # Every script runs the package model; its one input must match cities.csv
+    metadata = read_site_metadata()
+    transport = dict(zip(metadata['City'], metadata['TransportCost_USD_per_t']))
+    cities = _city_scripts()
+    assert len(cities) == 32
+    for city in cities:
+        script = _load_script(city)
+        assert script.CITY == city
+        assert script.TRANSPORT_COST_PER_TONNE == pytest.approx(transport[city]), city
+        assert script.solve_all_scenarios is package_model.solve_all_scenarios
+        assert not hasattr(script, 'create_complete_green_steel_model'), city
+
+
+def test_solve_all_scenarios_uses_the_given_transport_cost(tmp_path):
+    pytest.importorskip('highspy')
+    out_path = tmp_path / 'all_scenario_results.csv'
+    df = package_model.solve_all_scenarios('Anshan', 50.0, ycases=['YCurrent'], scases=['S1'],
+                                           solver_name='appsi_highs', tee=False, n_hours=SMOKE_HOURS,
+                                           out_path=str(out_path))
+    assert len(df) == 1 and out_path.is_file()
+    reference = package_model.build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    assert df['TransportCost_per_tonne_steel'].iloc[0] == pytest.approx(
+        pyo.value(reference.transport_cost_addition_per_tonne) * 50.0 / 1.49)
@@ -0,0 +1,53 @@
+import pytest
+
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('pandas')
+
+from green_steel.model import build_city_model  # noqa: E402
+from green_steel.model_stats import model_statistics, statistics_table  # noqa: E402
+
+SMOKE_HOURS = 24
+
+
+def _toy_model():
+    model = pyo.ConcreteModel()
+    model.T = pyo.Set(initialize=range(1, 4))
+    model.x = pyo.Var(model.T, within=pyo.NonNegativeReals)
+    model.y = pyo.Var()
+    model.idle = pyo.Var()
+    model.y.fix(2.0)
+    model.balance = pyo.Constraint(model.T, rule=lambda m, t: m.x[t] + m.y >= t)
+    model.total = pyo.Constraint(expr=sum(model.x[t] for t in model.T) <= 10)
+    model.obj = pyo.Objective(expr=sum(model.x[t] for t in model.T))
+    return model
+
+
+def _component(stats, name):
+    return next(row for row in stats['components'] if row['Component'] == name)
+
+
+def test_counts_rows_nonzeros_and_dense_rows():
+    stats = model_statistics(_toy_model(), dense_threshold=2)
+    balance, total = _component(stats, 'balance'), _component(stats, 'total')
+    # The fixed y is not a nonzero of the balance rows
+    assert (balance['Count'], balance['Nonzeros'], balance['Hourly']) == (3, 3, True)
+    assert (total['Count'], total['Nonzeros'], total['Dense_rows'], total['Hourly']) == (1, 3, 1, False)
+    assert stats['dense_rows'] == [{'Row': 'total', 'Nonzeros': 3}]
+
+    summary = stats['summary']
+    assert (summary['Hours'], summary['Variables'], summary['Constraints'], summary['Nonzeros']) == (3, 5, 4, 6)
+    assert _component(stats, 'y')['Fixed'] == 1
+    assert _component(stats, 'idle')['Unused'] == 1
+    assert summary['Fixed_pct'] == summary['Unused_pct'] == pytest.approx(20.0)
+    assert summary['Hourly_nonzeros_pct'] == pytest.approx(50.0)
+
+
+def test_hourly_families_dominate_the_city_model():
+    stats = model_statistics(build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS))
+    table = statistics_table(stats)
+    constraints = table[table['Type'] == 'Constraint']
+    assert constraints['Nonzeros'].is_monotonic_decreasing
+    assert constraints['Nonzeros'].sum() == stats['summary']['Nonzeros']
+    hourly = constraints[constraints['Hourly']]
+    assert (hourly['Count'] == SMOKE_HOURS).any()
+    assert stats['summary']['Memory_MB'] > 0
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import pyomo.environ as pyo  # noqa: E402
+
+from green_steel.model import YCASES  # noqa: E402
+from green_steel.pathway import (PATHWAY_END, PERIOD_START, available_vintages, create_pathway_model,  # noqa: E402
+                                 period_weight, solve_pathway, vintage_shares)
+from green_steel.profiles import load_vre_profile  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+SMOKE_HOURS = 48
+
+
+def test_periods_share_hours_and_myopic_is_no_cheaper():
+    profile = load_vre_profile(os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv'))
+    pathway = create_pathway_model(profile, 'S1', 10.0, n_hours=SMOKE_HOURS)
+    period = pathway.period['Y2030']
+    assert period.VRE_prod[1, 's'] is pathway.VRE_prod[1, 's']
+    assert len(period.T) == SMOKE_HOURS
+
+    costs = {}
+    for decomposition in ('monolithic', 'myopic'):
+        optimal, _ = solve_pathway(pathway, decomposition, solver_name='appsi_highs')
+        assert optimal
+        costs[decomposition] = pyo.value(pathway.obj)
+    assert costs['monolithic'] <= costs['myopic'] * (1 + 1e-6)
+
+
+def test_vintages_are_paid_for_their_lifetime_only():
+    lifetime, r = 20, 0.08
+    shares = vintage_shares(YCASES, lifetime, r)
+    for q in YCASES:
+        paid = sum(period_weight(p, YCASES, r) * shares.get((p, q), 0.0) for p in YCASES)
+        years = range(PERIOD_START[q], min(PERIOD_START[q] + lifetime, PATHWAY_END))
+        assert paid == pytest.approx(sum(1 / (1 + r) ** (y - PERIOD_START[YCASES[0]]) for y in years))
+    # 2025 builds retire in 2045, part-way through the 2040 period
+    assert 'YCurrent' not in available_vintages(YCASES, lifetime)['Y2040']
+    assert 0 < shares['Y2040', 'YCurrent'] < 1
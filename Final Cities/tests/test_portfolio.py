@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import pandas as pd  # noqa: E402
+import pyomo.environ as pyo  # noqa: E402
+
+from green_steel.portfolio import solve_master  # noqa: E402
+
+SITES = pd.DataFrame({'City': ['A', 'B'], 'Province': ['P', 'Q']})
+# m$/yr; A has a large fixed cost, so half of its 2 Mt column is cheap only in the LP
+COLUMNS = pd.DataFrame({'City': ['A', 'A', 'B'], 'Demand_t': [1e6, 2e6, 1e6], 'TotalCost': [600.0, 1000.0, 700.0]})
+
+
+def test_integer_master_pays_full_column_costs():
+    lp, lp_weights, duals = solve_master(COLUMNS, SITES, 1.5e6, solver_name='appsi_highs')
+    assert lp_weights[1] == pytest.approx(0.75)
+    assert pyo.value(lp.obj) == pytest.approx(750.0)
+    assert duals['national'] == pytest.approx(500.0 / 1e6)
+
+    integer, weights, duals = solve_master(COLUMNS, SITES, 1.5e6, solver_name='appsi_highs', integer=True)
+    assert duals is None
+    assert [round(weights[k]) for k in COLUMNS.index] == [0, 1, 0]
+    assert pyo.value(integer.obj) == pytest.approx(1000.0)
+    assert pyo.value(integer.obj) >= pyo.value(lp.obj)
+
+
+def test_integer_master_respects_province_caps():
+    integer, weights, _ = solve_master(COLUMNS, SITES, 1.5e6, {'P': 1e6}, solver_name='appsi_highs', integer=True)
+    assert [round(weights[k]) for k in COLUMNS.index] == [1, 0, 1]
+    assert pyo.value(integer.obj) == pytest.approx(1300.0)
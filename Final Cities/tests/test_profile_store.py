@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from green_steel.profile_store import (STORE_DECIMALS, build_profile_store, open_profile_store,  # noqa: E402
+                                       store_profile)
+from green_steel.profiles import load_vre_profile  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+CITIES = ('Anshan', 'Jiuquan')
+
+
+def _paths():
+    return {city: os.path.join(CITIES_DIR, city, f'{city}_2019.csv') for city in CITIES}
+
+
+def test_store_round_trips_every_city(tmp_path):
+    paths = _paths()
+    build_profile_store(paths, str(tmp_path), year=2019)
+    store = open_profile_store(str(tmp_path), 2019)
+    assert store[1] == {city: row for row, city in enumerate(CITIES)}
+
+    for city, path in paths.items():
+        profile = store_profile(store, city)
+        assert profile.dtype == np.float64 and not profile.flags.writeable
+        # float32 storage is undone by rounding back to the CSV precision
+        np.testing.assert_array_equal(profile, np.round(load_vre_profile(path), STORE_DECIMALS))
+
+
+def test_store_rejects_unknown_city_and_missing_year(tmp_path):
+    build_profile_store(_paths(), str(tmp_path), year=2019)
+    with pytest.raises(KeyError, match='Dalian'):
+        store_profile(open_profile_store(str(tmp_path), 2019), 'Dalian')
+    with pytest.raises(FileNotFoundError):
+        open_profile_store(str(tmp_path), 2020)
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from green_steel.profiles import HOURS_PER_YEAR, load_vre_profile, read_vre_csv, validate_vre_profile  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+ANSHAN_CSV = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+
+
+def _year(value=0.5):
+    profile = np.full((HOURS_PER_YEAR, 2), value)
+    labels = np.array([f't{i}' for i in range(1, HOURS_PER_YEAR + 1)])
+    return profile, labels
+
+
+def test_validate_accepts_a_clean_year():
+    validate_vre_profile(*_year())
+
+
+def test_validate_rejects_wrong_shape_and_length():
+    with pytest.raises(ValueError, match='shape'):
+        validate_vre_profile(np.zeros((HOURS_PER_YEAR, 3)))
+    with pytest.raises(ValueError, match='multiple of 8760'):
+        validate_vre_profile(np.zeros((HOURS_PER_YEAR - 1, 2)))
+
+
+def test_validate_names_the_first_mislabelled_row():
+    profile, labels = _year()
+    labels[41] = 't41'
+    with pytest.raises(ValueError, match="row 42 is labelled 't41', expected 't42'"):
+        validate_vre_profile(profile, labels)
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, -0.01, 1.01])
+def test_validate_rejects_missing_and_out_of_range_values(bad):
+    profile, labels = _year()
+    profile[100, 1] = bad
+    with pytest.raises(ValueError):
+        validate_vre_profile(profile, labels)
+
+
+def test_load_returns_a_cached_read_only_year():
+    profile = load_vre_profile(ANSHAN_CSV)
+    assert profile.shape == (HOURS_PER_YEAR, 2)
+    assert profile.dtype == np.float64 and profile.flags['C_CONTIGUOUS']
+    assert not profile.flags.writeable
+    assert load_vre_profile(ANSHAN_CSV) is profile
+    np.testing.assert_array_equal(profile, read_vre_csv(ANSHAN_CSV)[0])
+
+
+def test_load_rejects_a_truncated_year(tmp_path):
+    path = tmp_path / 'Short_2019.csv'
+    with open(ANSHAN_CSV, encoding='utf-8-sig') as source:
+        path.write_text(''.join(source.readlines()[:HOURS_PER_YEAR]))
+    with pytest.raises(ValueError, match='expected 8760 hourly rows'):
+        load_vre_profile(str(path))
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from green_steel import runner  # noqa: E402
+from green_steel.fingerprints import FINGERPRINT_COLUMN  # noqa: E402
+from green_steel.model import build_city_model  # noqa: E402
+from green_steel.runner import build_jobs, results_path, run_jobs, stale_jobs, write_results  # noqa: E402
+from green_steel.sites import CITIES_DIR, DEFAULT_METADATA, discover_sites  # noqa: E402
+
+PROFILE = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+SMOKE_HOURS = 168
+
+
+def _row(scase, cost):
+    return {'City': 'Anshan', 'Objective': 'cost', 'WeatherYear': 2019, 'Ycase': 'YCurrent', 'Scase': scase,
+            'Cost_per_tonne': cost}
+
+
+def _anshan_jobs(ycases=('YCurrent',), scases=('S1', 'S2', 'S3')):
+    sites = discover_sites(CITIES_DIR, DEFAULT_METADATA, 2019)
+    return build_jobs(sites[sites['City'] == 'Anshan'], list(ycases), list(scases))
+
+
+def test_stale_jobs_re_solve_only_changed_or_missing_rows(tmp_path):
+    out_dir = str(tmp_path / 'results')
+    jobs = _anshan_jobs(ycases=('YCurrent', 'Y2030'))
+    by_scenario = {(job['Ycase'], job['Scase']): job for job in jobs}
+    rows = []
+    for (ycase, scase), fingerprint in ((('YCurrent', 'S1'), by_scenario['YCurrent', 'S1'][FINGERPRINT_COLUMN]),
+                                        (('YCurrent', 'S2'), 'changed-inputs'),
+                                        (('YCurrent', 'S3'), None)):  # Written before fingerprints
+        rows.append(dict(_row(scase, 500.0), Ycase=ycase, **{FINGERPRINT_COLUMN: fingerprint}))
+    write_results(rows, jobs, out_dir)
+    # Y2030 has no rows at all
+
+    stale = {(job['Ycase'], job['Scase']) for job in stale_jobs(jobs, out_dir)}
+    assert stale == set(by_scenario) - {('YCurrent', 'S1')}
+    # Nothing saved yet: every job is stale
+    assert stale_jobs(jobs, str(tmp_path / 'empty')) == jobs
+
+
+def test_legacy_results_without_fingerprints_are_stale(tmp_path):
+    jobs = _anshan_jobs(scases=('S1',))
+    path = results_path('Anshan', PROFILE, str(tmp_path))
+    # Per-city script output: no WeatherYear or fingerprint column
+    pd.DataFrame([{'Objective': 'cost', 'Ycase': 'YCurrent', 'Scase': 'S1', 'Cost_per_tonne': 500.0}]).to_csv(
+        path, index=False)
+    assert stale_jobs(jobs, str(tmp_path)) == jobs
+
+
+def test_committed_results_need_an_explicit_overwrite():
+    committed = results_path('Anshan', PROFILE)
+    before = os.path.getmtime(committed)
+    with pytest.raises(ValueError, match='committed per-city results'):
+        write_results([_row('S1', 500.0)], [{'City': 'Anshan', 'Profile': PROFILE}])
+    assert os.path.getmtime(committed) == before
+
+
+def test_results_go_to_out_dir_and_merge(tmp_path):
+    out_dir = str(tmp_path / 'results')
+    jobs = [{'City': 'Anshan', 'Profile': PROFILE}]
+    [path] = write_results([_row('S2', 480.0), _row('S1', 500.0)], jobs, out_dir)
+    assert path == results_path('Anshan', PROFILE, out_dir)
+
+    write_results([_row('S1', 490.0)], jobs, out_dir, merge=True)
+    saved = pd.read_csv(path)
+    assert saved['Scase'].tolist() == ['S1', 'S2']
+    assert saved['Cost_per_tonne'].tolist() == [490.0, 480.0]
+
+
+def test_warm_started_jobs_load_their_neighbours_basis(tmp_path, monkeypatch):
+    pytest.importorskip('highspy')
+    monkeypatch.setattr(runner, 'build_job_model', lambda job, store_dir=None: build_city_model(
+        job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS))
+    sites = discover_sites(CITIES_DIR, DEFAULT_METADATA, 2019)
+    jobs = build_jobs(sites[sites['City'].isin(['Anshan', 'Anyang', 'Dalian'])], ['YCurrent'], ['S1'])
+    bases_dir = str(tmp_path / 'bases')
+
+    rows = run_jobs(jobs, solver_name='appsi_highs', quiet=True, warm_start=True, bases_dir=bases_dir)
+    assert len(rows) == 3
+    assert len(os.listdir(bases_dir)) == 3
+    seeded = [row for row in rows if pd.notna(row.get('Warm_start_source'))]
+    assert len(seeded) == 2
+    # The first seeded job is also solved cold for its baseline
+    assert any(row['Warm_start_iteration_savings'] > 0 for row in seeded)
+
+
+def _smoke_model(job, store_dir=None):
+    return build_city_model(job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS)
+
+
+def test_lazy_storage_jobs_are_checked_not_re_solved(monkeypatch):
+    pytest.importorskip('highspy')
+    monkeypatch.setattr(runner, 'build_job_model', _smoke_model)
+    sites = discover_sites(CITIES_DIR, DEFAULT_METADATA, 2019)
+    jobs = build_jobs(sites[sites['City'] == 'Anshan'], ['YCurrent'], ['S1'])
+
+    [row] = run_jobs(jobs, solver_name='appsi_highs', quiet=True, lazy_storage=True)
+    # Lazy bounds are exact: the physical checks find every level within
+    # its peak and valley, and no full-model re-dispatch is run
+    assert row['Check_storage_bounds_breaches'] == 0
+    assert row['Physical_checks_passed']
+    assert 'Full_cost_per_tonne' not in row
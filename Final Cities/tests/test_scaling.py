@@ -0,0 +1,40 @@
+import pytest
+
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('highspy')
+
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+from green_steel.scaling import UNIT_SCALES, apply_unit_scaling, coefficient_ranges  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def test_scaled_solve_matches_the_unscaled_one():
+    plain = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(plain, solver_name='appsi_highs', tee=False)
+    assert optimal
+
+    scaled = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    apply_unit_scaling(scaled)
+    _, optimal, _ = solve_model(scaled, solver_name='appsi_highs', tee=False)
+    assert optimal
+    # The solution is copied back in the model's own units
+    assert pyo.value(scaled.obj) == pytest.approx(pyo.value(plain.obj), rel=1e-6)
+    assert scaled.T_H2.value == pytest.approx(plain.T_H2.value, rel=1e-4)
+    assert pyo.value(scaled.c_RE['s'] + scaled.c_RE['w']) == pytest.approx(
+        pyo.value(plain.c_RE['s'] + plain.c_RE['w']), rel=1e-4)
+
+
+def test_unit_scaling_narrows_the_matrix_range():
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=24)
+    before = coefficient_ranges(model)
+    var_factors, con_factors, obj_factor = apply_unit_scaling(model)
+    after = coefficient_ranges(model, var_factors, con_factors, obj_factor)
+
+    def span(ranges):
+        return ranges[(ranges['Family'] == 'ALL') & (ranges['Kind'] == 'matrix')]['Span_decades'].iloc[0]
+
+    assert span(after) < span(before)
+    assert var_factors[model.T_RE] == UNIT_SCALES['T_RE'][0]
+    with pytest.raises(ValueError, match='already has'):
+        apply_unit_scaling(model)
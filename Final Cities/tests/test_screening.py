@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('highspy')
+
+from green_steel.model import ALPHA_CMP2B, ALPHA_CST, build_city_model, solve_model  # noqa: E402
+from green_steel.profiles import load_vre_profile  # noqa: E402
+from green_steel.screening import plant_flows, plant_opex, screen_sites, top_sites  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+SMOKE_HOURS = 168
+SCREEN_CITIES = ('Anshan', 'Guangzhou', 'Jiuquan', 'Urumqi')
+
+
+@pytest.mark.parametrize('scase', ['S1', 'S3'])
+def test_plant_flows_match_the_lp(scase):
+    model = build_city_model('Anshan', 'YCurrent', scase, n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    steel = sum(model.LS_out_EAF[t].value for t in model.T)
+    dri = sum(model.DRI_in_EAF[t, scase].value for t in model.T)
+    flows = plant_flows('YCurrent', scase, pyo.value(model.dem_SFS))
+    assert dri / steel == pytest.approx(flows['DRI_per_t_steel'], rel=1e-6)
+    assert pyo.value(model.T_DRI[scase]) == pytest.approx(flows['T_DRI'], rel=1e-9)
+    assert pyo.value(model.T_En_ore['YCurrent', scase]) == pytest.approx(flows['T_En_ore'], rel=1e-9)
+    assert pyo.value(model.T_aOPEX - model.aOPEX_maint) == pytest.approx(
+        plant_opex(flows, model.transport_cost_per_tonne, pyo.value(model.dem_SFS)), rel=1e-9)
+
+    plant_load = sum(model.P_cmp2b[t, scase].value + model.P_cst[t].value for t in model.T)
+    assert plant_load == pytest.approx(ALPHA_CMP2B * dri + ALPHA_CST * steel, rel=1e-6)
+
+
+def _screen_profiles():
+    return np.stack([load_vre_profile(os.path.join(CITIES_DIR, city, f'{city}_2019.csv')) for city in SCREEN_CITIES])
+
+
+def test_screen_sites_ranks_by_lcos_estimate():
+    screen = screen_sites(_screen_profiles(), SCREEN_CITIES, [1.49, 5.0, 3.0, 2.0])
+    assert list(screen.columns) == ['City', 'Ycase', 'Scase', 'CF_solar', 'CF_wind', 'Corr_solar_wind',
+                                    'Best_solar_share', 'Storage_proxy_h', 'LCOS_no_storage_estimate',
+                                    'LCOS_estimate', 'Rank']
+    assert sorted(screen['City']) == sorted(SCREEN_CITIES)
+    assert screen['Rank'].tolist() == [1, 2, 3, 4]
+    assert screen['LCOS_estimate'].is_monotonic_increasing
+    assert np.isfinite(screen['LCOS_estimate']).all()
+    # Storage only adds cost to the cheapest no-storage mix
+    assert (screen['LCOS_estimate'] >= screen['LCOS_no_storage_estimate']).all()
+    assert ((screen['Best_solar_share'] >= 0) & (screen['Best_solar_share'] <= 1)).all()
+
+    assert top_sites(screen, 2) == screen['City'].head(2).tolist()
+    # Chunking does not change the result
+    chunked = screen_sites(_screen_profiles(), SCREEN_CITIES, [1.49, 5.0, 3.0, 2.0], chunk_size=1)
+    np.testing.assert_allclose(chunked['LCOS_estimate'], screen['LCOS_estimate'])
+
+
+def test_screen_sites_rejects_mismatched_names():
+    with pytest.raises(ValueError, match='3 site names for 4 profiles'):
+        screen_sites(_screen_profiles(), SCREEN_CITIES[:3])
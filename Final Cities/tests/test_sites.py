@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from green_steel.sites import CITIES_DIR, discover_sites, read_manifest  # noqa: E402
+
+ANSHAN_CSV = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+    return path
+
+
+def _metadata(path, costs):
+    pd.DataFrame({'City': list(costs), 'TransportCost_USD_per_t': list(costs.values())}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_manifest_lists_sites_with_their_profiles(tmp_path):
+    _touch(str(tmp_path / 'profiles' / 'Newtown_2021.csv'))
+    manifest = tmp_path / 'sites.csv'
+    pd.DataFrame({'City': [' Newtown', 'Anshan'], 'TransportCost_USD_per_t': [7.5, 1.49],
+                  'Profile': ['profiles/Newtown_2021.csv', ANSHAN_CSV]}).to_csv(manifest, index=False)
+
+    sites = discover_sites(manifest=str(manifest))
+    assert list(sites.columns) == ['City', 'Province', 'TransportCost_USD_per_t', 'WeatherYear', 'Profile']
+    assert sites['City'].tolist() == ['Anshan', 'Newtown']
+    # Relative profiles are resolved against the manifest's folder, years
+    # read from the file names and the Province left blank
+    assert sites['Profile'].tolist() == [ANSHAN_CSV, str(tmp_path / 'profiles' / 'Newtown_2021.csv')]
+    assert sites['WeatherYear'].tolist() == [2019, 2021]
+    assert sites['Province'].tolist() == ['', '']
+    assert sites['TransportCost_USD_per_t'].tolist() == [1.49, 7.5]
+
+
+def test_manifest_needs_profiles_and_unique_sites(tmp_path):
+    manifest = tmp_path / 'sites.csv'
+    pd.DataFrame({'City': ['Anshan'], 'TransportCost_USD_per_t': [1.49]}).to_csv(manifest, index=False)
+    with pytest.raises(ValueError, match='needs a Profile column'):
+        read_manifest(str(manifest))
+
+    pd.DataFrame({'City': ['Anshan', 'Anshan'], 'TransportCost_USD_per_t': [1.49, 2.0],
+                  'Profile': [ANSHAN_CSV, ANSHAN_CSV]}).to_csv(manifest, index=False)
+    with pytest.raises(ValueError, match='duplicate cities'):
+        read_manifest(str(manifest))
+
+
+def test_scanned_sites_need_metadata(tmp_path):
+    profiles_dir = tmp_path / 'profiles'
+    for name in ('Anshan/Anshan_2019.csv', 'Newtown/Newtown_2019.csv', 'Oldtown/Oldtown_2020.csv'):
+        _touch(str(profiles_dir / name))
+    metadata = _metadata(tmp_path / 'cities.csv', {'Anshan': 1.49})
+
+    with pytest.raises(ValueError, match='No transport cost in .*cities.csv for: Newtown$'):
+        discover_sites(str(profiles_dir), metadata, 2019)
+
+    # Only the requested year is scanned, so Oldtown needs no metadata
+    metadata = _metadata(tmp_path / 'cities.csv', {'Anshan': 1.49, 'Newtown': 7.5})
+    sites = discover_sites(str(profiles_dir), metadata, 2019)
+    assert sites['City'].tolist() == ['Anshan', 'Newtown']
+    assert sites['Profile'].tolist() == [str(profiles_dir / 'Anshan' / 'Anshan_2019.csv'),
+                                         str(profiles_dir / 'Newtown' / 'Newtown_2019.csv')]
+
+
+def test_one_profile_per_site_and_year(tmp_path):
+    profiles_dir = tmp_path / 'profiles'
+    for name in ('a/Anshan_2019.csv', 'b/Anshan_2019.csv'):
+        _touch(str(profiles_dir / name))
+    metadata = _metadata(tmp_path / 'cities.csv', {'Anshan': 1.49})
+    with pytest.raises(ValueError, match='More than one profile for: Anshan'):
+        discover_sites(str(profiles_dir), metadata, 2019)
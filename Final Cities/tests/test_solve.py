@@ -0,0 +1,20 @@
+import math
+
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def test_appsi_highs_solves_one_week():
+    # appsi_* interfaces refuse a logfile; solve_model must not pass one and
+    # must still report iterations and problem size from the solver object
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, telemetry = solve_model(model, solver_name='appsi_highs', tee=False)
+    assert optimal
+    assert telemetry['Solve_rows'] > 0
+    assert not math.isnan(telemetry['Solve_simplex_iterations'])
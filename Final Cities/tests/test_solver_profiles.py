@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('pandas')
+
+from green_steel import tuning  # noqa: E402
+from green_steel.solver_profiles import (available_profiles, save_user_profile, solver_family,  # noqa: E402
+                                         solver_options)
+
+SMOKE_HOURS = 168
+
+
+def test_solver_names_map_to_their_family():
+    assert solver_family('appsi_gurobi') == solver_family('gurobi_direct') == 'gurobi'
+    assert solver_family('appsi_highs') == 'highs'
+    assert solver_family('cbc') == 'cbc'
+
+
+def test_profile_options_and_errors(tmp_path):
+    path = str(tmp_path / 'solver_profiles.json')
+    assert solver_options('default', 'cbc', path) == {}
+    assert solver_options('publication', 'appsi_highs', path)['run_crossover'] == 'on'
+    with pytest.raises(ValueError, match='Unknown solver profile'):
+        solver_options('tuned', 'gurobi', path)
+    with pytest.raises(ValueError, match='has no options for cbc'):
+        solver_options('publication', 'cbc', path)
+
+
+def test_saved_profile_extends_the_built_in_ones(tmp_path):
+    path = str(tmp_path / 'solver_profiles.json')
+    save_user_profile('tuned', 'appsi_highs', {'solver': 'simplex'}, path)
+    save_user_profile('publication', 'gurobi', {'Method': 1}, path)
+    assert solver_options('tuned', 'highs', path) == {'solver': 'simplex'}
+    assert solver_options('publication', 'gurobi_direct', path) == {'Method': 1}
+    # The other family of an overridden profile keeps its built-in options
+    assert solver_options('publication', 'highs', path) == solver_options('publication', 'highs')
+    with open(path) as f:
+        assert set(json.load(f)) == {'tuned', 'publication'}
+    assert 'tuned' not in available_profiles(str(tmp_path / 'missing.json'))
+
+
+def test_candidate_grid_has_no_duplicates_or_simplex_crossover():
+    candidates = tuning.candidate_options('highs')
+    encoded = [json.dumps(options, sort_keys=True) for options in candidates.values()]
+    assert len(encoded) == len(set(encoded))
+    assert not any(o.get('solver') == 'simplex' and o.get('run_crossover') == 'off' for o in candidates.values())
+    with pytest.raises(ValueError, match='No tuning grid'):
+        tuning.candidate_options('cbc')
+
+
+def test_tune_ranks_matching_candidates_fastest_first(monkeypatch):
+    pytest.importorskip('highspy')
+    from green_steel.model import build_city_model
+
+    monkeypatch.setattr(tuning, 'build_job_model', lambda job, store_dir: build_city_model(
+        job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS))
+    jobs = [{'City': 'Anshan', 'Ycase': 'YCurrent', 'Scase': 'S1'}]
+    candidates = {'default': {}, 'simplex': {'solver': 'simplex'}}
+    trials, summary = tuning.tune(jobs, 'appsi_highs', candidates, reference_profile='default')
+
+    assert len(trials) == len(candidates)
+    assert summary['Matches_reference'].all()
+    assert summary['Total_solve_s'].is_monotonic_increasing
+    label, options = tuning.best_candidate(summary)
+    assert options == candidates[label] and label == summary['Candidate'].iloc[0]
+
+    summary['Matches_reference'] = False
+    with pytest.raises(ValueError, match='No candidate matched'):
+        tuning.best_candidate(summary)
@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from green_steel import stochastic  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+from green_steel.stochastic import PH_TOLERANCE, _scenario_cache, _scenario_model, _solve_all  # noqa: E402
+
+ANSHAN_CSV = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+SMOKE_HOURS = 168
+
+
+def _which_process(task):
+    return {'Year': task['Year'], 'optimal': True, 'pid': os.getpid()}
+
+
+def test_each_year_stays_on_one_worker():
+    tasks = [{'Year': year} for year in range(2015, 2020)]
+    with ProcessPoolExecutor(max_workers=1) as first, ProcessPoolExecutor(max_workers=1) as second:
+        lanes = [first, second]
+        runs = [{r['Year']: r['pid'] for r in _solve_all(tasks, _which_process, lanes)} for _ in range(3)]
+    assert runs[0] == runs[1] == runs[2]
+    assert len(set(runs[0].values())) == 2
+
+
+def test_resident_models_are_capped(monkeypatch):
+    built = []
+    monkeypatch.setattr(stochastic, '_build_scenario', lambda path, *args: built.append(path) or path)
+    monkeypatch.setattr(stochastic.pyo, 'SolverFactory', lambda name: None)
+    try:
+        for path in ('a', 'b', 'a', 'c', 'a', 'b'):
+            _scenario_model((path, 'YCurrent', 'S1', 0.0, 'gurobi', SMOKE_HOURS, False), max_resident=2)
+            assert len(_scenario_cache) <= 2
+    finally:
+        _scenario_cache.clear()
+    # 'a' is used most recently whenever a model is dropped, so only b and c are rebuilt
+    assert built == ['a', 'b', 'c', 'b']
+
+
+@pytest.fixture
+def weather_years(tmp_path):
+    # 2019 as recorded and 2020 with 20 % less wind and sun: a design sized
+    # for the mean cannot meet all of 2020's demand with demand held hard
+    vre = pd.read_csv(ANSHAN_CSV, encoding='utf-8-sig')
+    paths = {}
+    for year, factor in ((2019, 1.0), (2020, 0.8)):
+        paths[year] = str(tmp_path / f'Anshan_{year}.csv')
+        vre.assign(s=(vre['s'] * factor).clip(upper=1), w=(vre['w'] * factor).clip(upper=1)).to_csv(
+            paths[year], index=False)
+    return paths
+
+
+def test_progressive_hedging_converges_and_reports_unserved_steel(weather_years):
+    pytest.importorskip('highspy')
+    design, history, scenarios = stochastic.progressive_hedging(
+        weather_years, 20.0, max_iterations=30, solver_name='appsi_highs', n_hours=SMOKE_HOURS, linearize=True)
+
+    assert history['Distance'].iloc[-1] < PH_TOLERANCE
+    assert history['Distance'].iloc[-1] < history['Distance'].iloc[0]
+    assert set(design) == set(stochastic.FIRST_STAGE)
+    assert list(scenarios['WeatherYear']) == [2019, 2020]
+    assert (scenarios['Validation_termination'] == 'optimal').all()
+    assert (scenarios['Unserved_steel_t'] >= 0).all()
+    # Every year runs the consensus plant
+    assert scenarios['EAF'].tolist() == pytest.approx([design['c_EAF']] * 2)
+    assert scenarios['Solar'].tolist() == pytest.approx([design['c_RE_s']] * 2)
+    assert scenarios['Expected_cost_per_tonne'].iloc[0] == pytest.approx(scenarios['Full_cost_per_tonne'].mean())
+    assert not _scenario_cache
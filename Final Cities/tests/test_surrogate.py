@@ -0,0 +1,63 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pyomo')
+
+from green_steel.surrogate import (SURROGATE_TARGETS, load_surrogate, new_surrogate, oob_mse, predict,  # noqa: E402
+                                   save_surrogate, update_surrogate)
+
+N_FEATURES = 3
+
+
+def _rows(n, seed=0, noise=1.0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, N_FEATURES))
+    Y = 500 + X @ rng.normal(size=(N_FEATURES, len(SURROGATE_TARGETS))) * 10
+    return X, np.abs(Y + rng.normal(scale=noise, size=Y.shape))
+
+
+def test_one_batch_has_an_out_of_bag_error():
+    X, Y = _rows(60)
+    state = new_surrogate(N_FEATURES)
+    assert update_surrogate(state, X, Y, [f'k{i}' for i in range(60)]) == 60
+    mse = oob_mse(state)
+    assert (mse > 0).all()
+    # Most rows are left out by at least one of the 16 members
+    assert np.isfinite(state['oob_sq_err']).all(axis=1).mean() > 0.9
+
+    members_only = dict(state, oob_sq_err=np.zeros_like(state['oob_sq_err']))
+    assert (predict(state, X)[1] > predict(members_only, X)[1]).all()
+
+
+def test_superseded_row_is_subtracted():
+    X, Y = _rows(30)
+    scenarios = [f's{i}' for i in range(30)]
+    state = new_surrogate(N_FEATURES)
+    update_surrogate(state, X, Y, [f'old{i}' for i in range(30)], scenarios)
+
+    # s0 and s1 re-solved with changed inputs: new fingerprints, new targets
+    X_new, Y_new = _rows(2, seed=1)
+    assert update_surrogate(state, X_new, Y_new, ['new0', 'new1'], scenarios[:2]) == 2
+    assert len(state['keys']) == 30
+
+    fresh = new_surrogate(N_FEATURES)
+    update_surrogate(fresh, X[2:], Y[2:], [f'old{i}' for i in range(2, 30)], scenarios[2:])
+    update_surrogate(fresh, X_new, Y_new, ['new0', 'new1'], scenarios[:2])
+    assert np.allclose(state['A'], fresh['A'])
+    assert np.allclose(state['b'], fresh['b'])
+    assert np.allclose(state['coef'], fresh['coef'])
+
+    # Known keys are skipped
+    assert update_surrogate(state, X_new, Y_new, ['new0', 'new1'], scenarios[:2]) == 0
+
+
+def test_state_round_trips(tmp_path):
+    X, Y = _rows(20)
+    state = new_surrogate(N_FEATURES)
+    update_surrogate(state, X, Y, [f'k{i}' for i in range(20)])
+    path = str(tmp_path / 'surrogate.npz')
+    save_surrogate(state, path)
+    loaded = load_surrogate(path)
+    assert np.allclose(predict(loaded, X)[0], predict(state, X)[0])
+    assert np.allclose(oob_mse(loaded), oob_mse(state))
+    assert update_surrogate(loaded, X, Y, [f'k{i}' for i in range(20)]) == 0
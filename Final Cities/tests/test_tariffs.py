@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip('pyomo')
+pytest.importorskip('highspy')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyomo.environ as pyo  # noqa: E402
+
+from green_steel import tariffs  # noqa: E402
+from green_steel.model import GRID_PENALTY_USD_PER_MWH, build_city_model, solve_model  # noqa: E402
+from green_steel.profile_store import build_grid_price_store  # noqa: E402
+from green_steel.profiles import HOURS_PER_YEAR  # noqa: E402
+from green_steel.tariffs import set_grid_prices, set_min_renewable_share  # noqa: E402
+
+SMOKE_HOURS = 168
+CHEAP_USD_PER_MWH = 20.0
+
+
+def _imports(model):
+    return sum(pyo.value(model.P_grid_import[t]) for t in model.T)
+
+
+def test_flat_penalty_tariff_reproduces_default_run():
+    # grid_price_t is $/MWh both as built and as loaded by set_grid_prices
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    solve_model(model, solver_name='appsi_highs', tee=False)
+    default = pyo.value(model.obj)
+
+    set_grid_prices(model, np.full(SMOKE_HOURS, GRID_PENALTY_USD_PER_MWH))
+    solve_model(model, solver_name='appsi_highs', tee=False)
+    assert pyo.value(model.obj) == pytest.approx(default, rel=1e-6)
+
+    # With the base renewable_share rule even free power cannot be imported ...
+    set_grid_prices(model, np.zeros(SMOKE_HOURS))
+    solve_model(model, solver_name='appsi_highs', tee=False)
+    assert pyo.value(model.obj) == pytest.approx(default, rel=1e-6)
+    assert _imports(model) == pytest.approx(0.0, abs=1e-6)
+
+    # ... once it is relaxed, it is
+    set_min_renewable_share(model, 0.0)
+    solve_model(model, solver_name='appsi_highs', tee=False)
+    assert pyo.value(model.obj) < default * (1 - 1e-6)
+    assert _imports(model) > 0
+
+
+def test_tariff_study_draws_cheap_imports(tmp_path, monkeypatch):
+    monkeypatch.setattr(tariffs, 'build_job_model', lambda job, store_dir: build_city_model(
+        job['City'], job['Ycase'], job['Scase'], n_hours=SMOKE_HOURS))
+    prices = pd.DataFrame({'t': [f't{i}' for i in range(1, HOURS_PER_YEAR + 1)],
+                           'cheap': CHEAP_USD_PER_MWH, 'penalty': GRID_PENALTY_USD_PER_MWH})
+    prices.to_csv(tmp_path / 'prices.csv', index=False)
+    build_grid_price_store(str(tmp_path / 'prices.csv'), str(tmp_path))
+    job = {'City': 'Anshan', 'WeatherYear': 2019, 'Ycase': 'YCurrent', 'Scase': 'S1', 'Objective': 'cost'}
+
+    rows = tariffs.tariff_study(job, ['cheap', 'penalty'], price_store_dir=str(tmp_path)).set_index(
+        'Grid_price_series')
+    assert rows.loc['cheap', 'GridImport'] > 0
+    assert rows.loc['cheap', 'Grid_import_avg_price_USD_per_MWh'] == pytest.approx(CHEAP_USD_PER_MWH)
+    assert rows.loc['penalty', 'GridImport'] == pytest.approx(0.0, abs=1e-6)
+    assert rows.loc['cheap', 'Cost_per_tonne'] < rows.loc['penalty', 'Cost_per_tonne']
+    with pytest.raises(ValueError, match=r'\[0, 1\]'):
+        set_min_renewable_share(build_city_model('Anshan', 'YCurrent', 'S1', n_hours=24), 1.5)
@@ -0,0 +1,133 @@
+import math
+
+import pytest
+
+from green_steel.telemetry import parse_solver_log
+
+# Gurobi 10 log lines (Gurobi is not installed in CI)
+GUROBI_LP_LOG = """\
+Gurobi Optimizer version 10.0.1 build v10.0.1rc0 (linux64)
+
+Optimize a model with 35040 rows, 26290 columns and 96380 nonzeros
+Model fingerprint: 0x1a2b3c4d
+Coefficient statistics:
+  Matrix range     [1e-03, 1e+02]
+Presolve removed 8771 rows and 8760 columns
+Presolve time: 0.12s
+Presolved: 26269 rows, 17530 columns, 70110 nonzeros
+
+Barrier solved model in 31 iterations and 1.52 seconds (1.10 work units)
+Optimal objective 6.08012345e+02
+
+Crossover log...
+
+    1234 DPushes remaining with DInf 0.0000000e+00                 1s
+
+Solved in 2598 iterations and 2.31 seconds (1.80 work units)
+Optimal objective  6.080123450e+02
+"""
+
+GUROBI_MIP_TAIL = """\
+Explored 1 nodes (2598 simplex iterations) in 2.40 seconds (1.90 work units)
+Best objective 6.080123450e+02, best bound 6.079515400e+02, gap 0.0100%
+"""
+
+# Captured from HiGHS 1.15.1 on the 24 h Anshan model and a small knapsack MIP
+HIGHS_SIMPLEX_LOG = """\
+Running HiGHS 1.15.1 (git hash: 04024d7): Copyright (c) 2026 under MIT licence terms
+LP m24 has 1094 rows; 1288 cols; 3938 nonzeros
+Presolving model
+518 rows, 690 cols, 2190 nonzeros 0s
+267 rows, 412 cols, 1871 nonzeros 0s
+Presolve reductions: rows 267(-827); columns 412(-876); nonzeros 1871(-2067)
+Solving the presolved LP
+Using dual simplex solver
+Model status        : Optimal
+Simplex   iterations: 275
+Objective value     :  1.1045213145e+03
+P-D objective error :  2.0576406307e-16
+HiGHS run time      :          0.04
+"""
+
+HIGHS_IPM_LOG = """\
+Running HiGHS 1.15.1 (git hash: 04024d7): Copyright (c) 2026 under MIT licence terms
+LP m24 has 1094 rows; 1288 cols; 3938 nonzeros
+Presolve reductions: rows 267(-827); columns 412(-876); nonzeros 1871(-2067)
+Solving the presolved LP
+IPX model has 267 rows, 412 columns and 1871 nonzeros
+Running crossover as requested
+Model status        : Optimal
+IPM       iterations: 23
+Crossover iterations: 20
+Objective value     :  1.1045213145e+03
+P-D objective error :  2.0576406307e-16
+HiGHS run time      :          0.08
+"""
+
+HIGHS_MIP_LOG = """\
+Running HiGHS 1.15.1 (git hash: 04024d7): Copyright (c) 2026 under MIT licence terms
+MIP has 2 rows; 30 cols; 60 nonzeros; 30 integer variables (30 binary)
+Presolve reductions: rows 2(-0); columns 30(-0); nonzeros 60(-0) - Not reduced
+Solving report
+  Status            Optimal
+  Primal bound      -573
+  Dual bound        -583
+  Gap               1.75% (tolerance: 5%)
+  Nodes             1
+  LP iterations     46
+                    0 (strong br.)
+"""
+
+
+def test_gurobi_lp_log():
+    stats = parse_solver_log(GUROBI_LP_LOG)
+    assert (stats['Solve_rows'], stats['Solve_cols'], stats['Solve_nonzeros']) == (35040, 26290, 96380)
+    assert stats['Solve_presolve_rows_removed'] == 8771
+    assert stats['Solve_presolve_cols_removed'] == 8760
+    assert stats['Solve_barrier_iterations'] == 31
+    # The final count includes the barrier iterations
+    assert stats['Solve_simplex_iterations'] == 2598 - 31
+    assert stats['Solve_crossover_time_s'] == pytest.approx(2.31 - 1.52)
+    assert math.isnan(stats['Solve_gap'])
+
+
+def test_gurobi_mip_gap_is_a_fraction():
+    stats = parse_solver_log(GUROBI_LP_LOG + GUROBI_MIP_TAIL)
+    assert stats['Solve_gap'] == pytest.approx(1e-4)
+
+
+def test_gurobi_log_without_crossover_has_no_crossover_time():
+    log = GUROBI_LP_LOG.replace('Crossover log...', '')
+    assert math.isnan(parse_solver_log(log)['Solve_crossover_time_s'])
+
+
+def test_highs_simplex_log():
+    stats = parse_solver_log(HIGHS_SIMPLEX_LOG)
+    assert (stats['Solve_rows'], stats['Solve_cols'], stats['Solve_nonzeros']) == (1094, 1288, 3938)
+    assert stats['Solve_presolve_rows_removed'] == 827
+    assert stats['Solve_presolve_cols_removed'] == 876
+    assert stats['Solve_simplex_iterations'] == 275
+    assert math.isnan(stats['Solve_barrier_iterations'])
+    assert stats['Solve_gap'] == pytest.approx(2.0576406307e-16)
+    # HiGHS does not report a crossover time
+    assert math.isnan(stats['Solve_crossover_time_s'])
+
+
+def test_highs_ipm_log():
+    stats = parse_solver_log(HIGHS_IPM_LOG)
+    assert stats['Solve_barrier_iterations'] == 23
+    assert math.isnan(stats['Solve_simplex_iterations'])
+    assert math.isnan(stats['Solve_crossover_time_s'])
+
+
+def test_highs_mip_log():
+    stats = parse_solver_log(HIGHS_MIP_LOG)
+    assert (stats['Solve_rows'], stats['Solve_cols'], stats['Solve_nonzeros']) == (2, 30, 60)
+    assert stats['Solve_presolve_rows_removed'] == 0
+    assert stats['Solve_simplex_iterations'] == 46
+    assert stats['Solve_gap'] == pytest.approx(0.0175)
+
+
+def test_empty_or_unknown_log_leaves_nan():
+    for text in ('', 'CBC 2.10 finished\n'):
+        assert all(math.isnan(value) for value in parse_solver_log(text).values())
@@ -0,0 +1,52 @@
+import pytest
+
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('highspy')
+
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+from green_steel.validation import (FIRST_STAGE, UNSERVED_PENALTY_USD_PER_T, compare_to_estimate,  # noqa: E402
+                                   redispatch, reduced_estimate)
+
+SMOKE_HOURS = 168
+
+
+def test_redispatch_holds_every_sized_unit():
+    reduced = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(reduced, solver_name='appsi_highs', tee=False)
+    assert optimal
+    estimate = reduced_estimate(reduced)
+    assert {'CGH2_in_st_max', 'LS_out_EAF_max'} <= set(estimate['capacities'])
+
+    full = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    optimal, telemetry = redispatch(full, estimate['capacities'], 'appsi_highs')
+    assert optimal
+    for name, value in estimate['capacities'].items():
+        assert FIRST_STAGE[name](full).fixed
+        assert pyo.value(FIRST_STAGE[name](full)) == pytest.approx(value)
+    # Same horizon and design, so the re-dispatch costs what the solve did
+    row = compare_to_estimate(full, estimate, optimal, telemetry)
+    assert row['LCOS_gap_USD_per_t'] == pytest.approx(0.0, abs=1e-4)
+    assert row['Unserved_steel_t'] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_undersized_design_is_costed_per_served_tonne():
+    reduced = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, _ = solve_model(reduced, solver_name='appsi_highs', tee=False)
+    assert optimal
+    estimate = reduced_estimate(reduced)
+    # Half the solar and wind cannot power the year's steel
+    capacities = dict(estimate['capacities'])
+    capacities.update(c_RE_s=capacities['c_RE_s'] / 2, c_RE_w=capacities['c_RE_w'] / 2)
+
+    full = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    optimal, telemetry = redispatch(full, capacities, 'appsi_highs')
+    assert optimal
+    row = compare_to_estimate(full, estimate, optimal, telemetry)
+    demand = pyo.value(full.dem_SFS)
+    cost_usd = pyo.value(full.T_cost) * 1e6
+    assert row['Unserved_steel_t'] > 0.1 * demand
+    assert row['Full_cost_per_tonne'] == pytest.approx(cost_usd / (demand - row['Unserved_steel_t']))
+    assert row['Full_cost_per_tonne'] > cost_usd / demand
+    assert row['Full_penalised_cost_per_tonne'] == pytest.approx(
+        (cost_usd + UNSERVED_PENALTY_USD_PER_T * row['Unserved_steel_t']) / demand)
+    assert row['LCOS_gap_USD_per_t'] == pytest.approx(row['Full_cost_per_tonne'] - estimate['cost_per_tonne'])
@@ -0,0 +1,51 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pyo = pytest.importorskip('pyomo.environ')
+pytest.importorskip('highspy')
+
+from green_steel.model import build_city_model, solve_model  # noqa: E402
+from green_steel.profiles import VRE_SOURCES, set_vre_profile  # noqa: E402
+from green_steel.warm_start import save_basis, solve_seeded, warm_start_row  # noqa: E402
+
+SMOKE_HOURS = 168
+
+
+def _basis_of(city, n_hours, path):
+    model = build_city_model(city, 'YCurrent', 'S1', n_hours=n_hours)
+    solver = pyo.SolverFactory('appsi_highs')
+    solve_model(model, solver_name='appsi_highs', tee=False, solver=solver)
+    save_basis(solver, path)
+    return {'Source': f'{city} (YCurrent, S1)', 'Distance': 1.0, 'Basis': str(path), 'Measure_baseline': True}
+
+
+def test_near_identical_seed_saves_iterations(tmp_path):
+    seed = _basis_of('Anshan', SMOKE_HOURS, tmp_path / 'anshan.npz')
+
+    # The same site with 1 % more wind and sun
+    model = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    profile = np.array([[pyo.value(model.VRE_prod[t, i]) for i in VRE_SOURCES] for t in model.T])
+    set_vre_profile(model, np.clip(profile * 1.01, 0, 1))
+    _, optimal, telemetry, cold_telemetry = solve_seeded(model, seed, 'appsi_highs')
+    assert optimal
+    row = warm_start_row(seed, telemetry, cold_telemetry)
+    assert row['Warm_start_iteration_savings'] == row['Warm_start_cold_iterations'] - row['Warm_start_seeded_iterations']
+    assert row['Warm_start_iteration_savings'] > 0.5 * row['Warm_start_cold_iterations']
+
+    # Same objective from the seeded and the cold solve
+    cold = build_city_model('Anshan', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    set_vre_profile(cold, np.clip(profile * 1.01, 0, 1))
+    solve_model(cold, solver_name='appsi_highs', tee=False)
+    assert pyo.value(model.obj) == pytest.approx(pyo.value(cold.obj), rel=1e-6)
+
+
+def test_basis_of_another_horizon_is_skipped(tmp_path):
+    seed = _basis_of('Anshan', 24, tmp_path / 'short.npz')
+    model = build_city_model('Anyang', 'YCurrent', 'S1', n_hours=SMOKE_HOURS)
+    _, optimal, telemetry, cold_telemetry = solve_seeded(model, dict(seed, Measure_baseline=False), 'appsi_highs')
+    assert optimal
+    assert cold_telemetry is None
+    assert telemetry['Solve_simplex_iterations'] > 0
+    assert math.isnan(warm_start_row(seed, telemetry)['Warm_start_iteration_savings'])
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyomo')
+
+from green_steel import weather_years  # noqa: E402
+from green_steel.sites import CITIES_DIR  # noqa: E402
+
+ANSHAN_CSV = os.path.join(CITIES_DIR, 'Anshan', 'Anshan_2019.csv')
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    # Three weather years of one site: 2019 as recorded, 2020 with 20 % less
+    # wind and sun, 2021 with 10 % more; plus a file of another site
+    vre = pd.read_csv(ANSHAN_CSV, encoding='utf-8-sig')
+    for year, factor in ((2019, 1.0), (2020, 0.8), (2021, 1.1)):
+        scaled = vre.assign(s=(vre['s'] * factor).clip(upper=1), w=(vre['w'] * factor).clip(upper=1))
+        scaled.to_csv(tmp_path / f'Anshan_{year}.csv', index=False)
+    vre.to_csv(tmp_path / 'Dalian_2019.csv', index=False)
+    return tmp_path
+
+
+def test_find_profiles_only_picks_the_site(site_dir):
+    found = weather_years.find_weather_year_profiles(str(site_dir), 'Anshan')
+    assert list(found) == [2019, 2020, 2021]
+
+
+def test_worst_year_has_the_lowest_capacity_factor(site_dir):
+    found = weather_years.find_weather_year_profiles(str(site_dir), 'Anshan')
+    assert weather_years.select_worst_year(found) == 2020
+
+
+@pytest.mark.parametrize('mode, horizons, validated', [
+    ('independent', [[2019], [2020], [2021]], None),
+    ('concatenated', [[2019, 2020, 2021]], [2019, 2020, 2021]),
+    ('worst', [[2020]], [2019, 2020, 2021]),
+])
+def test_modes_choose_their_horizons(site_dir, monkeypatch, mode, horizons, validated):
+    solved = []
+
+    def fake_solve(paths_by_year, y, s, transport, solver_name, tee, validate_paths):
+        solved.append((sorted(paths_by_year), sorted(validate_paths) if validate_paths else None))
+        return {'Ycase': y, 'Scase': s}
+
+    monkeypatch.setattr(weather_years, '_solve_horizon', fake_solve)
+    found = weather_years.find_weather_year_profiles(str(site_dir), 'Anshan')
+    rows = weather_years.solve_weather_years('Anshan', found, 1.49, mode=mode, ycases=['YCurrent'],
+                                             scases=['S1'], quiet=True)
+    assert solved == [(horizon, validated) for horizon in horizons]
+    assert (rows['WeatherMode'] == mode).all() and len(rows) == len(horizons)
+
+
+def test_validation_reports_the_worst_weather_year(monkeypatch):
+    # 2020 leaves steel unserved, 2021 costs the most; a failed re-dispatch
+    # outranks both
+    outcomes = {2019: (0.0, 500.0), 2020: (10.0, 510.0), 2021: (0.0, 560.0)}
+    monkeypatch.setattr(weather_years, 'reduced_estimate', lambda model: {'capacities': {}})
+    monkeypatch.setattr(weather_years, '_build_horizon', lambda paths, *args: next(iter(paths)))
+    monkeypatch.setattr(weather_years, 'redispatch', lambda year, *args: (year != 2022, {}))
+
+    def fake_compare(year, estimate, optimal, telemetry):
+        unserved, cost = outcomes[year] if optimal else (np.nan, np.nan)
+        return {'Unserved_steel_t': unserved, 'Full_cost_per_tonne': cost}
+
+    monkeypatch.setattr(weather_years, 'compare_to_estimate', fake_compare)
+    def worst_year(years):
+        paths = {year: f'{year}.csv' for year in years}
+        return weather_years.validate_on_weather_years(None, paths, 'YCurrent', 'S1', 1.49)['Validation_weather_year']
+
+    assert worst_year([2019, 2020, 2021]) == 2020
+    assert worst_year([2019, 2021]) == 2021
+    assert worst_year([2019, 2020, 2021, 2022]) == 2022
+
+
+def test_unknown_mode_and_missing_worst_year_raise(site_dir):
+    found = weather_years.find_weather_year_profiles(str(site_dir), 'Anshan')
+    with pytest.raises(ValueError, match='Unknown weather-year mode'):
+        weather_years.solve_weather_years('Anshan', found, 1.49, mode='average')
+    with pytest.raises(ValueError, match='No 2018 profile'):
+        weather_years.solve_weather_years('Anshan', found, 1.49, mode='worst', worst_year=2018)